@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,6 +45,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'pokemon_api.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -77,13 +79,65 @@ WSGI_APPLICATION = 'backend_pokemon.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Conexões persistentes (reaproveitadas por até CONN_MAX_AGE segundos) e
+# verificadas antes de cada requisição. 'timeout' é quanto o SQLite espera por
+# um lock de escrita antes de falhar com "database is locked".
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': 20,
+        },
     }
 }
 
+# Réplicas de leitura: DATABASE_REPLICAS com caminhos de arquivos SQLite
+# separados por vírgula (cópias locais servem para testes). As leituras de
+# Pokemon vão para elas (ver pokemon_api.db_router); nos testes elas espelham
+# o banco 'default'.
+REPLICA_DATABASES = []
+for index, replica_name in enumerate(filter(None, os.environ.get('DATABASE_REPLICAS', '').split(','))):
+    alias = f'replica_{index}'
+    DATABASES[alias] = {**DATABASES['default'], 'NAME': replica_name.strip(), 'TEST': {'MIRROR': 'default'}}
+    REPLICA_DATABASES.append(alias)
+
+DATABASE_ROUTERS = ['pokemon_api.db_router.ReadReplicaRouter']
+
+# PRAGMAs aplicados a cada nova conexão SQLite: WAL deixa leitores e o escritor
+# (ex.: uma importação) trabalharem ao mesmo tempo; synchronous=NORMAL é seguro
+# com WAL e evita um fsync por transação.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'temp_store': 'MEMORY',
+    'cache_size': -20000,
+    'mmap_size': 128 * 1024 * 1024,
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# O alias 'pokeapi' é o nível compartilhado do cache de respostas da PokeAPI.
+# Defina REDIS_URL para compartilhá-lo entre processos; sem ele, usa memória local.
+
+REDIS_URL = os.environ.get('REDIS_URL')
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'pokeapi': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    } if REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'pokeapi',
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -128,7 +182,8 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'oauth2_provider.contrib.rest_framework.OAuth2Authentication',
+        # OAuth2Authentication com cache de tokens (ver POKEAPI['AUTH_CACHE_TTL'])
+        'pokemon_api.authentication.CachedOAuth2Authentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
@@ -138,3 +193,83 @@ REST_FRAMEWORK = {
 OAUTH2_PROVIDER = {
     'ACCESS_TOKEN_EXPIRE_SECONDS': 36000,
 }
+
+# PokeAPI client
+# BASE_URL pode apontar para um servidor local (stub) em testes e benchmarks.
+
+POKEAPI = {
+    'BASE_URL': 'https://pokeapi.co/api/v2/',
+    # 'http' consulta a PokeAPI; 'snapshot' serve tudo do arquivo SNAPSHOT_PATH, gerado
+    # por `python manage.py dump_pokemon_snapshot` (para testes, CI e ambientes sem rede)
+    'BACKEND': os.environ.get('POKEAPI_BACKEND', 'http'),
+    'SNAPSHOT_PATH': os.environ.get('POKEAPI_SNAPSHOT_PATH', BASE_DIR / 'pokeapi_snapshot.sqlite3'),
+    'MAX_IN_FLIGHT': 10,
+    'MAX_PER_HOST': 10,
+    # Cliente HTTP compartilhado pelo processo: pool keep-alive, timeouts (connect,
+    # read), retries com backoff exponencial e jitter em 429/5xx (o Retry-After é
+    # respeitado até RETRY_AFTER_MAX segundos) e o disjuntor, que falha rápido por
+    # BREAKER_RESET_TIMEOUT segundos após BREAKER_FAILURE_THRESHOLD falhas seguidas
+    'POOL_CONNECTIONS': 4,
+    'POOL_MAXSIZE': 20,
+    'CONNECT_TIMEOUT': 3.05,
+    'READ_TIMEOUT': 10,
+    'RETRIES': 2,
+    'RETRY_BACKOFF': 0.5,
+    'RETRY_AFTER_MAX': 10,
+    'BREAKER_FAILURE_THRESHOLD': 5,
+    'BREAKER_RESET_TIMEOUT': 30,
+    # Pool do cliente HTTP assíncrono (httpx) usado por GET /api/pokemon/async/ sob ASGI
+    'ASYNC_MAX_CONNECTIONS': 200,
+    'ASYNC_MAX_KEEPALIVE': 50,
+    'IMPORT_BATCH_SIZE': 500,
+    'EXPORT_CHUNK_SIZE': 500,
+    'SCORE_BATCH_MAX_IDS': 1000,
+    # Ranking por score: sorted sets no Redis quando configurado; senão um índice
+    # em memória por processo, recarregado do banco a cada LEADERBOARD_REFRESH_SECONDS
+    'LEADERBOARD_REDIS_URL': REDIS_URL,
+    'LEADERBOARD_REFRESH_SECONDS': 60,
+    # Índice de busca por nome (trie + trigramas) em memória, atualizado a cada
+    # gravação e recarregado do banco a cada SEARCH_REFRESH_SECONDS
+    'SEARCH_REFRESH_SECONDS': 5 * 60,
+    # Cache de autenticação: token -> usuário/escopos/validade no cache compartilhado
+    # por até AUTH_CACHE_TTL segundos (nunca além da expiração do token), e os
+    # usuários em memória por AUTH_USER_CACHE_TTL segundos
+    'AUTH_CACHE_TTL': 5 * 60,
+    'AUTH_USER_CACHE_TTL': 60,
+    # Tokens expirados são apagados fora do login: pelo comando reap_expired_tokens
+    # (cron) e, no máximo a cada TOKEN_REAP_INTERVAL segundos, em segundo plano
+    # após um login (0 desliga), em lotes de TOKEN_REAP_BATCH_SIZE
+    'TOKEN_REAP_INTERVAL': 60 * 60,
+    'TOKEN_REAP_BATCH_SIZE': 500,
+    # Métricas em GET /metrics (formato Prometheus, por processo) e log das
+    # requisições mais lentas que SLOW_REQUEST_MS, com as consultas mais demoradas (0 desliga)
+    'METRICS_ENABLED': True,
+    'SLOW_REQUEST_MS': int(os.environ.get('SLOW_REQUEST_MS', 0)),
+    # Quem pode ler /metrics: os IPs de METRICS_ALLOWED_IPS ou quem enviar
+    # "Authorization: Bearer <METRICS_TOKEN>"; sem nenhum dos dois, ninguém.
+    # Atrás de um proxy reverso local todos chegam como 127.0.0.1: não liste o loopback
+    'METRICS_ALLOWED_IPS': [ip for ip in os.environ.get('METRICS_ALLOWED_IPS', '').split(',') if ip],
+    'METRICS_TOKEN': os.environ.get('METRICS_TOKEN'),
+    # Jobs de importação em segundo plano: threads do pool, tamanho do bloco
+    # (checkpoint) e tempo sem progresso para considerar um job interrompido
+    'IMPORT_WORKERS': 2,
+    'IMPORT_CHUNK_SIZE': 100,
+    'IMPORT_RESUME_STALE_AFTER': 5 * 60,
+    # Cache de respostas: LRU local (LOCAL_CACHE_*) na frente do alias CACHE_ALIAS
+    'CACHE_ALIAS': 'pokeapi',
+    'CACHE_TTL': 24 * 60 * 60,
+    'NEGATIVE_CACHE_TTL': 5 * 60,
+    'LOCAL_CACHE_SIZE': 2048,
+    'LOCAL_CACHE_TTL': 60 * 60,
+    # Buscas simultâneas pelo mesmo nome viram uma só (single-flight): entre threads
+    # com futures locais e, com Redis, entre processos com um lock de SINGLEFLIGHT_LOCK_TTL
+    # segundos; quem não pega o lock espera o resultado no cache por até SINGLEFLIGHT_WAIT_TIMEOUT
+    'SINGLEFLIGHT_REDIS_URL': REDIS_URL,
+    'SINGLEFLIGHT_LOCK_TTL': 15,
+    'SINGLEFLIGHT_WAIT_TIMEOUT': 5,
+    # GET /api/pokemon/ lê primeiro da tabela local; registros mais velhos que
+    # LOCAL_STALE_AFTER segundos são atualizados (em segundo plano, se habilitado)
+    'READ_THROUGH': True,
+    'LOCAL_STALE_AFTER': 7 * 24 * 60 * 60,
+    'BACKGROUND_REFRESH': True,
+}
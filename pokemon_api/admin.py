@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Pokemon
+from .models import ImportJob, Pokemon
 
 @admin.register(Pokemon)
 class PokemonAdmin(admin.ModelAdmin ):
@@ -8,4 +8,10 @@ class PokemonAdmin(admin.ModelAdmin ):
     
     def get_types(self, obj):
         return ", ".join(obj.types)
-    get_types.short_description = 'Types'
\ No newline at end of file
+    get_types.short_description = 'Types'
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'limit', 'offset', 'next_index', 'total', 'persisted', 'failed', 'created_at')
+    list_filter = ('status',)
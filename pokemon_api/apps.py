@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PokemonApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pokemon_api'
+
+    def ready(self):
+        from pokemon_api import signals  # noqa: F401
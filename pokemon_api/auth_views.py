@@ -6,8 +6,10 @@ from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.contrib.auth import authenticate
 from oauth2_provider.models import AccessToken
-from django.utils import timezone
-from datetime import timedelta
+
+from pokemon_api.services.token_service import (
+    LOGIN_TOKEN_EXPIRES_IN, get_or_create_login_token, maybe_reap_expired_tokens,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -104,38 +106,16 @@ class LoginView(APIView):
             )
 
         try:
-            # Criar ou obter token OAuth2
-            # Primeiro, remover tokens expirados
-            AccessToken.objects.filter(expires__lt=timezone.now()).delete()
-
-            # Verificar se há um token válido existente
-            token = AccessToken.objects.filter(user=user).first()
-
-            if not token or token.is_expired():
-                # Criar novo token
-                from oauth2_provider.models import Application
-
-                # Obter ou criar uma aplicação OAuth2
-                app, _ = Application.objects.get_or_create(
-                    name='Pokemon API',
-                    defaults={
-                        'client_type': Application.CLIENT_PUBLIC,
-                        'authorization_grant_type': Application.GRANT_PASSWORD,
-                    }
-                )
-
-                token = AccessToken.objects.create(
-                    user=user,
-                    application=app,
-                    expires=timezone.now() + timedelta(hours=10),
-                    scope='read write'
-                )
+            # Token válido existente ou um novo; os expirados são apagados
+            # em segundo plano, fora do caminho do login
+            token = get_or_create_login_token(user)
+            maybe_reap_expired_tokens()
 
             return Response(
                 {
                     "message": "Login successful",
                     "access_token": token.token,
-                    "expires_in": 36000,
+                    "expires_in": LOGIN_TOKEN_EXPIRES_IN,
                     "user": {
                         "id": user.id,
                         "username": user.username,
@@ -161,10 +141,11 @@ class LogoutView(APIView):
 
     def post(self, request, *args, **kwargs):
         try:
-            # Obter o token do usuário
-            token = AccessToken.objects.filter(user=request.user).first()
+            # Revogar o token usado nesta requisição; o sinal post_delete
+            # o remove também do cache de autenticação
+            token = request.auth
 
-            if token:
+            if isinstance(token, AccessToken):
                 token.delete()
 
             return Response(
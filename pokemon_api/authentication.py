@@ -0,0 +1,47 @@
+from typing import Optional
+
+from oauth2_provider.contrib.rest_framework import OAuth2Authentication
+
+from pokemon_api.services.token_cache_service import get_token_cache, token_checksum
+
+
+def get_bearer_token(request) -> Optional[str]:
+    """Token do cabeçalho `Authorization: Bearer <token>`, se houver."""
+    parts = request.META.get('HTTP_AUTHORIZATION', '').split()
+    if len(parts) == 2 and parts[0].lower() == 'bearer':
+        return parts[1]
+    return None
+
+
+class CachedOAuth2Authentication(OAuth2Authentication):
+    """
+    OAuth2Authentication com cache: tokens Bearer já validados são resolvidos
+    pelo AccessTokenCache (token -> usuário, escopos e validade), sem consultar
+    AccessToken nem User no banco. Na falta do cache, ou para tokens que ele
+    não cobre, a validação completa do django-oauth-toolkit é usada e o
+    resultado passa a ser cacheado.
+    """
+
+    def authenticate(self, request):
+        if request is None:
+            return None
+        token = get_bearer_token(request)
+        if token is None:
+            return super().authenticate(request)
+
+        cache = get_token_cache()
+        checksum = token_checksum(token)
+        entry = cache.get(checksum)
+        if entry is not None:
+            user = cache.get_user(entry['user_id'])
+            if user is not None and user.is_active:
+                return user, cache.build_token(token, entry)
+            cache.invalidate(checksum)
+
+        result = super().authenticate(request)
+        # Tokens restritos a recursos (RFC 8707) dependem da URL; ficam fora do cache
+        if result is not None and not result[1].resource:
+            user, access_token = result
+            cache.set(access_token)
+            cache.set_user(user)
+        return result
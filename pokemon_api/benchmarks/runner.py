@@ -0,0 +1,272 @@
+import platform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import django
+from django.db import connection
+from django.test import Client, RequestFactory
+from django.utils import timezone
+
+from pokemon_api.benchmarks.stub_server import StubPokeAPIServer, stub_pokemon_name, stub_pokemon_payload
+
+BENCH_USERNAME = 'bench'
+BENCH_PASSWORD = 'bench-password-123'
+JOB_POLL_INTERVAL = 0.05
+JOB_TIMEOUT = 600
+
+SCENARIOS = ('proxy_lookup_miss', 'proxy_lookup_hit', 'list', 'detail', 'score', 'counters', 'login', 'import')
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Percentil com interpolação linear (como numpy.percentile) de uma lista já ordenada."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(latencies: List[float], errors: int, wall_time: float, **extra) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    requests = len(ordered)
+    summary = {
+        'requests': requests,
+        'errors': errors,
+        'throughput_rps': round(requests / wall_time, 2) if wall_time else 0.0,
+        'mean_ms': round(sum(ordered) / requests * 1000, 3) if requests else 0.0,
+        'p50_ms': round(percentile(ordered, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(ordered, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 0.99) * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3) if requests else 0.0,
+    }
+    summary.update(extra)
+    return summary
+
+
+class BenchmarkRunner:
+    """
+    Mede os endpoints contra a PokeAPI falsa (StubPokeAPIServer), com a pilha
+    completa do Django (middlewares, autenticação por token, serialização)
+    e sem rede entre cliente e servidor:
+
+    - proxy_lookup_miss / proxy_lookup_hit: GET /api/pokemon/?name= para
+      pokémons fora do banco (vai à PokeAPI) e, de novo, já gravados;
+    - list, detail, score: GET /pokemon/, /pokemon/<id>/ e /pokemon/score/<id>/
+      sobre `seed` pokémons gravados antes;
+    - counters: GET /pokemon/counters/<id>/, com a tabela de tipos da PokeAPI falsa;
+    - login: LoginView (a senha passa pelo hasher configurado);
+    - import_<limit>: POST /api/pokemon/?limit= até o job terminar.
+
+    Deve rodar num banco descartável: cria usuário, tokens e pokémons.
+    """
+
+    def __init__(self, stub: StubPokeAPIServer, requests: int = 200, concurrency: int = 1, seed: int = 500,
+                 import_limits: Sequence[int] = (25, 100, 250), import_repeats: int = 3, login_requests: int = 20,
+                 log: Optional[Callable[[str], None]] = None):
+        self.stub = stub
+        self.requests = requests
+        self.concurrency = max(1, concurrency)
+        self.seed = seed
+        self.import_limits = tuple(import_limits)
+        self.import_repeats = import_repeats
+        self.login_requests = login_requests
+        self.log = log or (lambda message: None)
+        self.auth_header = None
+        self.pokemon_ids: List[str] = []
+
+    @staticmethod
+    def required_stub_size(seed: int, requests: int, import_limits: Iterable[int], import_repeats: int) -> int:
+        return seed + requests + sum(import_limits) * import_repeats
+
+    def setup(self) -> None:
+        from django.contrib.auth.models import User
+
+        from pokemon_api.models import Pokemon
+        from pokemon_api.services.matchup_service import import_type_chart
+        from pokemon_api.services.persistence_service import PokemonBulkWriter
+        from pokemon_api.services.pokemon_api_service import PokemonAPIService, PokemonRecord, format_pokemon_data
+        from pokemon_api.services.token_service import get_or_create_login_token
+
+        user = User.objects.create_user(BENCH_USERNAME, f"{BENCH_USERNAME}@example.com", BENCH_PASSWORD)
+        self.auth_header = f"Bearer {get_or_create_login_token(user).token}"
+
+        PokemonBulkWriter().upsert(
+            format_pokemon_data(PokemonRecord.from_payload(stub_pokemon_payload(pokemon_id)))
+            for pokemon_id in range(1, self.seed + 1)
+        )
+        self.pokemon_ids = [str(pk) for pk in Pokemon.objects.order_by('pokemon_id').values_list('id', flat=True)]
+        import_type_chart(PokemonAPIService().fetch_type_chart())
+
+    def _client(self) -> Client:
+        return Client(HTTP_AUTHORIZATION=self.auth_header, HTTP_ACCEPT='application/json')
+
+    def _measure(self, name: str, calls: List[Callable[[Client], int]], expected=(200,)) -> Dict[str, Any]:
+        """Executa `calls` em `concurrency` threads, cada uma com seu Client."""
+        latencies: List[float] = []
+        errors = 0
+        lock = threading.Lock()
+        local = threading.local()
+
+        def run(call):
+            nonlocal errors
+            client = getattr(local, 'client', None)
+            if client is None:
+                client = local.client = self._client()
+            start = time.perf_counter()
+            try:
+                status = call(client)
+            except Exception:
+                status = None
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                if status not in expected:
+                    errors += 1
+
+        barrier = threading.Barrier(self.concurrency)
+
+        def close_connection(_):
+            # A barreira faz cada thread do pool fechar a sua própria conexão
+            barrier.wait()
+            connection.close()
+
+        wall_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='bench') as executor:
+            list(executor.map(run, calls))
+            list(executor.map(close_connection, range(self.concurrency)))
+        result = summarize(latencies, errors, time.perf_counter() - wall_start)
+        self.log(f"{name}: {result['requests']} requests, p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, "
+                 f"p99 {result['p99_ms']} ms, {result['throughput_rps']} req/s, {errors} errors")
+        return result
+
+    def _get(self, url: str) -> Callable[[Client], int]:
+        return lambda client: client.get(url).status_code
+
+    def _cycle(self, values: Sequence[Any]) -> List[Any]:
+        return [values[index % len(values)] for index in range(self.requests)]
+
+    def bench_proxy_lookup(self) -> Dict[str, Dict[str, Any]]:
+        names = [stub_pokemon_name(pokemon_id) for pokemon_id in range(self.seed + 1, self.seed + self.requests + 1)]
+        calls = [self._get(f"/api/pokemon/?name={name}") for name in names]
+        return {
+            'proxy_lookup_miss': self._measure('proxy_lookup_miss', calls),
+            'proxy_lookup_hit': self._measure('proxy_lookup_hit', calls),
+        }
+
+    def bench_list(self) -> Dict[str, Any]:
+        return self._measure('list', [self._get('/pokemon/?page_size=50')] * self.requests)
+
+    def bench_detail(self) -> Dict[str, Any]:
+        return self._measure('detail', [self._get(f"/pokemon/{pk}/") for pk in self._cycle(self.pokemon_ids)])
+
+    def bench_score(self) -> Dict[str, Any]:
+        return self._measure('score', [self._get(f"/pokemon/score/{pk}/") for pk in self._cycle(self.pokemon_ids)])
+
+    def bench_counters(self) -> Dict[str, Any]:
+        return self._measure('counters', [self._get(f"/pokemon/counters/{pk}/")
+                                          for pk in self._cycle(self.pokemon_ids)])
+
+    def bench_login(self) -> Dict[str, Any]:
+        # LoginView não está nas rotas do projeto; é chamada diretamente
+        from pokemon_api.auth_views import LoginView
+
+        view = LoginView.as_view()
+        factory = RequestFactory()
+
+        def login(_client):
+            request = factory.post('/auth/login/', {'username': BENCH_USERNAME, 'password': BENCH_PASSWORD},
+                                   content_type='application/json')
+            return view(request).status_code
+
+        return self._measure('login', [login] * self.login_requests)
+
+    def bench_import(self) -> Dict[str, Dict[str, Any]]:
+        """Cada limite é importado `import_repeats` vezes, sempre de um trecho novo da listagem."""
+        from pokemon_api.models import ImportJob
+
+        results = {}
+        offset = self.seed + self.requests
+        client = self._client()
+        for limit in self.import_limits:
+            latencies = []
+            errors = 0
+            wall_start = time.perf_counter()
+            for _ in range(self.import_repeats):
+                start = time.perf_counter()
+                response = client.post(f"/api/pokemon/?limit={limit}&offset={offset}")
+                offset += limit
+                if response.status_code != 202:
+                    errors += 1
+                    continue
+                job_id = response.json()['job_id']
+                deadline = time.monotonic() + JOB_TIMEOUT
+                while True:
+                    job = ImportJob.objects.get(id=job_id)
+                    if job.status in (ImportJob.STATUS_COMPLETED, ImportJob.STATUS_FAILED):
+                        break
+                    if time.monotonic() > deadline:
+                        break
+                    time.sleep(JOB_POLL_INTERVAL)
+                latencies.append(time.perf_counter() - start)
+                if job.status != ImportJob.STATUS_COMPLETED or job.failed:
+                    errors += 1
+            wall_time = time.perf_counter() - wall_start
+            name = f"import_{limit}"
+            results[name] = summarize(latencies, errors, wall_time,
+                                      pokemons_per_second=round(limit * len(latencies) / wall_time, 2))
+            self.log(f"{name}: p50 {results[name]['p50_ms']} ms, "
+                     f"{results[name]['pokemons_per_second']} pokémons/s, {errors} errors")
+        return results
+
+    def run(self, scenarios: Iterable[str] = SCENARIOS) -> Dict[str, Any]:
+        scenarios = set(scenarios)
+        self.setup()
+        results: Dict[str, Dict[str, Any]] = {}
+        if {'proxy_lookup_miss', 'proxy_lookup_hit'} & scenarios:
+            results.update(self.bench_proxy_lookup())
+        for scenario in ('list', 'detail', 'score', 'counters', 'login'):
+            if scenario in scenarios:
+                results[scenario] = getattr(self, f"bench_{scenario}")()
+        if 'import' in scenarios:
+            results.update(self.bench_import())
+
+        return {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'platform': platform.platform(),
+                'database': connection.vendor,
+                'requests': self.requests,
+                'concurrency': self.concurrency,
+                'seed': self.seed,
+                'stub_latency_ms': self.stub.latency * 1000,
+                'stub_payload_kb': self.stub.payload_kb,
+                'stub_requests': self.stub.requests,
+            },
+            'scenarios': results,
+        }
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.2) -> List[str]:
+    """
+    Regressões de `current` em relação a `baseline`: p50/p95 mais de
+    `tolerance` acima, vazão mais de `tolerance` abaixo, ou novos erros.
+    Cenários ausentes em um dos dois são ignorados.
+    """
+    regressions = []
+    for name, base in baseline.get('scenarios', {}).items():
+        result = current.get('scenarios', {}).get(name)
+        if result is None:
+            continue
+        for metric in ('p50_ms', 'p95_ms'):
+            if base[metric] and result[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {result[metric]} > baseline {base[metric]}")
+        if base['throughput_rps'] and result['throughput_rps'] < base['throughput_rps'] * (1 - tolerance):
+            regressions.append(f"{name}: throughput_rps {result['throughput_rps']} < baseline {base['throughput_rps']}")
+        if result['errors'] > base['errors']:
+            regressions.append(f"{name}: errors {result['errors']} > baseline {base['errors']}")
+    return regressions
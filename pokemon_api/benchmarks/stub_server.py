@@ -0,0 +1,180 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+STAT_NAMES = ('hp', 'attack', 'defense', 'special-attack', 'special-defense', 'speed')
+TYPE_NAMES = ('normal', 'fire', 'water', 'grass', 'electric', 'ice', 'fighting', 'poison', 'ground',
+              'flying', 'psychic', 'bug', 'rock', 'ghost', 'dragon', 'dark', 'steel', 'fairy')
+NAME_PREFIX = 'bench-'
+
+_DETAIL_PATH = re.compile(r'/pokemon/([^/]+)/?$')
+_LIST_PATH = re.compile(r'/pokemon/?$')
+_TYPE_PATH = re.compile(r'/type/([^/]+)/?$')
+
+
+def stub_pokemon_name(pokemon_id: int) -> str:
+    return f"{NAME_PREFIX}{pokemon_id}"
+
+
+def stub_pokemon_payload(pokemon_id: int, payload_kb: float = 0) -> Dict[str, Any]:
+    """
+    Resposta de /pokemon/<nome> no formato da PokeAPI, determinística para
+    cada id. `payload_kb` acrescenta movimentos até o JSON ter mais ou menos
+    esse tamanho, para simular as respostas grandes da PokeAPI real.
+    """
+    payload = {
+        'id': pokemon_id,
+        'name': stub_pokemon_name(pokemon_id),
+        'types': [{'slot': slot + 1, 'type': {'name': TYPE_NAMES[(pokemon_id + slot * 7) % len(TYPE_NAMES)]}}
+                  for slot in range(1 + pokemon_id % 2)],
+        'abilities': [{'ability': {'name': f"ability-{(pokemon_id + index) % 300}"}} for index in range(2)],
+        'stats': [{'stat': {'name': stat}, 'base_stat': 20 + (pokemon_id * (index + 3)) % 140}
+                  for index, stat in enumerate(STAT_NAMES)],
+        'height': 1 + pokemon_id % 30,
+        'weight': 10 + pokemon_id % 900,
+        'sprites': {
+            'front_default': f"https://example.com/sprites/{pokemon_id}.png",
+            'other': {'official-artwork': {'front_default': f"https://example.com/artwork/{pokemon_id}.png"}},
+        },
+        'moves': [],
+    }
+    # Cada movimento ocupa ~60 bytes no JSON
+    move_count = int(payload_kb * 1024 / 60)
+    payload['moves'] = [{'move': {'name': f"move-{index}", 'url': f"https://example.com/move/{index}/"}}
+                        for index in range(move_count)]
+    return payload
+
+
+def stub_type_payload(type_name: str) -> Dict[str, Any]:
+    """
+    Resposta de /type/<nome> com damage_relations determinísticas (não são as
+    da PokeAPI real): cada tipo tem duas vantagens, uma resistência e, a cada
+    seis tipos, uma imunidade.
+    """
+    index = TYPE_NAMES.index(type_name)
+
+    def related(*offsets):
+        return [{'name': TYPE_NAMES[(index + offset) % len(TYPE_NAMES)], 'url': ''} for offset in offsets]
+
+    return {
+        'name': type_name,
+        'damage_relations': {
+            'double_damage_to': related(1, 5),
+            'half_damage_to': related(2),
+            'no_damage_to': related(9) if index % 6 == 0 else [],
+        },
+    }
+
+
+class StubPokeAPIServer:
+    """
+    PokeAPI falsa, local, para benchmarks: serve /pokemon (listagem com
+    limit/offset) e /pokemon/<nome> para `size` pokémons `bench-<id>`, além
+    de /type/<nome> para os 18 tipos, com
+    `latency_ms` de atraso por resposta, ETag e 304 para If-None-Match.
+    Cada resposta é montada uma vez e reaproveitada.
+    """
+
+    def __init__(self, size: int = 2000, latency_ms: float = 0, payload_kb: float = 0,
+                 host: str = '127.0.0.1', port: int = 0):
+        self.size = size
+        self.latency = latency_ms / 1000
+        self.payload_kb = payload_kb
+        self.requests = 0
+        self._bodies: Dict[int, tuple] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v2/"
+
+    def start(self) -> 'StubPokeAPIServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, name='stub-pokeapi', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'StubPokeAPIServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _detail(self, pokemon_id: int) -> tuple:
+        with self._lock:
+            cached = self._bodies.get(pokemon_id)
+        if cached is None:
+            body = json.dumps(stub_pokemon_payload(pokemon_id, self.payload_kb)).encode('utf-8')
+            cached = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+            with self._lock:
+                self._bodies[pokemon_id] = cached
+        return cached
+
+    def _list(self, query: Dict[str, list]) -> bytes:
+        limit = int(query.get('limit', ['20'])[0])
+        offset = int(query.get('offset', ['0'])[0])
+        results = [{'name': stub_pokemon_name(pokemon_id), 'url': ''}
+                   for pokemon_id in range(offset + 1, min(offset + limit, self.size) + 1)]
+        return json.dumps({'count': self.size, 'results': results}).encode('utf-8')
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Cabeçalhos e corpo saem em escritas separadas; sem isso o Nagle
+            # somado ao ACK atrasado acrescenta ~40 ms a cada resposta
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes = b'', etag: Optional[str] = None):
+                self.send_response(status)
+                if etag:
+                    self.send_header('ETag', etag)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                url = urlsplit(self.path)
+                if _LIST_PATH.search(url.path):
+                    return self._send(200, stub._list(parse_qs(url.query)))
+
+                type_match = _TYPE_PATH.search(url.path)
+                if type_match:
+                    if type_match.group(1) not in TYPE_NAMES:
+                        return self._send(404, b'Not Found')
+                    return self._send(200, json.dumps(stub_type_payload(type_match.group(1))).encode('utf-8'))
+
+                match = _DETAIL_PATH.search(url.path)
+                name = match.group(1) if match else ''
+                pokemon_id = name[len(NAME_PREFIX):] if name.startswith(NAME_PREFIX) else ''
+                if not pokemon_id.isdigit() or not 0 < int(pokemon_id) <= stub.size:
+                    return self._send(404, b'Not Found')
+
+                body, etag = stub._detail(int(pokemon_id))
+                if self.headers.get('If-None-Match') == etag:
+                    return self._send(304, etag=etag)
+                return self._send(200, body, etag)
+
+        return Handler
@@ -0,0 +1,42 @@
+import hashlib
+from typing import Any, Optional
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from pokemon_api.models import Pokemon
+
+
+def make_etag(*parts: Any) -> str:
+    """ETag forte (entre aspas) a partir das partes que determinam o corpo da resposta."""
+    digest = hashlib.sha1('\x1f'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return quote_etag(digest)
+
+
+def pokemon_table_version():
+    """
+    Versão da tabela Pokemon: (maior updated_at, número de linhas). Muda a
+    cada inserção, alteração ou remoção; as duas agregações usam índices.
+    """
+    version = Pokemon.objects.aggregate(last_modified=Max('updated_at'), count=Count('id'))
+    return version['last_modified'], version['count']
+
+
+def conditional_response(request, etag: str, last_modified=None) -> Optional[Any]:
+    """
+    Resposta 304 (ou 412) se os validadores da requisição (If-None-Match,
+    If-Modified-Since, ...) baterem com `etag`/`last_modified`; senão None.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag: str, last_modified=None):
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
@@ -0,0 +1,43 @@
+import random
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Modelos lidos das réplicas; o resto (usuários, tokens, jobs) fica sempre no primário
+REPLICA_READ_MODELS = {
+    'pokemon_api.pokemon', 'pokemon_api.type', 'pokemon_api.ability', 'pokemon_api.typeeffectiveness',
+}
+
+
+def replica_aliases():
+    return list(getattr(settings, 'REPLICA_DATABASES', []))
+
+
+class ReadReplicaRouter:
+    """
+    Leituras de Pokemon (e das tabelas normalizadas de tipos e habilidades) vão
+    para uma das réplicas de REPLICA_DATABASES, escolhida ao acaso; escritas e
+    migrações, para o primário. Dentro de uma transação no primário as leituras
+    também ficam nele, para enxergarem o que a própria transação gravou.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.label_lower not in REPLICA_READ_MODELS:
+            return DEFAULT_DB_ALIAS
+        replicas = replica_aliases()
+        if not replicas or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplicas têm os mesmos dados do primário
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in replica_aliases()
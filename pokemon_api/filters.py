@@ -0,0 +1,72 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+from pokemon_api.models import STAT_COLUMNS
+
+# Parâmetros de query `min_<stat>`/`max_<stat>`: colunas de status de Pokemon
+STAT_PARAMS = list(STAT_COLUMNS.values()) + ['stats_total']
+
+
+def _int_param(request, name):
+    value = request.query_params.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: "Must be an integer."})
+
+
+class PokemonFilterBackend(BaseFilterBackend):
+    """
+    Filtros da listagem de pokémons:
+    - `type` e `ability`: pokémons que possuem o tipo/habilidade;
+    - `min_<stat>` e `max_<stat>`: faixa de um status base (hp, attack,
+      defense, special_attack, special_defense, speed) ou da soma deles
+      (stats_total).
+
+    Usa as tabelas normalizadas de tipos/habilidades e as colunas de status,
+    todas indexadas, em vez de varrer os campos JSON.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        pokemon_type = request.query_params.get('type')
+        if pokemon_type:
+            queryset = queryset.filter(normalized_types__name=pokemon_type.strip().lower())
+
+        ability = request.query_params.get('ability')
+        if ability:
+            queryset = queryset.filter(normalized_abilities__name=ability.strip().lower())
+
+        for param in STAT_PARAMS:
+            minimum = _int_param(request, f'min_{param}')
+            if minimum is not None:
+                queryset = queryset.filter(**{f'{param}__gte': minimum})
+            maximum = _int_param(request, f'max_{param}')
+            if maximum is not None:
+                queryset = queryset.filter(**{f'{param}__lte': maximum})
+
+        return queryset
+
+
+class PokemonOrderingFilter(OrderingFilter):
+    """
+    `ordering=<campo>` (ou `-<campo>` para decrescente) entre pokemon_id, name,
+    score e as colunas de status. O `id` entra como desempate para a paginação
+    por cursor ser determinística; pokémons sem valor no campo ordenado ficam
+    de fora, já que o cursor não consegue se posicionar em NULL.
+    """
+    ordering_fields = ['pokemon_id', 'name', 'score'] + STAT_PARAMS
+
+    def get_default_ordering(self, view):
+        return ['pokemon_id', 'id']
+
+    def get_ordering(self, request, queryset, view):
+        ordering = list(super().get_ordering(request, queryset, view))
+        if 'id' not in ordering and '-id' not in ordering:
+            ordering.append('id')
+        return ordering
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        return queryset.filter(**{f"{ordering[0].lstrip('-')}__isnull": False}).order_by(*ordering)
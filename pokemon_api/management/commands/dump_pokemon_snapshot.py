@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from pokemon_api.services.pokemon_api_service import PokemonAPIService
+from pokemon_api.services.snapshot_service import dump_snapshot, snapshot_path
+
+
+class Command(BaseCommand):
+    help = (
+        "Baixa pokémons da PokeAPI para o snapshot local (SQLite) usado pelo backend "
+        "POKEAPI['BACKEND'] = 'snapshot'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=100000, help="Quantos pokémons da listagem baixar.")
+        parser.add_argument('--offset', type=int, default=0, help="Posição inicial na listagem da PokeAPI.")
+        parser.add_argument('--path', help="Arquivo do snapshot (padrão: POKEAPI['SNAPSHOT_PATH']).")
+        parser.add_argument('--chunk-size', type=int, default=100, help="Pokémons buscados e gravados por bloco.")
+
+    def handle(self, *args, **options):
+        if options['limit'] <= 0 or options['chunk_size'] <= 0:
+            raise CommandError("--limit and --chunk-size must be positive integers")
+
+        path = options['path'] or snapshot_path()
+        failed = []
+
+        def report_error(name, error):
+            failed.append(name)
+            self.stderr.write(f"Error fetching Pokemon {name}: {error}")
+
+        def report_progress(done, total):
+            self.stdout.write(f"{done}/{total} fetched")
+
+        # Sempre pela rede, mesmo com o backend 'snapshot' ativo
+        written = dump_snapshot(
+            PokemonAPIService(), path, limit=options['limit'], offset=options['offset'],
+            chunk_size=options['chunk_size'], on_error=report_error, on_progress=report_progress,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Snapshot {path}: {written} written, {len(failed)} failed."))
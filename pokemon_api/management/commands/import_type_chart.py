@@ -0,0 +1,33 @@
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from pokemon_api.services.matchup_service import import_type_chart
+from pokemon_api.services.snapshot_service import (
+    PokemonSnapshotStore, SnapshotPokemonAPIService, get_pokemon_api_service, snapshot_path,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa a tabela de efetividade dos 18 tipos (multiplicadores de dano) da PokeAPI, ou do "
+        "snapshot local, usada pelos endpoints de confronto e counters."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--snapshot', action='store_true',
+                            help="Lê a tabela do snapshot local em vez do backend configurado.")
+        parser.add_argument('--path', help="Arquivo do snapshot (padrão: POKEAPI['SNAPSHOT_PATH']).")
+
+    def handle(self, *args, **options):
+        if options['snapshot']:
+            service = SnapshotPokemonAPIService(store=PokemonSnapshotStore(options['path'] or snapshot_path()))
+        else:
+            service = get_pokemon_api_service()
+
+        try:
+            chart = service.fetch_type_chart()
+            imported = import_type_chart(chart)
+        except (requests.RequestException, ValueError) as e:
+            raise CommandError(f"Could not import the type chart: {e}")
+
+        self.stdout.write(self.style.SUCCESS(f"Type chart imported: {imported} type pairs."))
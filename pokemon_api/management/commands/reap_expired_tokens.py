@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from pokemon_api.services.token_service import DEFAULT_TOKEN_REAP_BATCH_SIZE, reap_expired_tokens
+
+
+class Command(BaseCommand):
+    help = "Apaga, em lotes, os access tokens OAuth2 expirados (para rodar periodicamente, ex.: cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_TOKEN_REAP_BATCH_SIZE,
+                            help="Tokens apagados por transação.")
+
+    def handle(self, *args, **options):
+        deleted = reap_expired_tokens(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired access tokens."))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from pokemon_api.models import Pokemon
+from pokemon_api.services.score_service import ScoreService
+from pokemon_api.signals import pokemons_bulk_saved
+
+
+class Command(BaseCommand):
+    help = "Recalcula, em lote, os scores vencidos (sem score ou com outra versão dos pesos de ScoreService)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help="Pokémons recalculados por lote.")
+        parser.add_argument('--all', action='store_true', help="Recalcula todos os pokémons, não só os vencidos.")
+
+    def handle(self, *args, **options):
+        score_service = ScoreService()
+        weights_version = score_service.weights_version
+        batch_size = options['batch_size']
+
+        queryset = Pokemon.objects.only('id', 'types', 'abilities', 'base_stats', 'height', 'weight')
+        if not options['all']:
+            queryset = queryset.filter(Q(score__isnull=True) | ~Q(score_version=weights_version))
+
+        # Pagina pela chave primária: os lotes já gravados deixam de ser "vencidos"
+        last_id = None
+        updated = 0
+        while True:
+            batch_queryset = queryset.order_by('id')
+            if last_id is not None:
+                batch_queryset = batch_queryset.filter(id__gt=last_id)
+            batch = list(batch_queryset[:batch_size])
+            if not batch:
+                break
+
+            for pokemon, score in zip(batch, score_service.score_pokemons(batch)):
+                pokemon.score = score
+                pokemon.score_version = weights_version
+            Pokemon.objects.bulk_update(batch, ['score', 'score_version'], batch_size=batch_size)
+            pokemons_bulk_saved.send(sender=Pokemon, pokemons=batch, update_fields=['score', 'score_version'])
+
+            updated += len(batch)
+            last_id = batch[-1].id
+
+        self.stdout.write(self.style.SUCCESS(f"Recomputed {updated} scores (weights version {weights_version})."))
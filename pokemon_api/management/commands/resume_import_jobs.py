@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from pokemon_api.services.import_job_service import ImportJobService
+
+
+class Command(BaseCommand):
+    help = "Retoma jobs de importação na fila ou interrompidos, a partir do último bloco gravado."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stale-after', type=int, default=None,
+            help="Segundos sem progresso para considerar um job em execução como interrompido.",
+        )
+
+    def handle(self, *args, **options):
+        service = ImportJobService()
+        jobs = service.pending_jobs(stale_after=options['stale_after'])
+
+        if not jobs:
+            self.stdout.write("No import jobs to resume.")
+            return
+
+        for job in jobs:
+            self.stdout.write(f"Resuming import job {job.id} from index {job.next_index}...")
+            job = service.run(job.id)
+            self.stdout.write(self.style.SUCCESS(
+                f"Import job {job.id} {job.status}: {job.persisted} persisted, {job.failed} failed."
+            ))
@@ -0,0 +1,112 @@
+import json
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import override_settings, setup_databases, teardown_databases
+
+from pokemon_api.benchmarks.runner import SCENARIOS, BenchmarkRunner, compare_results
+from pokemon_api.benchmarks.stub_server import StubPokeAPIServer
+
+
+def _int_list(value):
+    try:
+        return [int(item) for item in value.split(',') if item.strip()]
+    except ValueError:
+        raise CommandError(f"Expected a comma-separated list of integers, got '{value}'")
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede latência (p50/p95/p99) e vazão dos endpoints contra uma PokeAPI falsa local, num banco "
+        "descartável, e compara o resultado (JSON) com um baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Requisições por cenário.")
+        parser.add_argument('--concurrency', type=int, default=1, help="Threads fazendo requisições ao mesmo tempo.")
+        parser.add_argument('--seed', type=int, default=500, help="Pokémons gravados antes dos cenários.")
+        parser.add_argument('--import-limits', type=_int_list, default=[25, 100, 250],
+                            help="Tamanhos de importação medidos, separados por vírgula.")
+        parser.add_argument('--import-repeats', type=int, default=3, help="Importações por tamanho.")
+        parser.add_argument('--login-requests', type=int, default=20, help="Logins medidos.")
+        parser.add_argument('--latency-ms', type=float, default=20, help="Atraso de cada resposta da PokeAPI falsa.")
+        parser.add_argument('--payload-kb', type=float, default=20,
+                            help="Tamanho aproximado de cada resposta /pokemon/<nome> da PokeAPI falsa.")
+        parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                            help=f"Cenários, separados por vírgula: {', '.join(SCENARIOS)}.")
+        parser.add_argument('--output', help="Arquivo JSON onde gravar os resultados (padrão: só a saída padrão).")
+        parser.add_argument('--baseline', help="Resultados anteriores (JSON) para comparar.")
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help="Piora relativa tolerada em relação ao baseline (0.2 = 20%%).")
+
+    def handle(self, *args, **options):
+        scenarios = [scenario.strip() for scenario in options['scenarios'].split(',') if scenario.strip()]
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        if options['requests'] <= 0 or options['seed'] <= 0:
+            raise CommandError("--requests and --seed must be positive integers")
+
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as baseline_file:
+                baseline = json.load(baseline_file)
+
+        stub_size = BenchmarkRunner.required_stub_size(
+            options['seed'], options['requests'], options['import_limits'], options['import_repeats'])
+        stub = StubPokeAPIServer(size=stub_size, latency_ms=options['latency_ms'], payload_kb=options['payload_kb'])
+
+        # Banco, caches e PokeAPI descartáveis: nada do ambiente real é tocado
+        workdir = tempfile.mkdtemp(prefix='pokemon-bench-')
+        default_db = connections['default'].settings_dict
+        if default_db['ENGINE'].endswith('sqlite3'):
+            # Um arquivo (e não o SQLite em memória) para as threads do benchmark e da importação
+            default_db.setdefault('TEST', {})['NAME'] = os.path.join(workdir, 'bench.sqlite3')
+
+        pokeapi = {
+            **getattr(settings, 'POKEAPI', {}),
+            'BASE_URL': stub.base_url,
+            'BACKEND': 'http',
+            'LEADERBOARD_REDIS_URL': None,
+            'SINGLEFLIGHT_REDIS_URL': None,
+        }
+        caches = {
+            alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f"bench-{alias}"}
+            for alias in settings.CACHES
+        }
+
+        with stub, override_settings(POKEAPI=pokeapi, CACHES=caches, ALLOWED_HOSTS=['testserver'], DEBUG=False):
+            old_config = setup_databases(verbosity=0, interactive=False, serialized_aliases=set())
+            try:
+                runner = BenchmarkRunner(
+                    stub,
+                    requests=options['requests'],
+                    concurrency=options['concurrency'],
+                    seed=options['seed'],
+                    import_limits=options['import_limits'],
+                    import_repeats=options['import_repeats'],
+                    login_requests=options['login_requests'],
+                    log=self.stdout.write,
+                )
+                results = runner.run(scenarios)
+            finally:
+                teardown_databases(old_config, verbosity=0)
+                shutil.rmtree(workdir, ignore_errors=True)
+
+        output = json.dumps(results, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                output_file.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+        if baseline is not None:
+            regressions = compare_results(results, baseline, tolerance=options['tolerance'])
+            if regressions:
+                raise CommandError("Regressions against baseline:\n" + '\n'.join(regressions))
+            self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
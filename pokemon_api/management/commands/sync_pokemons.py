@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from pokemon_api.models import ImportJob
+from pokemon_api.services.import_job_service import ImportJobService
+
+
+class Command(BaseCommand):
+    help = (
+        "Sincroniza pokémons com a PokeAPI. Por padrão é incremental: usa requisições "
+        "condicionais e só regrava o que mudou."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=25, help="Quantos pokémons sincronizar.")
+        offset = parser.add_mutually_exclusive_group()
+        offset.add_argument('--offset', type=int, default=0, help="Posição inicial na listagem da PokeAPI.")
+        offset.add_argument(
+            '--resume', action='store_true',
+            help="Começa logo após o trecho da última sincronização incremental concluída.",
+        )
+        parser.add_argument('--full', action='store_true', help="Rebaixa e regrava tudo, sem requisições condicionais.")
+
+    def handle(self, *args, **options):
+        if options['limit'] <= 0:
+            raise CommandError("--limit must be a positive integer")
+
+        service = ImportJobService()
+        offset = service.next_sync_offset() if options['resume'] else options['offset']
+        mode = ImportJob.MODE_FULL if options['full'] else ImportJob.MODE_INCREMENTAL
+
+        job = ImportJob.objects.create(limit=options['limit'], offset=offset, mode=mode)
+        self.stdout.write(f"Running {mode} sync job {job.id} (limit={job.limit}, offset={job.offset})...")
+        job = service.run(job.id)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Sync job {job.id} {job.status}: {job.created_count} created, {job.updated_count} updated, "
+            f"{job.unchanged} unchanged, {job.failed} failed."
+        ))
@@ -0,0 +1,77 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from pokemon_api.services.metrics_service import (
+    db_queries_per_request, db_query_duration, finish_request_stats, http_request_duration, http_requests,
+    metrics_enabled, start_request_stats,
+)
+
+logger = logging.getLogger(__name__)
+
+SLOW_REQUEST_TOP_QUERIES = 5
+
+
+class MetricsMiddleware:
+    """
+    Mede cada requisição: latência por rota, número e tempo das consultas ao
+    banco, e loga as requisições mais lentas que POKEAPI['SLOW_REQUEST_MS']
+    com as consultas mais demoradas. Funciona em WSGI e ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        self.slow_request_ms = getattr(settings, 'POKEAPI', {}).get('SLOW_REQUEST_MS')
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not metrics_enabled():
+            return self.get_response(request)
+
+        stats, token = start_request_stats(keep_queries=bool(self.slow_request_ms))
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            finish_request_stats(token)
+        self._record(request, response, stats, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        if not metrics_enabled():
+            return await self.get_response(request)
+
+        stats, token = start_request_stats(keep_queries=bool(self.slow_request_ms))
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            finish_request_stats(token)
+        self._record(request, response, stats, time.perf_counter() - start)
+        return response
+
+    def _record(self, request, response, stats, duration):
+        match = getattr(request, 'resolver_match', None)
+        route = match.route if match is not None else 'unmatched'
+        http_requests.inc(request.method, route, str(response.status_code))
+        http_request_duration.observe(duration, request.method, route)
+        db_queries_per_request.observe(stats.queries, route)
+        db_query_duration.observe(stats.query_time, route)
+
+        if self.slow_request_ms and duration * 1000 >= self.slow_request_ms:
+            slowest = sorted(stats.query_log, key=lambda item: item[0], reverse=True)[:SLOW_REQUEST_TOP_QUERIES]
+            breakdown = '; '.join(f"{query_time * 1000:.1f} ms: {sql[:200]}" for query_time, sql in slowest)
+            logger.warning(
+                f"Slow request {request.method} {request.get_full_path()} ({route}) -> {response.status_code}: "
+                f"{duration * 1000:.0f} ms, {stats.queries} queries in {stats.query_time * 1000:.0f} ms. "
+                f"Slowest queries: {breakdown or 'none'}"
+            )
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:48
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pokemon_api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], db_index=True, default='queued', max_length=20)),
+                ('limit', models.IntegerField()),
+                ('offset', models.IntegerField(default=0)),
+                ('total', models.IntegerField(blank=True, null=True)),
+                ('next_index', models.IntegerField(default=0)),
+                ('fetched', models.IntegerField(default=0)),
+                ('persisted', models.IntegerField(default=0)),
+                ('failed', models.IntegerField(default=0)),
+                ('created_count', models.IntegerField(default=0)),
+                ('updated_count', models.IntegerField(default=0)),
+                ('errors', models.JSONField(blank=True, default=list)),
+                ('error_message', models.TextField(blank=True, default='')),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('run_started_at', models.DateTimeField(blank=True, null=True)),
+                ('run_start_index', models.IntegerField(default=0)),
+            ],
+        ),
+    ]
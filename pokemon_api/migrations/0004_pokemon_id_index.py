@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pokemon_api', '0003_incremental_sync'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pokemon',
+            name='pokemon_id',
+            field=models.IntegerField(db_index=True),
+        ),
+    ]
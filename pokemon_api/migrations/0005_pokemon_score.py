@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:54
+
+import hashlib
+import json
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+# Pesos e fórmula de ScoreService na época desta migração, copiados aqui para
+# que mudanças futuras no serviço não alterem o que ela grava
+WEIGHTS = {
+    'types': 0.4,
+    'base_stats': 0.3,
+    'abilities': 0.2,
+    'physical': 0.1,
+}
+WEIGHTS_VERSION = hashlib.sha1(json.dumps(WEIGHTS, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+
+def _score(pokemon):
+    base_stats = list(pokemon.base_stats.values())
+    if not all(isinstance(stat, int) for stat in base_stats):
+        return None
+
+    try:
+        score = 0
+        score += min(len(pokemon.types) * 50, 100) * WEIGHTS['types']
+        score += sum(base_stats) * WEIGHTS['base_stats']
+        score += min(len(pokemon.abilities) * 33.33, 100) * WEIGHTS['abilities']
+        score += (min(pokemon.height * 5, 50) + min(pokemon.weight / 20, 50)) * WEIGHTS['physical']
+    except TypeError:
+        return None
+    return round(score, 2)
+
+
+def backfill_scores(apps, schema_editor):
+    Pokemon = apps.get_model('pokemon_api', 'Pokemon')
+
+    queryset = Pokemon.objects.only('id', 'types', 'abilities', 'base_stats', 'height', 'weight').order_by('id')
+    last_id = None
+    while True:
+        batch_queryset = queryset if last_id is None else queryset.filter(id__gt=last_id)
+        batch = list(batch_queryset[:BATCH_SIZE])
+        if not batch:
+            break
+
+        # base_stats fora do formato esperado ficam sem score, como em Pokemon.refresh_score
+        scorable = [pokemon for pokemon in batch if isinstance(pokemon.base_stats, dict)]
+        for pokemon in scorable:
+            pokemon.score = _score(pokemon)
+            pokemon.score_version = WEIGHTS_VERSION
+        Pokemon.objects.bulk_update(scorable, ['score', 'score_version'], batch_size=BATCH_SIZE)
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pokemon_api', '0004_pokemon_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pokemon',
+            name='score',
+            field=models.FloatField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='pokemon',
+            name='score_version',
+            field=models.CharField(blank=True, default='', max_length=16),
+        ),
+        migrations.RunPython(backfill_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,129 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:58
+
+from django.db import migrations, models
+
+STAT_COLUMNS = {
+    'hp': 'hp',
+    'attack': 'attack',
+    'defense': 'defense',
+    'special-attack': 'special_attack',
+    'special-defense': 'special_defense',
+    'speed': 'speed',
+}
+BATCH_SIZE = 500
+
+
+def _names(values):
+    if not isinstance(values, list):
+        return []
+    return list(dict.fromkeys(value.strip().lower() for value in values if isinstance(value, str) and value.strip()))
+
+
+def backfill_normalized_storage(apps, schema_editor):
+    Pokemon = apps.get_model('pokemon_api', 'Pokemon')
+    Type = apps.get_model('pokemon_api', 'Type')
+    Ability = apps.get_model('pokemon_api', 'Ability')
+    TypeLink = Pokemon.normalized_types.through
+    AbilityLink = Pokemon.normalized_abilities.through
+
+    pokemons = list(Pokemon.objects.only('id', 'types', 'abilities', 'base_stats'))
+
+    for pokemon in pokemons:
+        base_stats = pokemon.base_stats if isinstance(pokemon.base_stats, dict) else {}
+        total = None
+        for stat, column in STAT_COLUMNS.items():
+            value = base_stats.get(stat)
+            value = value if isinstance(value, int) and not isinstance(value, bool) else None
+            setattr(pokemon, column, value)
+            if value is not None:
+                total = (total or 0) + value
+        pokemon.stats_total = total
+    Pokemon.objects.bulk_update(pokemons, list(STAT_COLUMNS.values()) + ['stats_total'], batch_size=BATCH_SIZE)
+
+    type_names = {name for pokemon in pokemons for name in _names(pokemon.types)}
+    ability_names = {name for pokemon in pokemons for name in _names(pokemon.abilities)}
+    Type.objects.bulk_create([Type(name=name) for name in type_names], ignore_conflicts=True)
+    Ability.objects.bulk_create([Ability(name=name) for name in ability_names], ignore_conflicts=True)
+    type_ids = dict(Type.objects.values_list('name', 'id'))
+    ability_ids = dict(Ability.objects.values_list('name', 'id'))
+
+    TypeLink.objects.bulk_create(
+        [TypeLink(pokemon_id=pokemon.id, type_id=type_ids[name])
+         for pokemon in pokemons for name in _names(pokemon.types)],
+        batch_size=BATCH_SIZE,
+    )
+    AbilityLink.objects.bulk_create(
+        [AbilityLink(pokemon_id=pokemon.id, ability_id=ability_ids[name])
+         for pokemon in pokemons for name in _names(pokemon.abilities)],
+        batch_size=BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pokemon_api', '0005_pokemon_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Ability',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Type',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='pokemon',
+            name='attack',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='pokemon',
+            name='defense',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='pokemon',
+            name='hp',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='pokemon',
+            name='special_attack',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='pokemon',
+            name='special_defense',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='pokemon',
+            name='speed',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='pokemon',
+            name='stats_total',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='pokemon',
+            name='normalized_abilities',
+            field=models.ManyToManyField(blank=True, related_name='pokemons', to='pokemon_api.ability'),
+        ),
+        migrations.AddField(
+            model_name='pokemon',
+            name='normalized_types',
+            field=models.ManyToManyField(blank=True, related_name='pokemons', to='pokemon_api.type'),
+        ),
+        migrations.RunPython(backfill_normalized_storage, migrations.RunPython.noop),
+    ]
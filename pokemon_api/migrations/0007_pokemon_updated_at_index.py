@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pokemon_api', '0006_normalized_storage'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pokemon',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pokemon_api', '0007_pokemon_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TypeEffectiveness',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('multiplier', models.FloatField()),
+                ('attacking_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attack_relations', to='pokemon_api.type')),
+                ('defending_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='defense_relations', to='pokemon_api.type')),
+            ],
+            options={
+                'unique_together': {('attacking_type', 'defending_type')},
+            },
+        ),
+    ]
@@ -2,19 +2,157 @@ import uuid
 
 from django.db import models
 
+from pokemon_api.services.score_service import ScoreService
+
+
+# Mapeamento chave de Pokemon.base_stats -> coluna de status
+STAT_COLUMNS = {
+    'hp': 'hp',
+    'attack': 'attack',
+    'defense': 'defense',
+    'special-attack': 'special_attack',
+    'special-defense': 'special_defense',
+    'speed': 'speed',
+}
+
+
+class Type(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class Ability(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class TypeEffectiveness(models.Model):
+    """
+    Multiplicador de dano de um tipo atacante contra um tipo defensor, importado
+    da PokeAPI (import_type_chart). A tabela completa tem um par para cada
+    combinação dos 18 tipos, inclusive os neutros (1.0).
+    """
+    attacking_type = models.ForeignKey(Type, on_delete=models.CASCADE, related_name='attack_relations')
+    defending_type = models.ForeignKey(Type, on_delete=models.CASCADE, related_name='defense_relations')
+    multiplier = models.FloatField()
+
+    class Meta:
+        unique_together = ('attacking_type', 'defending_type')
+
+    def __str__(self):
+        return f"{self.attacking_type} -> {self.defending_type}: {self.multiplier}"
+
 
 class Pokemon(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     name = models.CharField(max_length=100, unique=True)
-    pokemon_id = models.IntegerField()
+    pokemon_id = models.IntegerField(db_index=True)
     types = models.JSONField()
     abilities = models.JSONField()
     base_stats = models.JSONField()
     height = models.IntegerField()
     weight = models.IntegerField()
     sprite_url = models.URLField()
+    # Hash do conteúdo formatado e validadores HTTP da última resposta da PokeAPI,
+    # usados pela sincronização incremental
+    content_hash = models.CharField(max_length=64, blank=True, default='')
+    etag = models.CharField(max_length=255, blank=True, default='')
+    last_modified = models.CharField(max_length=64, blank=True, default='')
+    # Score pré-calculado e a versão dos pesos de ScoreService usada no cálculo
+    score = models.FloatField(null=True, blank=True, db_index=True)
+    score_version = models.CharField(max_length=16, blank=True, default='')
+    # Cópia normalizada de base_stats, types e abilities (os campos JSON continuam
+    # sendo a fonte da API), para filtrar e ordenar com índices no banco
+    hp = models.IntegerField(null=True, blank=True, db_index=True)
+    attack = models.IntegerField(null=True, blank=True, db_index=True)
+    defense = models.IntegerField(null=True, blank=True, db_index=True)
+    special_attack = models.IntegerField(null=True, blank=True, db_index=True)
+    special_defense = models.IntegerField(null=True, blank=True, db_index=True)
+    speed = models.IntegerField(null=True, blank=True, db_index=True)
+    stats_total = models.IntegerField(null=True, blank=True, db_index=True)
+    normalized_types = models.ManyToManyField(Type, related_name='pokemons', blank=True)
+    normalized_abilities = models.ManyToManyField(Ability, related_name='pokemons', blank=True)
+
+    def __str__(self):
+        return f"{self.name} (#{self.pokemon_id})"
+
+    def refresh_score(self, score_service=None):
+        score_service = score_service or ScoreService()
+        try:
+            self.score = score_service.calculate_score(score_service.score_data(self))
+        except (AttributeError, TypeError, ValueError):
+            self.score = None
+        self.score_version = score_service.weights_version
+
+    def refresh_stat_columns(self):
+        base_stats = self.base_stats if isinstance(self.base_stats, dict) else {}
+        total = None
+        for stat, column in STAT_COLUMNS.items():
+            value = base_stats.get(stat)
+            value = value if isinstance(value, int) and not isinstance(value, bool) else None
+            setattr(self, column, value)
+            if value is not None:
+                total = (total or 0) + value
+        self.stats_total = total
+
+    def save(self, *args, **kwargs):
+        self.refresh_score()
+        self.refresh_stat_columns()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = (set(update_fields) | {'score', 'score_version', 'stats_total'}
+                                       | set(STAT_COLUMNS.values()))
+        super().save(*args, **kwargs)
+
+
+class ImportJob(models.Model):
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    MODE_FULL = 'full'
+    MODE_INCREMENTAL = 'incremental'
+    MODE_CHOICES = [
+        (MODE_FULL, 'Full'),
+        (MODE_INCREMENTAL, 'Incremental'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED, db_index=True)
+    mode = models.CharField(max_length=20, choices=MODE_CHOICES, default=MODE_FULL)
+    limit = models.IntegerField()
+    offset = models.IntegerField(default=0)
+    total = models.IntegerField(null=True, blank=True)
+    # Checkpoint: quantos nomes da listagem já foram processados e gravados
+    next_index = models.IntegerField(default=0)
+    fetched = models.IntegerField(default=0)
+    persisted = models.IntegerField(default=0)
+    failed = models.IntegerField(default=0)
+    # Pokémons sem mudança (304 ou mesmo hash de conteúdo), que não foram regravados
+    unchanged = models.IntegerField(default=0)
+    created_count = models.IntegerField(default=0)
+    updated_count = models.IntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    error_message = models.TextField(blank=True, default='')
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Início da execução atual (muda ao retomar), usado para estimar o ETA
+    run_started_at = models.DateTimeField(null=True, blank=True)
+    run_start_index = models.IntegerField(default=0)
 
     def __str__(self):
-        return f"{self.name} (#{self.pokemon_id})"
\ No newline at end of file
+        return f"ImportJob {self.id} ({self.status})"
@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class PokemonCursorPagination(CursorPagination):
+    """
+    Paginação por cursor (keyset) ordenada por pokemon_id: cada página é uma
+    busca por faixa no índice, com custo constante independente da posição.
+    """
+    ordering = ('pokemon_id', 'id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
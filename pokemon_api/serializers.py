@@ -1,13 +1,45 @@
 from rest_framework import serializers
 
-from .models import Pokemon
+from .models import ImportJob, Pokemon
+from .services.import_job_service import estimate_eta_seconds
 
 
-class PokemonSerializer(serializers.ModelSerializer):
+class DynamicFieldsModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer que aceita um argumento `fields` para devolver apenas
+    um subconjunto dos campos.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+
+class PokemonSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Pokemon
         fields = [
             'id', 'created_at', 'updated_at', 'name', 'pokemon_id',
             'types', 'abilities', 'base_stats', 'height', 'weight', 'sprite_url'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
\ No newline at end of file
+        read_only_fields = ['id', 'created_at', 'updated_at']
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    eta_seconds = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            'id', 'status', 'mode', 'limit', 'offset', 'total', 'next_index', 'fetched', 'persisted', 'unchanged',
+            'failed', 'created_count', 'updated_count', 'eta_seconds', 'errors', 'error_message',
+            'created_at', 'started_at', 'finished_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+    def get_eta_seconds(self, obj):
+        return estimate_eta_seconds(obj)
@@ -0,0 +1,153 @@
+import asyncio
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Union
+from urllib.parse import urlsplit
+
+import httpx
+from django.conf import settings
+
+from pokemon_api.services.cache_service import PokemonDetailsCache, get_details_cache
+from pokemon_api.services.http_client import (
+    DEFAULT_RETRIES, RETRY_STATUSES, CircuitOpenError, get_circuit_breaker, get_timeout, is_upstream_failure,
+    retry_delay, retry_settings,
+)
+from pokemon_api.services.metrics_service import observe_upstream, upstream_requests
+from pokemon_api.services.pokemon_api_service import DEFAULT_BASE_URL, PokemonRecord, format_pokemon_data
+
+DEFAULT_ASYNC_MAX_CONNECTIONS = 200
+DEFAULT_ASYNC_MAX_KEEPALIVE = 50
+
+# Um AsyncClient (e seu pool de conexões) por event loop, já que as conexões
+# ficam presas ao loop em que foram abertas. Sob ASGI há um único loop por
+# processo e, portanto, um único pool compartilhado por todas as requisições.
+_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]' = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Retorna o AsyncClient compartilhado do event loop em execução."""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        client = _clients.get(loop)
+        if client is None:
+            config = getattr(settings, 'POKEAPI', {})
+            limits = httpx.Limits(
+                max_connections=config.get('ASYNC_MAX_CONNECTIONS', DEFAULT_ASYNC_MAX_CONNECTIONS),
+                max_keepalive_connections=config.get('ASYNC_MAX_KEEPALIVE', DEFAULT_ASYNC_MAX_KEEPALIVE),
+            )
+            connect_timeout, read_timeout = get_timeout()
+            client = httpx.AsyncClient(
+                follow_redirects=True,
+                limits=limits,
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                # O transporte do httpx só repete falhas de conexão; 429/5xx são
+                # repetidos por AsyncPokemonAPIService._get
+                transport=httpx.AsyncHTTPTransport(limits=limits, retries=config.get('RETRIES', DEFAULT_RETRIES)),
+            )
+            _clients[loop] = client
+        return client
+
+
+class AsyncPokemonAPIService:
+    """
+    Versão assíncrona de PokemonAPIService para as views async (ASGI): as
+    chamadas à PokeAPI não bloqueiam o event loop, então um único worker
+    atende muitas consultas simultâneas enquanto elas esperam pela PokeAPI.
+    Usa o mesmo cache de detalhes e o mesmo formato de saída da versão síncrona.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, client: Optional[httpx.AsyncClient] = None,
+                 cache: Optional[PokemonDetailsCache] = None):
+        config = getattr(settings, 'POKEAPI', {})
+        self.base_url = (base_url or config.get('BASE_URL', DEFAULT_BASE_URL)).rstrip('/')
+        self._client = client
+        self.cache = cache or get_details_cache()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or get_async_client()
+
+    async def _get(self, url: str, **kwargs) -> httpx.Response:
+        breaker = get_circuit_breaker(urlsplit(url).netloc)
+        try:
+            breaker.before_request()
+        except CircuitOpenError:
+            upstream_requests.inc('async', 'circuit_open')
+            raise
+        retries, backoff_factor, retry_after_max = retry_settings()
+        start = time.perf_counter()
+        attempt = 0
+        try:
+            while True:
+                response = await self.client.get(url, **kwargs)
+                if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                    break
+                # Mesma política do Retry da sessão síncrona (http_client.build_retry)
+                attempt += 1
+                await response.aclose()
+                await asyncio.sleep(retry_delay(attempt, backoff_factor, retry_after_max,
+                                                response.status_code, response.headers.get('Retry-After')))
+        except BaseException:
+            # Inclui CancelledError (cliente desconectou): se esta era a requisição
+            # de teste do disjuntor meio-aberto, ele precisa saber do resultado
+            observe_upstream('async', 'error', time.perf_counter() - start)
+            breaker.record_failure()
+            raise
+
+        observe_upstream('async', str(response.status_code), time.perf_counter() - start)
+        if is_upstream_failure(response.status_code):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        response.raise_for_status()
+        return response
+
+    async def _fetch_pokemon_details(self, pokemon_name: str) -> PokemonRecord:
+        response = await self._get(f"{self.base_url}/pokemon/{pokemon_name.lower()}")
+        return PokemonRecord.from_payload(response.json())
+
+    async def _fetch_pokemon_details_or_none(self, pokemon_name: str) -> Optional[PokemonRecord]:
+        try:
+            return await self._fetch_pokemon_details(pokemon_name)
+        except httpx.HTTPStatusError as e:
+            # Apenas 404 é definitivo e pode entrar no cache negativo
+            if e.response.status_code == 404:
+                return None
+            raise
+
+    async def get_pokemon_details(self, pokemon_name: str) -> Optional[PokemonRecord]:
+        key = pokemon_name.lower()
+        try:
+            return await self.cache.aget_or_fetch(key, lambda: self._fetch_pokemon_details_or_none(key))
+        except (httpx.HTTPError, CircuitOpenError, ValueError):
+            return None
+
+    def format_pokemon_data(self, data: Union[PokemonRecord, Dict[str, Any]]) -> Dict[str, Any]:
+        return format_pokemon_data(data)
+
+    async def fetch_pokemon_details_many(
+        self,
+        names: List[str],
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> List[Optional[PokemonRecord]]:
+        """
+        Busca os detalhes de vários pokémons ao mesmo tempo, limitados pelo
+        pool do cliente. Mantém a ordem de `names`; falhas viram None.
+        """
+        results = await asyncio.gather(
+            *(self._fetch_pokemon_details(name) for name in names), return_exceptions=True
+        )
+
+        details: List[Optional[PokemonRecord]] = []
+        for name, result in zip(names, results):
+            if isinstance(result, (httpx.HTTPError, CircuitOpenError, ValueError)):
+                if on_error:
+                    on_error(name, result)
+                details.append(None)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                details.append(result)
+        return details
@@ -0,0 +1,285 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+from pokemon_api.services.singleflight import DEFAULT_LOCK_TTL, SingleFlight, get_lock_backend
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+# Marcador gravado no cache para respostas 404 (cache negativo). É uma string
+# para poder ser serializado por qualquer backend de cache do Django.
+NOT_FOUND = '__pokeapi_not_found__'
+
+DEFAULT_CACHE_ALIAS = 'pokeapi'
+DEFAULT_CACHE_TTL = 24 * 60 * 60
+DEFAULT_NEGATIVE_CACHE_TTL = 5 * 60
+DEFAULT_LOCAL_CACHE_SIZE = 2048
+DEFAULT_LOCAL_CACHE_TTL = 60 * 60
+DEFAULT_WAIT_TIMEOUT = 5
+WAIT_POLL_INTERVAL = 0.05
+
+
+class LRUCache:
+    """
+    Cache em memória, thread-safe, limitado por número de entradas e com TTL.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_LOCAL_CACHE_SIZE, ttl: float = DEFAULT_LOCAL_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, default: Any = MISSING) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class PokemonDetailsCache:
+    """
+    Cache em dois níveis para os detalhes vindos da PokeAPI: um LRU local
+    na frente de um backend de cache do Django compartilhado entre processos
+    (Redis, quando configurado). Respostas 404 são guardadas como NOT_FOUND
+    por um TTL menor, e buscas concorrentes pela mesma chave esperam por uma
+    única ida à PokeAPI.
+    """
+
+    def __init__(self, local: Optional[LRUCache] = None, shared_alias: Optional[str] = None,
+                 ttl: Optional[int] = None, negative_ttl: Optional[int] = None):
+        config = getattr(settings, 'POKEAPI', {})
+        self.local = local or LRUCache(
+            maxsize=config.get('LOCAL_CACHE_SIZE', DEFAULT_LOCAL_CACHE_SIZE),
+            ttl=config.get('LOCAL_CACHE_TTL', DEFAULT_LOCAL_CACHE_TTL),
+        )
+        self.shared_alias = shared_alias or config.get('CACHE_ALIAS', DEFAULT_CACHE_ALIAS)
+        self.ttl = ttl if ttl is not None else config.get('CACHE_TTL', DEFAULT_CACHE_TTL)
+        self.negative_ttl = (negative_ttl if negative_ttl is not None
+                             else config.get('NEGATIVE_CACHE_TTL', DEFAULT_NEGATIVE_CACHE_TTL))
+
+        self.single_flight = SingleFlight()
+        self.lock_ttl = config.get('SINGLEFLIGHT_LOCK_TTL', DEFAULT_LOCK_TTL)
+        self.wait_timeout = config.get('SINGLEFLIGHT_WAIT_TIMEOUT', DEFAULT_WAIT_TIMEOUT)
+        self._stats_lock = threading.Lock()
+        self.shared_hits = 0
+        self.shared_misses = 0
+        self.negative_hits = 0
+        self.upstream_fetches = 0
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def _cache_key(self, key: str) -> str:
+        return f"pokeapi:pokemon:{key}"
+
+    def _count(self, counter: str) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _get_shared(self, key: str) -> Any:
+        try:
+            value = self.shared.get(self._cache_key(key), MISSING)
+        except Exception as e:
+            logger.warning(f"Shared cache unavailable on get: {e}")
+            return MISSING
+        self._count('shared_hits' if value is not MISSING else 'shared_misses')
+        return value
+
+    def _set_shared(self, key: str, value: Any, ttl: int) -> None:
+        try:
+            self.shared.set(self._cache_key(key), value, ttl)
+        except Exception as e:
+            logger.warning(f"Shared cache unavailable on set: {e}")
+
+    def _lookup(self, key: str) -> Any:
+        value = self.local.get(key)
+        if value is not MISSING:
+            return value
+
+        value = self._get_shared(key)
+        if value is not MISSING:
+            ttl = self.negative_ttl if value == NOT_FOUND else None
+            self.local.set(key, value, ttl=ttl)
+        return value
+
+    def get(self, key: str) -> Any:
+        """Retorna o valor em cache, NOT_FOUND, ou MISSING se a chave não estiver em cache."""
+        return self._lookup(key)
+
+    def set(self, key: str, value: Optional[Any]) -> None:
+        """Grava um valor nos dois níveis; None é gravado como NOT_FOUND."""
+        if value is None:
+            value, ttl = NOT_FOUND, self.negative_ttl
+        else:
+            ttl = self.ttl
+        self.local.set(key, value, ttl=min(ttl, self.local.ttl))
+        self._set_shared(key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        self.local.delete(key)
+        try:
+            self.shared.delete(self._cache_key(key))
+        except Exception as e:
+            logger.warning(f"Shared cache unavailable on delete: {e}")
+
+    def _acquire_fetch_lock(self, key: str):
+        """Token do lock entre processos da chave, ou None se outro processo está buscando."""
+        try:
+            return get_lock_backend().acquire(self._cache_key(key), self.lock_ttl)
+        except Exception as e:
+            # Sem o lock, cada processo busca por conta própria (como antes dele existir)
+            logger.warning(f"Single-flight lock unavailable: {e}")
+            return ''
+
+    def _release_fetch_lock(self, key: str, token: str) -> None:
+        if not token:
+            return
+        try:
+            get_lock_backend().release(self._cache_key(key), token)
+        except Exception as e:
+            logger.warning(f"Single-flight lock unavailable on release: {e}")
+
+    def _wait_for_shared(self, key: str) -> Any:
+        """Espera outro processo gravar a chave no cache compartilhado, até wait_timeout segundos."""
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(WAIT_POLL_INTERVAL)
+            value = self._lookup(key)
+            if value is not MISSING:
+                return value
+        return MISSING
+
+    def _load(self, key: str, fetch: Callable[[], Optional[Any]]) -> Any:
+        # Outra chamada pode ter preenchido o cache enquanto esta entrava no voo
+        value = self._lookup(key)
+        if value is not MISSING:
+            return value
+
+        token = self._acquire_fetch_lock(key)
+        if token is None:
+            value = self._wait_for_shared(key)
+            if value is not MISSING:
+                return value
+        try:
+            self._count('upstream_fetches')
+            value = fetch()
+            self.set(key, value)
+            return NOT_FOUND if value is None else value
+        finally:
+            self._release_fetch_lock(key, token)
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """
+        Retorna o valor em cache ou chama `fetch` uma única vez por chave
+        (single-flight): threads concorrentes esperam pela mesma busca e, com
+        o lock no Redis, processos concorrentes esperam o resultado aparecer
+        no cache compartilhado. `fetch` deve retornar None para "não
+        encontrado"; exceções não são cacheadas.
+        """
+        value = self._lookup(key)
+        if value is MISSING:
+            value = self.single_flight.do(key, lambda: self._load(key, fetch))
+        elif value == NOT_FOUND:
+            self._count('negative_hits')
+
+        return None if value == NOT_FOUND else value
+
+    async def _aload(self, key: str, fetch: Callable[[], Awaitable[Optional[Any]]]) -> Any:
+        value = await sync_to_async(self._lookup, thread_sensitive=False)(key)
+        if value is not MISSING:
+            return value
+
+        token = await sync_to_async(self._acquire_fetch_lock, thread_sensitive=False)(key)
+        if token is None:
+            deadline = time.monotonic() + self.wait_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(WAIT_POLL_INTERVAL)
+                value = await sync_to_async(self._lookup, thread_sensitive=False)(key)
+                if value is not MISSING:
+                    return value
+        try:
+            self._count('upstream_fetches')
+            value = await fetch()
+            await sync_to_async(self.set, thread_sensitive=False)(key, value)
+            return NOT_FOUND if value is None else value
+        finally:
+            await sync_to_async(self._release_fetch_lock, thread_sensitive=False)(key, token)
+
+    async def aget_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        """
+        Versão assíncrona de get_or_fetch para as views async. O LRU local é
+        consultado direto; o cache compartilhado e o lock (que podem ser Redis,
+        com I/O bloqueante) são acessados numa thread, fora do event loop.
+        """
+        value = self.local.get(key)
+        if value is MISSING:
+            value = await self.single_flight.ado(key, lambda: self._aload(key, fetch))
+        elif value == NOT_FOUND:
+            self._count('negative_hits')
+
+        return None if value == NOT_FOUND else value
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'local_hits': self.local.hits,
+            'local_misses': self.local.misses,
+            'local_size': len(self.local),
+            'shared_hits': self.shared_hits,
+            'shared_misses': self.shared_misses,
+            'negative_hits': self.negative_hits,
+            'upstream_fetches': self.upstream_fetches,
+            'coalesced_fetches': self.single_flight.coalesced,
+        }
+
+
+_details_cache: Optional[PokemonDetailsCache] = None
+_details_cache_lock = threading.Lock()
+
+
+def get_details_cache() -> PokemonDetailsCache:
+    """Retorna o cache de detalhes compartilhado pelo processo."""
+    global _details_cache
+    if _details_cache is None:
+        with _details_cache_lock:
+            if _details_cache is None:
+                _details_cache = PokemonDetailsCache()
+    return _details_cache
@@ -0,0 +1,231 @@
+import email.utils
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 10
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 20
+DEFAULT_RETRIES = 2
+DEFAULT_RETRY_BACKOFF = 0.5
+DEFAULT_RETRY_AFTER_MAX = 10
+DEFAULT_BREAKER_FAILURE_THRESHOLD = 5
+DEFAULT_BREAKER_RESET_TIMEOUT = 30
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Mesmo teto de backoff e mesmos status com Retry-After do urllib3
+RETRY_BACKOFF_MAX = Retry.DEFAULT_BACKOFF_MAX
+RETRY_AFTER_STATUSES = Retry.RETRY_AFTER_STATUS_CODES
+
+
+def _config() -> dict:
+    return getattr(settings, 'POKEAPI', {})
+
+
+def get_timeout() -> tuple:
+    """(connect, read) em segundos, usado em todas as requisições à PokeAPI."""
+    config = _config()
+    return (config.get('CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT),
+            config.get('READ_TIMEOUT', DEFAULT_READ_TIMEOUT))
+
+
+class JitteredRetry(Retry):
+    """
+    Retry do urllib3 com backoff exponencial "full jitter" (um valor aleatório
+    entre 0 e o backoff), para que clientes que falharam juntos não tentem de
+    novo juntos. O Retry-After da PokeAPI é respeitado, mas limitado a
+    `retry_after_max` segundos para não prender o worker.
+    """
+
+    def __init__(self, *args, retry_after_max: float = DEFAULT_RETRY_AFTER_MAX, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.retry_after_max = retry_after_max
+
+    def new(self, **kwargs) -> 'JitteredRetry':
+        # O urllib3 cria um Retry novo a cada tentativa; o limite vai junto
+        kwargs.setdefault('retry_after_max', self.retry_after_max)
+        return super().new(**kwargs)
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        return random.uniform(0, backoff) if backoff > 0 else 0
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.retry_after_max)
+
+
+def retry_settings() -> Tuple[int, float, float]:
+    """(tentativas extras, fator de backoff, limite do Retry-After), comuns aos clientes síncrono e assíncrono."""
+    config = _config()
+    return (config.get('RETRIES', DEFAULT_RETRIES),
+            config.get('RETRY_BACKOFF', DEFAULT_RETRY_BACKOFF),
+            config.get('RETRY_AFTER_MAX', DEFAULT_RETRY_AFTER_MAX))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Segundos pedidos por um cabeçalho Retry-After (número ou data HTTP); None se ausente ou inválido."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    parsed = email.utils.parsedate_tz(value)
+    if parsed is None:
+        return None
+    return max(email.utils.mktime_tz(parsed) - time.time(), 0.0)
+
+
+def retry_delay(attempt: int, backoff_factor: float, retry_after_max: float,
+                status_code: Optional[int] = None, retry_after: Optional[str] = None) -> float:
+    """
+    Espera antes da tentativa extra número `attempt` (a partir de 1), com a
+    mesma política de JitteredRetry: Retry-After (limitado a retry_after_max)
+    em 413/429/503 e, sem ele, backoff exponencial com "full jitter", sem
+    espera antes da primeira repetição.
+    """
+    if status_code in RETRY_AFTER_STATUSES:
+        seconds = parse_retry_after(retry_after)
+        if seconds is not None:
+            return min(seconds, retry_after_max)
+    if attempt <= 1:
+        return 0.0
+    backoff = min(backoff_factor * (2 ** (attempt - 1)), RETRY_BACKOFF_MAX)
+    return random.uniform(0, backoff) if backoff > 0 else 0.0
+
+
+def build_retry() -> Retry:
+    retries, backoff_factor, retry_after_max = retry_settings()
+    return JitteredRetry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        backoff_factor=backoff_factor,
+        respect_retry_after_header=True,
+        # Esgotadas as tentativas, devolve a última resposta para raise_for_status
+        raise_on_status=False,
+        retry_after_max=retry_after_max,
+    )
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    Sessão HTTP do processo, compartilhada por todas as instâncias de
+    PokemonAPIService: as conexões keep-alive com a PokeAPI são reaproveitadas
+    entre requisições em vez de reabertas a cada view.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                config = _config()
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=config.get('POOL_CONNECTIONS', DEFAULT_POOL_CONNECTIONS),
+                    pool_maxsize=config.get('POOL_MAXSIZE', DEFAULT_POOL_MAXSIZE),
+                    max_retries=build_retry(),
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+
+class CircuitOpenError(requests.RequestException):
+    """A PokeAPI está marcada como fora do ar; a requisição nem é feita."""
+
+
+class CircuitBreaker:
+    """
+    Disjuntor por host: após `failure_threshold` falhas seguidas (erros de
+    conexão, timeouts, 429/5xx depois dos retries) ele abre e as requisições
+    falham imediatamente com CircuitOpenError por `reset_timeout` segundos.
+    Depois disso uma única requisição de teste é liberada (meio-aberto): se
+    der certo o disjuntor fecha, se falhar ele abre de novo. Se o teste não
+    reportar o resultado em `reset_timeout` segundos (exceção não tratada,
+    task cancelada), outro é liberado, para o disjuntor não ficar preso.
+    """
+
+    STATE_CLOSED = 'closed'
+    STATE_OPEN = 'open'
+    STATE_HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: Optional[int] = None, reset_timeout: Optional[float] = None):
+        config = _config()
+        self.name = name
+        self.failure_threshold = failure_threshold or config.get(
+            'BREAKER_FAILURE_THRESHOLD', DEFAULT_BREAKER_FAILURE_THRESHOLD)
+        self.reset_timeout = (reset_timeout if reset_timeout is not None
+                              else config.get('BREAKER_RESET_TIMEOUT', DEFAULT_BREAKER_RESET_TIMEOUT))
+        self.state = self.STATE_CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._half_open_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_request(self) -> None:
+        with self._lock:
+            if self.state == self.STATE_CLOSED:
+                return
+            now = time.monotonic()
+            if self.state == self.STATE_OPEN and now - self._opened_at >= self.reset_timeout:
+                self.state = self.STATE_HALF_OPEN
+                self._half_open_at = now
+                return
+            if self.state == self.STATE_HALF_OPEN and now - self._half_open_at >= self.reset_timeout:
+                # O teste anterior nunca reportou; libera outro
+                logger.warning(f"Circuit breaker probe for {self.name} did not report back; sending another")
+                self._half_open_at = now
+                return
+            raise CircuitOpenError(f"Circuit breaker open for {self.name}")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.STATE_CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.STATE_HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.STATE_OPEN:
+                    logger.error(f"Circuit breaker opened for {self.name} after {self.failures} failures")
+                self.state = self.STATE_OPEN
+                self._opened_at = time.monotonic()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(host: str) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(host)
+            _breakers[host] = breaker
+        return breaker
+
+
+def is_upstream_failure(status_code: int) -> bool:
+    """Respostas que contam como falha da PokeAPI para o disjuntor (404 não conta)."""
+    return status_code in RETRY_STATUSES
@@ -0,0 +1,227 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from pokemon_api.models import ImportJob, Pokemon
+from pokemon_api.services.metrics_service import import_stage_duration, timed
+from pokemon_api.services.persistence_service import PokemonBulkWriter
+from pokemon_api.services.pokemon_api_service import PokemonAPIService
+from pokemon_api.services.snapshot_service import get_pokemon_api_service
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IMPORT_WORKERS = 2
+DEFAULT_IMPORT_CHUNK_SIZE = 100
+DEFAULT_RESUME_STALE_AFTER = 5 * 60
+MAX_STORED_ERRORS = 100
+
+_config = getattr(settings, 'POKEAPI', {})
+_executor = ThreadPoolExecutor(
+    max_workers=_config.get('IMPORT_WORKERS', DEFAULT_IMPORT_WORKERS),
+    thread_name_prefix='pokemon-import',
+)
+_active_jobs: Set[str] = set()
+_active_jobs_lock = threading.Lock()
+
+
+def estimate_eta_seconds(job: ImportJob) -> Optional[float]:
+    """Estima o tempo restante a partir do ritmo da execução atual."""
+    if job.status != ImportJob.STATUS_RUNNING or job.total is None or not job.run_started_at:
+        return None
+
+    processed = job.next_index - job.run_start_index
+    if processed <= 0:
+        return None
+
+    elapsed = (timezone.now() - job.run_started_at).total_seconds()
+    remaining = max(job.total - job.next_index, 0)
+    return round(elapsed / processed * remaining, 1)
+
+
+class ImportJobService:
+    """
+    Importa pokémons da PokeAPI em segundo plano. Cada job processa a listagem
+    em blocos de `chunk_size` nomes: busca os detalhes em paralelo, grava em
+    lote e salva o progresso (`next_index`) na mesma transação. Um job
+    interrompido retoma a partir do último bloco gravado.
+
+    No modo incremental, as requisições são condicionais (ETag/Last-Modified
+    guardados em cada pokémon) e o conteúdo que não mudou não é regravado.
+    """
+
+    def __init__(self, api_service: Optional[PokemonAPIService] = None, writer: Optional[PokemonBulkWriter] = None,
+                 chunk_size: Optional[int] = None):
+        config = getattr(settings, 'POKEAPI', {})
+        self.api_service = api_service or get_pokemon_api_service()
+        self.writer = writer or PokemonBulkWriter()
+        self.chunk_size = chunk_size or config.get('IMPORT_CHUNK_SIZE', DEFAULT_IMPORT_CHUNK_SIZE)
+
+    def enqueue(self, limit: int, offset: int = 0, mode: str = ImportJob.MODE_FULL) -> ImportJob:
+        job = ImportJob.objects.create(limit=limit, offset=offset, mode=mode)
+        transaction.on_commit(lambda: self.submit(job.id))
+        return job
+
+    def submit(self, job_id) -> None:
+        job_key = str(job_id)
+        with _active_jobs_lock:
+            if job_key in _active_jobs:
+                return
+            _active_jobs.add(job_key)
+        _executor.submit(self._run_in_worker, job_key)
+
+    def next_sync_offset(self) -> int:
+        """
+        Offset em que a próxima sincronização incremental deve começar: logo
+        após o trecho da última sincronização concluída, ou 0 se ela chegou ao
+        fim da listagem.
+        """
+        last_job = (
+            ImportJob.objects
+            .filter(mode=ImportJob.MODE_INCREMENTAL, status=ImportJob.STATUS_COMPLETED)
+            .order_by('-finished_at')
+            .first()
+        )
+        if last_job is None or last_job.total is None or last_job.total < last_job.limit:
+            return 0
+        return last_job.offset + last_job.total
+
+    def pending_jobs(self, stale_after: Optional[int] = None) -> List[ImportJob]:
+        """
+        Jobs na fila e jobs em execução sem progresso há mais de `stale_after`
+        segundos (por exemplo, após a queda do processo que os executava).
+        """
+        if stale_after is None:
+            stale_after = getattr(settings, 'POKEAPI', {}).get('IMPORT_RESUME_STALE_AFTER', DEFAULT_RESUME_STALE_AFTER)
+        cutoff = timezone.now() - timedelta(seconds=stale_after)
+
+        return list(
+            (ImportJob.objects.filter(status=ImportJob.STATUS_QUEUED)
+             | ImportJob.objects.filter(status=ImportJob.STATUS_RUNNING, updated_at__lt=cutoff))
+            .order_by('created_at')
+        )
+
+    def resume_pending(self, stale_after: Optional[int] = None) -> List[ImportJob]:
+        jobs = self.pending_jobs(stale_after=stale_after)
+        for job in jobs:
+            self.submit(job.id)
+        return jobs
+
+    def _run_in_worker(self, job_id: str) -> None:
+        close_old_connections()
+        try:
+            self.run(job_id)
+        except Exception as e:
+            logger.error(f"Error running import job {job_id}: {e}")
+            ImportJob.objects.filter(id=job_id).update(
+                status=ImportJob.STATUS_FAILED,
+                error_message=str(e),
+                finished_at=timezone.now(),
+                updated_at=timezone.now(),
+            )
+        finally:
+            with _active_jobs_lock:
+                _active_jobs.discard(job_id)
+            close_old_connections()
+
+    def run(self, job_id) -> ImportJob:
+        job = ImportJob.objects.get(id=job_id)
+        if job.status in (ImportJob.STATUS_COMPLETED, ImportJob.STATUS_FAILED):
+            return job
+
+        now = timezone.now()
+        job.status = ImportJob.STATUS_RUNNING
+        job.started_at = job.started_at or now
+        job.run_started_at = now
+        job.run_start_index = job.next_index
+        job.save(update_fields=['status', 'started_at', 'run_started_at', 'run_start_index', 'updated_at'])
+
+        # A listagem é ordenada pela PokeAPI, então a mesma (limit, offset) gera a mesma
+        # sequência de nomes e `next_index` continua válido ao retomar
+        names = self.api_service.list_pokemon_names(limit=job.limit, offset=job.offset)
+        if job.total != len(names):
+            job.total = len(names)
+            job.save(update_fields=['total', 'updated_at'])
+
+        for start in range(job.next_index, len(names), self.chunk_size):
+            self._process_chunk(job, names[start:start + self.chunk_size], start)
+
+        job.status = ImportJob.STATUS_COMPLETED
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'finished_at', 'updated_at'])
+        return job
+
+    def _fetch_chunk(self, job: ImportJob, names: List[str], report_error) -> Tuple[list, Dict[str, Tuple[str, str]], int]:
+        """
+        Retorna (detalhes, validadores, não modificados). No modo incremental,
+        pokémons que a PokeAPI responde com 304 não entram em `detalhes`.
+        """
+        if job.mode != ImportJob.MODE_INCREMENTAL:
+            details = self.api_service.fetch_pokemon_details_many(names, on_error=report_error)
+            return [data for data in details if data], {}, 0
+
+        stored = dict(
+            (name, (etag, last_modified))
+            for name, etag, last_modified in
+            Pokemon.objects.filter(name__in=names).values_list('name', 'etag', 'last_modified')
+        )
+        validators = [(name, *stored.get(name, ('', ''))) for name in names]
+        results = self.api_service.fetch_pokemon_details_many_conditional(validators, on_error=report_error)
+
+        details = []
+        fetched_validators = {}
+        not_modified = 0
+        for fetch_result in results:
+            if fetch_result is None:
+                continue
+            if fetch_result.not_modified:
+                not_modified += 1
+                continue
+            details.append(fetch_result.data)
+            fetched_validators[fetch_result.data.name] = (fetch_result.etag, fetch_result.last_modified)
+        return details, fetched_validators, not_modified
+
+    def _process_chunk(self, job: ImportJob, names: List[str], start: int) -> None:
+        errors: List[Dict[str, Any]] = []
+
+        def report_error(name, error):
+            logger.error(f"Error fetching Pokemon {name}: {error}")
+            errors.append({"name": name, "error": str(error)})
+
+        with timed(import_stage_duration, 'fetch'):
+            details, validators, not_modified = self._fetch_chunk(job, names, report_error)
+        fetched = len(details) + not_modified
+
+        formatted_pokemons = []
+        for pokemon_data in details:
+            try:
+                formatted_pokemons.append(self.api_service.format_pokemon_data(pokemon_data))
+            except Exception as e:
+                logger.error(f"Error formatting Pokemon {pokemon_data.name}: {e}")
+                errors.append({"name": pokemon_data.name, "error": str(e)})
+
+        with timed(import_stage_duration, 'persist'), transaction.atomic():
+            result = self.writer.upsert(
+                formatted_pokemons,
+                validators=validators or None,
+                skip_unchanged=job.mode == ImportJob.MODE_INCREMENTAL,
+            )
+            errors.extend(result.errors)
+
+            job.next_index = start + len(names)
+            job.fetched += fetched
+            job.persisted += result.total_processed
+            job.created_count += result.created
+            job.updated_count += result.updated
+            job.unchanged += result.unchanged + not_modified
+            job.failed += len(errors)
+            job.errors = (job.errors + errors)[-MAX_STORED_ERRORS:]
+            job.save(update_fields=[
+                'next_index', 'fetched', 'persisted', 'created_count', 'updated_count', 'unchanged', 'failed',
+                'errors', 'updated_at',
+            ])
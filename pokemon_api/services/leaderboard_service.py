@@ -0,0 +1,244 @@
+import bisect
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+
+from pokemon_api.models import Pokemon
+
+ALL_KEY = 'all'
+DEFAULT_LEADERBOARD_REFRESH_SECONDS = 60
+
+
+def _board_keys(types: Iterable[str]) -> List[str]:
+    return [ALL_KEY] + [f"type:{pokemon_type.lower()}" for pokemon_type in types or []]
+
+
+def _board_key(pokemon_type: Optional[str]) -> str:
+    return f"type:{pokemon_type.lower()}" if pokemon_type else ALL_KEY
+
+
+class InMemoryLeaderboard:
+    """
+    Índice ordenado de scores em memória: uma lista ordenada por (score, id)
+    para o ranking geral e uma por tipo, lida do fim para o começo. É a mesma
+    ordem dos sorted sets do RedisLeaderboard (ZREVRANGE), então empates saem
+    na mesma ordem nos dois backends. Top-N é uma fatia e a posição de um
+    pokémon é uma busca binária.
+
+    Cada processo tem o seu índice; para que escritas de outros processos
+    apareçam, ele é reconstruído do banco a cada `refresh_seconds`. A leitura
+    do banco acontece fora do lock: enquanto uma thread reconstrói, as outras
+    continuam lendo o índice anterior.
+    """
+
+    def __init__(self, refresh_seconds: Optional[float] = None):
+        self.refresh_seconds = (refresh_seconds if refresh_seconds is not None else getattr(settings, 'POKEAPI', {})
+                                .get('LEADERBOARD_REFRESH_SECONDS', DEFAULT_LEADERBOARD_REFRESH_SECONDS))
+        self._boards: Dict[str, List[Tuple[float, str]]] = {}
+        self._members: Dict[str, Tuple[float, List[str]]] = {}
+        self._lock = threading.RLock()
+        self._rebuild_lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+
+    def _ensure_loaded(self) -> None:
+        loaded_at = self._loaded_at
+        if loaded_at is not None and time.monotonic() - loaded_at <= self.refresh_seconds:
+            return
+        if loaded_at is None:
+            # Primeira carga: não há índice anterior para servir, então todos esperam
+            with self._rebuild_lock:
+                if self._loaded_at is None:
+                    self.rebuild()
+            return
+        # Índice vencido: uma thread reconstrói e as outras seguem com o atual
+        if self._rebuild_lock.acquire(blocking=False):
+            try:
+                self.rebuild()
+            finally:
+                self._rebuild_lock.release()
+
+    def rebuild(self) -> None:
+        rows = Pokemon.objects.filter(score__isnull=False).values_list('id', 'score', 'types')
+        boards: Dict[str, List[Tuple[float, str]]] = {}
+        members: Dict[str, Tuple[float, List[str]]] = {}
+        for pokemon_id, score, types in rows.iterator():
+            keys = _board_keys(types)
+            members[str(pokemon_id)] = (score, keys)
+            for key in keys:
+                boards.setdefault(key, []).append((score, str(pokemon_id)))
+        for board in boards.values():
+            board.sort()
+
+        with self._lock:
+            self._boards = boards
+            self._members = members
+            self._loaded_at = time.monotonic()
+
+    def _remove_locked(self, pokemon_id: str) -> None:
+        member = self._members.pop(pokemon_id, None)
+        if member is None:
+            return
+        score, keys = member
+        for key in keys:
+            board = self._boards.get(key, [])
+            index = bisect.bisect_left(board, (score, pokemon_id))
+            if index < len(board) and board[index] == (score, pokemon_id):
+                del board[index]
+
+    def update_many(self, entries: Iterable[Tuple[Any, Optional[float], List[str]]]) -> None:
+        """Atualiza (pokemon_id, score, types); score None remove o pokémon do ranking."""
+        with self._lock:
+            if self._loaded_at is None:
+                # Ainda não carregado: o primeiro uso lerá tudo do banco
+                return
+            for pokemon_id, score, types in entries:
+                pokemon_id = str(pokemon_id)
+                self._remove_locked(pokemon_id)
+                if score is None:
+                    continue
+                keys = _board_keys(types)
+                self._members[pokemon_id] = (score, keys)
+                for key in keys:
+                    bisect.insort(self._boards.setdefault(key, []), (score, pokemon_id))
+
+    def remove(self, pokemon_id: Any) -> None:
+        with self._lock:
+            self._remove_locked(str(pokemon_id))
+
+    def top(self, limit: int, pokemon_type: Optional[str] = None) -> List[Tuple[str, float]]:
+        if limit <= 0:
+            return []
+        self._ensure_loaded()
+        with self._lock:
+            board = self._boards.get(_board_key(pokemon_type), [])
+            return [(pokemon_id, score) for score, pokemon_id in reversed(board[-limit:])]
+
+    def rank(self, pokemon_id: Any, pokemon_type: Optional[str] = None) -> Optional[Tuple[int, float, int]]:
+        """Retorna (posição a partir de 1, score, total) ou None se o pokémon não está no ranking."""
+        pokemon_id = str(pokemon_id)
+        key = _board_key(pokemon_type)
+        self._ensure_loaded()
+        with self._lock:
+            member = self._members.get(pokemon_id)
+            if member is None or key not in member[1]:
+                return None
+            board = self._boards[key]
+            index = bisect.bisect_left(board, (member[0], pokemon_id))
+            return len(board) - index, member[0], len(board)
+
+
+class RedisLeaderboard:
+    """
+    O mesmo índice em sorted sets do Redis (ZREVRANGE / ZREVRANK, O(log n + k)),
+    compartilhado por todos os processos.
+    """
+
+    def __init__(self, url: str, prefix: str = 'pokemon:leaderboard'):
+        import redis
+
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def _ensure_loaded(self) -> None:
+        if not self.client.exists(self._key('loaded')):
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        rows = Pokemon.objects.filter(score__isnull=False).values_list('id', 'score', 'types')
+        staging_prefix = f"{self.prefix}:staging"
+        for key in self.client.scan_iter(f"{staging_prefix}:*"):
+            self.client.delete(key)
+
+        pipeline = self.client.pipeline(transaction=False)
+        staged = set()
+        for pokemon_id, score, types in rows.iterator():
+            member = str(pokemon_id)
+            for key in _board_keys(types):
+                staged.add(key)
+                pipeline.zadd(f"{staging_prefix}:{key}", {member: score})
+            staged.add('members')
+            pipeline.hset(f"{staging_prefix}:members", member, ','.join(types or []))
+        pipeline.execute()
+
+        # Troca os índices de uma vez, para as leituras nunca verem um índice pela metade
+        live_keys = list(self.client.scan_iter(f"{self.prefix}:type:*"))
+        pipeline = self.client.pipeline()
+        pipeline.delete(self._key(ALL_KEY), self._key('members'), *live_keys)
+        for key in staged:
+            pipeline.rename(f"{staging_prefix}:{key}", self._key(key))
+        pipeline.set(self._key('loaded'), '1')
+        pipeline.execute()
+
+    def _remove(self, pipeline, pokemon_id: str, types: List[str]) -> None:
+        for key in _board_keys(types):
+            pipeline.zrem(self._key(key), pokemon_id)
+        pipeline.hdel(self._key('members'), pokemon_id)
+
+    def update_many(self, entries: Iterable[Tuple[Any, Optional[float], List[str]]]) -> None:
+        entries = [(str(pokemon_id), score, types) for pokemon_id, score, types in entries]
+        if not entries:
+            return
+        previous = self.client.hmget(self._key('members'), [pokemon_id for pokemon_id, _, _ in entries])
+
+        pipeline = self.client.pipeline()
+        for (pokemon_id, score, types), previous_types in zip(entries, previous):
+            if previous_types is not None:
+                self._remove(pipeline, pokemon_id, [t for t in previous_types.split(',') if t])
+            if score is None:
+                continue
+            for key in _board_keys(types):
+                pipeline.zadd(self._key(key), {pokemon_id: score})
+            pipeline.hset(self._key('members'), pokemon_id, ','.join(types or []))
+        pipeline.execute()
+
+    def remove(self, pokemon_id: Any) -> None:
+        pokemon_id = str(pokemon_id)
+        previous_types = self.client.hget(self._key('members'), pokemon_id)
+        if previous_types is None:
+            return
+        pipeline = self.client.pipeline()
+        self._remove(pipeline, pokemon_id, [t for t in previous_types.split(',') if t])
+        pipeline.execute()
+
+    def top(self, limit: int, pokemon_type: Optional[str] = None) -> List[Tuple[str, float]]:
+        self._ensure_loaded()
+        if limit <= 0:
+            return []
+        return self.client.zrevrange(self._key(_board_key(pokemon_type)), 0, limit - 1, withscores=True)
+
+    def rank(self, pokemon_id: Any, pokemon_type: Optional[str] = None) -> Optional[Tuple[int, float, int]]:
+        self._ensure_loaded()
+        key = self._key(_board_key(pokemon_type))
+        pipeline = self.client.pipeline(transaction=False)
+        pipeline.zrevrank(key, str(pokemon_id))
+        pipeline.zscore(key, str(pokemon_id))
+        pipeline.zcard(key)
+        index, score, total = pipeline.execute()
+        if index is None:
+            return None
+        return index + 1, score, total
+
+
+_leaderboard = None
+_leaderboard_lock = threading.Lock()
+
+
+def get_leaderboard():
+    """Retorna o índice do processo: Redis se LEADERBOARD_REDIS_URL estiver configurado, senão em memória."""
+    global _leaderboard
+    if _leaderboard is None:
+        with _leaderboard_lock:
+            if _leaderboard is None:
+                redis_url = getattr(settings, 'POKEAPI', {}).get('LEADERBOARD_REDIS_URL')
+                _leaderboard = RedisLeaderboard(redis_url) if redis_url else InMemoryLeaderboard()
+    return _leaderboard
+
+
+def percentile(rank: int, total: int) -> float:
+    """Porcentagem de pokémons do ranking com posição pior que `rank`."""
+    return round((total - rank) / total * 100, 2) if total else 0.0
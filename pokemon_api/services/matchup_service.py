@@ -0,0 +1,206 @@
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, Max
+
+from pokemon_api.conditional import pokemon_table_version
+from pokemon_api.models import Pokemon, Type, TypeEffectiveness
+from pokemon_api.services.pokemon_api_service import TYPE_NAMES
+
+TYPE_INDEX = {name: index for index, name in enumerate(TYPE_NAMES)}
+# Índice extra das matrizes: "sem tipo", para pokémons de um tipo só (ou de tipos fora da tabela)
+NO_TYPE = len(TYPE_NAMES)
+# Imunidade conta como 1/8 no cálculo da vantagem, para a divisão não explodir
+IMMUNITY_FLOOR = 0.125
+
+
+class TypeChartNotLoaded(Exception):
+    """A tabela de efetividade ainda não foi importada (manage.py import_type_chart)."""
+
+
+def import_type_chart(chart: Dict[str, Dict[str, float]]) -> int:
+    """
+    Substitui a tabela TypeEffectiveness por `chart` (tipo atacante ->
+    {tipo defensor: multiplicador}, como em PokemonAPIService.fetch_type_chart).
+    Pares ausentes valem 1.0. Retorna quantos pares foram gravados.
+    """
+    missing = [name for name in TYPE_NAMES if name not in chart]
+    if missing:
+        raise ValueError(f"Type chart is missing attacking types: {', '.join(missing)}")
+
+    with transaction.atomic():
+        Type.objects.bulk_create([Type(name=name) for name in TYPE_NAMES], ignore_conflicts=True)
+        types = dict(Type.objects.filter(name__in=TYPE_NAMES).values_list('name', 'id'))
+        TypeEffectiveness.objects.all().delete()
+        rows = TypeEffectiveness.objects.bulk_create([
+            TypeEffectiveness(
+                attacking_type_id=types[attacker],
+                defending_type_id=types[defender],
+                multiplier=float(chart[attacker].get(defender, 1.0)),
+            )
+            for attacker in TYPE_NAMES
+            for defender in TYPE_NAMES
+        ])
+    get_matchup_engine().invalidate()
+    return len(rows)
+
+
+def type_indices(types: Iterable[str]) -> Tuple[int, int]:
+    """Os dois primeiros tipos conhecidos como índices da matriz, completando com NO_TYPE."""
+    indices = [TYPE_INDEX[name] for name in types or () if name in TYPE_INDEX][:2]
+    return tuple(indices + [NO_TYPE] * (2 - len(indices)))
+
+
+class _Dex:
+    """Tipos de todos os pokémons da tabela, em arrays paralelos."""
+
+    __slots__ = ('version', 'ids', 'names', 'pokemon_ids', 'types', 'type_indices', 'stats_total', 'positions')
+
+    def __init__(self, version, rows: Sequence[Tuple[Any, str, int, list, Optional[int]]]):
+        self.version = version
+        self.ids = [row[0] for row in rows]
+        self.names = [row[1] for row in rows]
+        self.pokemon_ids = [row[2] for row in rows]
+        self.types = [row[3] for row in rows]
+        self.type_indices = np.array([type_indices(row[3]) for row in rows], dtype=np.intp).reshape(-1, 2)
+        self.stats_total = np.array([row[4] or 0 for row in rows], dtype=np.int64)
+        self.positions = {pk: position for position, pk in enumerate(self.ids)}
+
+
+class MatchupEngine:
+    """
+    Confrontos de tipos sobre a tabela de efetividade guardada como uma
+    matriz densa (atacante x defensor), com uma linha e uma coluna extras
+    para "sem tipo": a linha vale 0 (não ataca) e a coluna vale 1 (não altera
+    o dano). Assim o multiplicador de um ataque contra um defensor de dois
+    tipos é o produto de duas entradas da matriz, e `counters` avalia a
+    tabela Pokemon inteira com indexação de arrays, sem laços em Python.
+
+    A matriz e os tipos dos pokémons ficam em memória e são recarregados do
+    banco quando a versão da tabela correspondente muda.
+    """
+
+    def __init__(self):
+        self._matrix: Optional[np.ndarray] = None
+        self._chart_version = None
+        self._dex: Optional[_Dex] = None
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._matrix = None
+            self._chart_version = None
+            self._dex = None
+
+    @staticmethod
+    def _current_chart_version():
+        version = TypeEffectiveness.objects.aggregate(last_id=Max('id'), count=Count('id'))
+        return version['last_id'], version['count']
+
+    def matrix(self) -> np.ndarray:
+        version = self._current_chart_version()
+        matrix = self._matrix
+        if matrix is not None and self._chart_version == version:
+            return matrix
+        if not version[1]:
+            raise TypeChartNotLoaded("Type chart not imported; run 'manage.py import_type_chart'")
+
+        with self._lock:
+            if self._matrix is None or self._chart_version != version:
+                matrix = np.ones((NO_TYPE + 1, NO_TYPE + 1), dtype=np.float64)
+                matrix[NO_TYPE, :] = 0.0
+                rows = TypeEffectiveness.objects.values_list(
+                    'attacking_type__name', 'defending_type__name', 'multiplier')
+                for attacker, defender, multiplier in rows:
+                    if attacker in TYPE_INDEX and defender in TYPE_INDEX:
+                        matrix[TYPE_INDEX[attacker], TYPE_INDEX[defender]] = multiplier
+                self._matrix = matrix
+                self._chart_version = version
+            return self._matrix
+
+    def dex(self) -> _Dex:
+        version = pokemon_table_version()
+        dex = self._dex
+        if dex is not None and dex.version == version:
+            return dex
+
+        with self._lock:
+            if self._dex is None or self._dex.version != version:
+                rows = list(Pokemon.objects.order_by('pokemon_id', 'name')
+                            .values_list('id', 'name', 'pokemon_id', 'types', 'stats_total').iterator())
+                self._dex = _Dex(version, rows)
+            return self._dex
+
+    def multipliers(self, attacking_types: Iterable[str], defending_types: Iterable[str]) -> Dict[str, float]:
+        """Multiplicador de cada tipo atacante conhecido contra a combinação de tipos do defensor."""
+        matrix = self.matrix()
+        first, second = type_indices(defending_types)
+        column = matrix[:, first] * matrix[:, second]
+        return {name: float(column[TYPE_INDEX[name]])
+                for name in dict.fromkeys(attacking_types or ()) if name in TYPE_INDEX}
+
+    def matchup(self, attacker: Pokemon, defender: Pokemon) -> Dict[str, Any]:
+        """
+        Os dois lados do confronto: quanto cada tipo do atacante tira do
+        defensor e vice-versa; `best` é o melhor ataque com o próprio tipo.
+        """
+        attack = self.multipliers(attacker.types, defender.types)
+        defense = self.multipliers(defender.types, attacker.types)
+        return {
+            'attack': {'multipliers': attack, 'best': max(attack.values(), default=1.0)},
+            'defense': {'multipliers': defense, 'best': max(defense.values(), default=1.0)},
+        }
+
+    def counters(self, pokemon_id, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Melhores respostas ao pokémon `pokemon_id` na tabela inteira: para cada
+        pokémon, `offense` é o melhor multiplicador dos seus tipos contra o
+        alvo e `threat` o melhor do alvo contra ele; a ordem é pela vantagem
+        (offense / threat), depois offense e total de status.
+        """
+        matrix = self.matrix()
+        dex = self.dex()
+        position = dex.positions.get(pokemon_id)
+        if position is None:
+            raise Pokemon.DoesNotExist(f"Pokemon {pokemon_id} not found")
+
+        target = dex.type_indices[position]
+        first, second = dex.type_indices[:, 0], dex.type_indices[:, 1]
+
+        # Ataque de cada tipo contra o alvo, depois o melhor dos dois tipos de cada pokémon
+        attack_vs_target = matrix[:, target[0]] * matrix[:, target[1]]
+        offense = np.maximum(attack_vs_target[first], attack_vs_target[second])
+        # Cada tipo do alvo contra todos os pokémons; NO_TYPE do alvo dá uma linha de zeros
+        target_rows = matrix[target]
+        threat = (target_rows[:, first] * target_rows[:, second]).max(axis=0)
+        advantage = offense / np.maximum(threat, IMMUNITY_FLOOR)
+
+        order = np.lexsort((-dex.stats_total, -offense, -advantage))
+        order = order[order != position][:max(limit, 0)]
+        return [
+            {
+                'id': dex.ids[index],
+                'name': dex.names[index],
+                'pokemon_id': dex.pokemon_ids[index],
+                'types': dex.types[index],
+                'offense': float(offense[index]),
+                'threat': float(threat[index]),
+                'advantage': round(float(advantage[index]), 4),
+            }
+            for index in order.tolist()
+        ]
+
+
+_engine: Optional[MatchupEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_matchup_engine() -> MatchupEngine:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = MatchupEngine()
+    return _engine
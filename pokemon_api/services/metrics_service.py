@@ -0,0 +1,282 @@
+import bisect
+import hmac
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+DEFAULT_METRICS_ALLOWED_IPS = ()
+
+LabelValues = Tuple[str, ...]
+
+
+def metrics_enabled() -> bool:
+    return getattr(settings, 'POKEAPI', {}).get('METRICS_ENABLED', True)
+
+
+def metrics_access_allowed(request) -> bool:
+    """
+    /metrics expõe rotas, tempos de banco e o estado dos caches: só é servido
+    aos IPs de METRICS_ALLOWED_IPS ou a quem enviar o METRICS_TOKEN como
+    Bearer token. Sem configuração, ninguém tem acesso. Atrás de um proxy
+    reverso no mesmo host todo cliente chega como 127.0.0.1, então o loopback
+    não deve entrar na lista; nesse caso use o token.
+    """
+    config = getattr(settings, 'POKEAPI', {})
+    if request.META.get('REMOTE_ADDR') in config.get('METRICS_ALLOWED_IPS', DEFAULT_METRICS_ALLOWED_IPS):
+        return True
+    token = config.get('METRICS_TOKEN')
+    scheme, _, credentials = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+    return bool(token) and scheme.lower() == 'bearer' and hmac.compare_digest(credentials.strip(), token)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Contador monotônico, com um valor por combinação de labels."""
+
+    type = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+                for labels, value in values]
+
+
+class Histogram:
+    """
+    Histograma com buckets fixos (cumulativos no formato do Prometheus), mais
+    soma e contagem. Cada observação custa uma busca binária nos buckets.
+    """
+
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [contagem por bucket (+Inf no fim), soma]
+        self._values: Dict[LabelValues, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = [[0] * (len(self.buckets) + 1), 0.0]
+                self._values[labels] = entry
+            entry[0][index] += 1
+            entry[1] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._values.items())
+        lines = []
+        for labels, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                bucket_labels = _format_labels(self.labelnames, labels, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Métricas do processo, expostas no formato texto do Prometheus por
+    GET /metrics. Além dos contadores e histogramas registrados, `collectors`
+    são chamados na hora da coleta para ler estatísticas mantidas em outros
+    lugares (caches), sem custo no caminho das requisições.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, Dict[str, str], float]]]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[Tuple[str, str, str, Dict[str, str], float]]]):
+        """`collector()` devolve (nome, tipo, descrição, labels, valor) para cada amostra."""
+        with self._lock:
+            self._collectors.append(collector)
+        return collector
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+
+        described = set()
+        for collector in collectors:
+            for name, metric_type, documentation, labels, value in collector():
+                if name not in described:
+                    described.add(name)
+                    lines.append(f"# HELP {name} {documentation}")
+                    lines.append(f"# TYPE {name} {metric_type}")
+                lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    'pokemon_http_requests_total', "Requisições HTTP atendidas.", ('method', 'route', 'status'))
+http_request_duration = registry.histogram(
+    'pokemon_http_request_duration_seconds', "Latência das requisições HTTP.", ('method', 'route'))
+db_queries_per_request = registry.histogram(
+    'pokemon_db_queries_per_request', "Consultas ao banco por requisição.", ('route',), buckets=QUERY_COUNT_BUCKETS)
+db_query_duration = registry.histogram(
+    'pokemon_db_query_duration_seconds', "Tempo gasto no banco por requisição.", ('route',))
+upstream_requests = registry.counter(
+    'pokemon_upstream_requests_total', "Chamadas à PokeAPI, por cliente e status ('error' para falhas de rede).",
+    ('client', 'status'))
+upstream_request_duration = registry.histogram(
+    'pokemon_upstream_request_duration_seconds', "Latência das chamadas à PokeAPI.", ('client',))
+import_stage_duration = registry.histogram(
+    'pokemon_import_stage_duration_seconds', "Tempo por bloco da importação, por etapa (fetch, persist).",
+    ('stage',))
+
+
+@contextmanager
+def timed(histogram: Histogram, *labels: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start, *labels)
+
+
+def observe_upstream(client: str, status: str, duration: float) -> None:
+    upstream_requests.inc(client, status)
+    upstream_request_duration.observe(duration, client)
+
+
+@registry.register_collector
+def collect_cache_stats():
+    """Acertos e erros dos caches de detalhes da PokeAPI e de tokens OAuth2."""
+    from pokemon_api.services.cache_service import get_details_cache
+    from pokemon_api.services.token_cache_service import get_token_cache
+
+    stats = get_details_cache().stats()
+    for layer in ('local', 'shared'):
+        for result in ('hits', 'misses'):
+            yield ('pokemon_cache_requests_total', 'counter', "Consultas aos caches, por cache, camada e resultado.",
+                   {'cache': 'details', 'layer': layer, 'result': result}, stats[f'{layer}_{result}'])
+    token_stats = get_token_cache().stats()
+    for result in ('hits', 'misses'):
+        yield ('pokemon_cache_requests_total', 'counter', "Consultas aos caches, por cache, camada e resultado.",
+               {'cache': 'auth_token', 'layer': 'shared', 'result': result}, token_stats[result])
+
+    yield ('pokemon_cache_upstream_fetches_total', 'counter', "Buscas na PokeAPI feitas pelo cache de detalhes.",
+           {}, stats['upstream_fetches'])
+    yield ('pokemon_cache_coalesced_fetches_total', 'counter',
+           "Buscas que esperaram por outra igual em andamento (single-flight).", {}, stats['coalesced_fetches'])
+    yield ('pokemon_cache_negative_hits_total', 'counter', "Acertos no cache negativo (404).",
+           {}, stats['negative_hits'])
+    yield ('pokemon_cache_local_entries', 'gauge', "Entradas no LRU local do cache de detalhes.",
+           {}, stats['local_size'])
+    for layer in ('local', 'shared'):
+        total = stats[f'{layer}_hits'] + stats[f'{layer}_misses']
+        yield ('pokemon_cache_hit_ratio', 'gauge', "Taxa de acerto, por cache e camada.",
+               {'cache': 'details', 'layer': layer}, stats[f'{layer}_hits'] / total if total else 0.0)
+
+
+class RequestStats:
+    """Consultas ao banco feitas durante uma requisição (ver record_query)."""
+
+    __slots__ = ('queries', 'query_time', 'query_log')
+
+    def __init__(self, keep_queries: bool = False):
+        self.queries = 0
+        self.query_time = 0.0
+        # (duração, sql) de cada consulta, só quando o log de requisições lentas está ligado
+        self.query_log: Optional[List[Tuple[float, str]]] = [] if keep_queries else None
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar('pokemon_request_stats', default=None)
+
+
+def start_request_stats(keep_queries: bool = False):
+    stats = RequestStats(keep_queries)
+    return stats, _request_stats.set(stats)
+
+
+def finish_request_stats(token) -> None:
+    _request_stats.reset(token)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Execute wrapper instalado em toda conexão (sinal connection_created):
+    soma as consultas à requisição em andamento. O ContextVar acompanha a
+    requisição também nas threads de sync_to_async das views assíncronas.
+    """
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start
+        stats.queries += 1
+        stats.query_time += duration
+        if stats.query_log is not None:
+            stats.query_log.append((duration, sql))
@@ -0,0 +1,60 @@
+from typing import Callable, Dict, Iterable, List
+
+from django.db import transaction
+
+from pokemon_api.models import Ability, Pokemon, Type
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def _normalized_names(values) -> List[str]:
+    if not isinstance(values, list):
+        return []
+    return list(dict.fromkeys(value.strip().lower() for value in values if isinstance(value, str) and value.strip()))
+
+
+def _ensure_names(model, names: Iterable[str], batch_size: int) -> Dict[str, int]:
+    """Cria as linhas que faltam em Type/Ability e retorna nome -> id."""
+    names = sorted(set(names))
+    ids: Dict[str, int] = {}
+    for start in range(0, len(names), batch_size):
+        chunk = names[start:start + batch_size]
+        model.objects.bulk_create([model(name=name) for name in chunk], ignore_conflicts=True)
+        ids.update(model.objects.filter(name__in=chunk).values_list('name', 'id'))
+    return ids
+
+
+def _sync_relation(field_name: str, model, pokemons: List[Pokemon], values_of: Callable[[Pokemon], list],
+                   batch_size: int) -> None:
+    relation = getattr(Pokemon, field_name)
+    through = relation.through
+    target_column = f"{relation.field.m2m_reverse_field_name()}_id"
+
+    names_by_pokemon = {pokemon.pk: _normalized_names(values_of(pokemon)) for pokemon in pokemons}
+    ids = _ensure_names(model, (name for names in names_by_pokemon.values() for name in names), batch_size)
+
+    pokemon_ids = list(names_by_pokemon)
+    for start in range(0, len(pokemon_ids), batch_size):
+        through.objects.filter(pokemon_id__in=pokemon_ids[start:start + batch_size]).delete()
+    through.objects.bulk_create(
+        [
+            through(pokemon_id=pokemon_id, **{target_column: ids[name]})
+            for pokemon_id, names in names_by_pokemon.items()
+            for name in names
+        ],
+        batch_size=batch_size,
+    )
+
+
+def sync_normalized_relations(pokemons: Iterable[Pokemon], batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+    """
+    Regrava as ligações de `normalized_types`/`normalized_abilities` a partir
+    dos campos JSON `types`/`abilities`, em lote e numa única transação.
+    """
+    pokemons = [pokemon for pokemon in pokemons if pokemon.pk is not None]
+    if not pokemons:
+        return
+
+    with transaction.atomic():
+        _sync_relation('normalized_types', Type, pokemons, lambda pokemon: pokemon.types, batch_size)
+        _sync_relation('normalized_abilities', Ability, pokemons, lambda pokemon: pokemon.abilities, batch_size)
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from pokemon_api.models import STAT_COLUMNS, Pokemon
+from pokemon_api.services.normalization_service import sync_normalized_relations
+from pokemon_api.services.score_service import ScoreService
+from pokemon_api.signals import pokemons_bulk_saved
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+REQUIRED_FIELDS = ['name', 'pokemon_id', 'types', 'abilities', 'base_stats', 'height', 'weight', 'sprite_url']
+
+# Campos atualizados quando o pokémon já existe (a chave natural é `name`)
+UPSERT_FIELDS = [
+    'pokemon_id', 'types', 'abilities', 'base_stats', 'height', 'weight', 'sprite_url', 'content_hash',
+    'score', 'score_version', *STAT_COLUMNS.values(), 'stats_total', 'updated_at'
+]
+VALIDATOR_FIELDS = ['etag', 'last_modified']
+
+
+def content_hash(formatted_data: Dict[str, Any]) -> str:
+    """Hash estável do pokémon formatado, usado para detectar conteúdo inalterado."""
+    payload = json.dumps(formatted_data, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class UpsertResult:
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def total_processed(self) -> int:
+        return self.created + self.updated
+
+
+class PokemonBulkWriter:
+    """
+    Grava pokémons formatados (saída de PokemonAPIService.format_pokemon_data)
+    em lote: carrega os nomes existentes de uma vez e grava em blocos de
+    `batch_size` dentro de uma única transação. Com `skip_unchanged`, linhas
+    cujo hash de conteúdo não mudou não são regravadas.
+    """
+
+    def __init__(self, batch_size: Optional[int] = None, score_service: Optional[ScoreService] = None):
+        config = getattr(settings, 'POKEAPI', {})
+        self.batch_size = batch_size or config.get('IMPORT_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+        self.score_service = score_service or ScoreService()
+
+    def _build(self, formatted_data: Dict[str, Any]) -> Pokemon:
+        # Rejeita aqui, linha a linha, o que violaria NOT NULL no banco e
+        # derrubaria o bloco inteiro
+        missing = [name for name in REQUIRED_FIELDS if formatted_data.get(name) is None]
+        if missing:
+            raise ValueError(f"Missing required fields: {', '.join(missing)}")
+
+        pokemon = Pokemon(
+            content_hash=content_hash(formatted_data),
+            name=formatted_data['name'],
+            pokemon_id=formatted_data['pokemon_id'],
+            types=formatted_data['types'],
+            abilities=formatted_data['abilities'],
+            base_stats=formatted_data['base_stats'],
+            height=formatted_data['height'],
+            weight=formatted_data['weight'],
+            sprite_url=formatted_data['sprite_url'],
+        )
+        pokemon.refresh_stat_columns()
+        return pokemon
+
+    def _existing_rows(self, names: List[str]) -> Dict[str, Tuple[Any, str, str, str, str]]:
+        existing = {}
+        for start in range(0, len(names), self.batch_size):
+            chunk = names[start:start + self.batch_size]
+            rows = Pokemon.objects.filter(name__in=chunk).values_list(
+                'name', 'id', 'content_hash', *VALIDATOR_FIELDS, 'score_version'
+            )
+            existing.update((row[0], row[1:]) for row in rows)
+        return existing
+
+    def upsert(
+        self,
+        formatted_pokemons: Iterable[Dict[str, Any]],
+        validators: Optional[Dict[str, Tuple[str, str]]] = None,
+        skip_unchanged: bool = False,
+    ) -> UpsertResult:
+        """
+        `validators` mapeia nome -> (etag, last_modified) da resposta da PokeAPI;
+        quando omitido, os validadores guardados não são alterados.
+        """
+        result = UpsertResult()
+        pokemons: Dict[str, Pokemon] = {}
+
+        for formatted_data in formatted_pokemons:
+            try:
+                pokemon = self._build(formatted_data)
+            except ValueError as e:
+                logger.error(f"Error saving Pokemon {formatted_data.get('name')}: {e}")
+                result.errors.append({"name": formatted_data.get('name'), "error": str(e)})
+                continue
+            if validators and pokemon.name in validators:
+                pokemon.etag, pokemon.last_modified = validators[pokemon.name]
+            pokemons[pokemon.name] = pokemon
+
+        if not pokemons:
+            return result
+
+        # Os scores são calculados aqui, em lote, porque bulk_create não passa por Pokemon.save()
+        weights_version = self.score_service.weights_version
+        for pokemon, score in zip(pokemons.values(), self.score_service.score_pokemons(pokemons.values())):
+            pokemon.score = score
+            pokemon.score_version = weights_version
+
+        update_fields = UPSERT_FIELDS + VALIDATOR_FIELDS if validators else UPSERT_FIELDS
+
+        with transaction.atomic():
+            existing = self._existing_rows(list(pokemons))
+            to_create = []
+            to_update = []
+            validators_only = []
+
+            for name, pokemon in pokemons.items():
+                if name not in existing:
+                    to_create.append(pokemon)
+                    continue
+
+                pokemon_pk, stored_hash, stored_etag, stored_last_modified, stored_score_version = existing[name]
+                if (skip_unchanged and stored_hash == pokemon.content_hash
+                        and stored_score_version == weights_version):
+                    result.unchanged += 1
+                    if validators and (pokemon.etag, pokemon.last_modified) != (stored_etag, stored_last_modified):
+                        pokemon.id = pokemon_pk
+                        validators_only.append(pokemon)
+                else:
+                    to_update.append(pokemon)
+
+            if connection.features.supports_update_conflicts_with_target:
+                Pokemon.objects.bulk_create(
+                    to_create + to_update,
+                    batch_size=self.batch_size,
+                    update_conflicts=True,
+                    unique_fields=['name'],
+                    update_fields=update_fields,
+                )
+            else:
+                Pokemon.objects.bulk_create(to_create, batch_size=self.batch_size)
+                now = timezone.now()
+                for pokemon in to_update:
+                    pokemon.id = existing[pokemon.name][0]
+                    pokemon.updated_at = now
+                Pokemon.objects.bulk_update(to_update, update_fields, batch_size=self.batch_size)
+
+            # Conteúdo igual com validadores novos: atualiza só os validadores, para que
+            # a próxima sincronização receba 304
+            if validators_only:
+                Pokemon.objects.bulk_update(validators_only, VALIDATOR_FIELDS, batch_size=self.batch_size)
+
+            # No caminho com ON CONFLICT as instâncias atualizadas ficam com o UUID gerado
+            # localmente; aponta-as para a chave real de cada linha
+            for pokemon in to_update:
+                pokemon.id = existing[pokemon.name][0]
+
+            sync_normalized_relations(to_create + to_update, batch_size=self.batch_size)
+
+        pokemons_bulk_saved.send(sender=Pokemon, pokemons=to_create + to_update)
+
+        result.created = len(to_create)
+        result.updated = len(to_update)
+        return result
@@ -1,68 +1,302 @@
-from typing import Dict, List, Optional, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Any, Sequence, Tuple, Union
+from urllib.parse import urlsplit
 
 import requests
+from django.conf import settings
+
+from pokemon_api.services.cache_service import PokemonDetailsCache, get_details_cache
+from pokemon_api.services.http_client import (
+    CircuitOpenError, get_circuit_breaker, get_http_session, get_timeout, is_upstream_failure,
+)
+from pokemon_api.services.metrics_service import observe_upstream, upstream_requests
+
+DEFAULT_BASE_URL = 'https://pokeapi.co/api/v2/'
+DEFAULT_MAX_IN_FLIGHT = 10
+DEFAULT_MAX_PER_HOST = 10
+
+# Os 18 tipos de batalha, na ordem da PokeAPI; /type também lista 'unknown',
+# 'shadow' e 'stellar', que não entram na tabela de efetividade
+TYPE_NAMES = ('normal', 'fighting', 'flying', 'poison', 'ground', 'rock', 'bug', 'ghost', 'steel',
+              'fire', 'water', 'grass', 'electric', 'psychic', 'ice', 'dragon', 'dark', 'fairy')
+# Multiplicador de dano de cada lista de damage_relations (do ponto de vista de quem ataca)
+DAMAGE_RELATIONS = {'double_damage_to': 2.0, 'half_damage_to': 0.5, 'no_damage_to': 0.0}
+
+
+@dataclass
+class PokemonRecord:
+    """
+    Projeção compacta da resposta de /pokemon/<nome>: só os campos usados por
+    format_pokemon_data. É criada assim que cada resposta chega, para que o
+    JSON completo (movimentos, índices de jogos, todas as variantes de
+    sprite...) seja descartado em seguida e não fique em listas ou no cache.
+    """
+    __slots__ = ('name', 'pokemon_id', 'types', 'abilities', 'stats', 'height', 'weight', 'sprite_url')
+
+    name: Optional[str]
+    pokemon_id: Optional[int]
+    types: Tuple[str, ...]
+    abilities: Tuple[str, ...]
+    # Pares (nome do status, valor base) na ordem da PokeAPI
+    stats: Tuple[Tuple[str, Any], ...]
+    height: Optional[int]
+    weight: Optional[int]
+    sprite_url: Optional[str]
+
+    @classmethod
+    def from_payload(cls, data: Dict[str, Any]) -> 'PokemonRecord':
+        try:
+            return cls._from_payload(data)
+        except (AttributeError, KeyError, TypeError) as e:
+            raise ValueError(f"Malformed PokeAPI payload: {e!r}") from e
+
+    @classmethod
+    def _from_payload(cls, data: Dict[str, Any]) -> 'PokemonRecord':
+        sprites = data.get('sprites', {})
+        sprite_url = (
+            sprites
+            .get('other', {})
+            .get('official-artwork', {})
+            .get('front_default', sprites.get('front_default'))
+        )
+        return cls(
+            name=data.get('name'),
+            pokemon_id=data.get('id'),
+            types=tuple(type_info['type']['name'] for type_info in data.get('types', [])),
+            abilities=tuple(ability_info['ability']['name'] for ability_info in data.get('abilities', [])),
+            stats=tuple((stat_info['stat']['name'], stat_info['base_stat']) for stat_info in data.get('stats', [])),
+            height=data.get('height'),
+            weight=data.get('weight'),
+            sprite_url=sprite_url,
+        )
+
+
+def format_pokemon_data(data: Union[PokemonRecord, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Projeta um PokemonRecord (ou a resposta bruta de /pokemon/<nome> da
+    PokeAPI) nos campos usados pela API.
+    """
+    record = data if isinstance(data, PokemonRecord) else PokemonRecord.from_payload(data)
+    stats = dict(record.stats)
+
+    return {
+        "name": record.name,
+        "pokemon_id": record.pokemon_id,
+        "types": list(record.types),
+        "abilities": list(record.abilities),
+        "base_stats": {
+            "hp": stats.get("hp"),
+            "attack": stats.get("attack"),
+            "defense": stats.get("defense"),
+            "special-attack": stats.get("special-attack"),
+            "special-defense": stats.get("special-defense"),
+            "speed": stats.get("speed"),
+        },
+        "height": record.height,
+        "weight": record.weight,
+        "sprite_url": record.sprite_url,
+    }
+
+
+@dataclass
+class ConditionalFetchResult:
+    name: str
+    # None quando a PokeAPI responde 304 (conteúdo não modificado)
+    data: Optional[PokemonRecord]
+    etag: str = ''
+    last_modified: str = ''
+
+    @property
+    def not_modified(self) -> bool:
+        return self.data is None
+
 
 class PokemonAPIService:
-    
-    def __init__(self): 
-        self.session = requests.Session()
-        self.base_url = 'https://pokeapi.co/api/v2/'
-        
-    def get_pokemon_details(self, pokemon_name: str) -> Optional[Dict[str, Any]]:
+    # Semáforos por host compartilhados entre instâncias, para que importações
+    # simultâneas respeitem juntas o limite de conexões por host.
+    _host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+    _host_semaphores_lock = threading.Lock()
+
+    def __init__(self, base_url: Optional[str] = None, max_in_flight: Optional[int] = None,
+                 max_per_host: Optional[int] = None, cache: Optional[PokemonDetailsCache] = None):
+        config = getattr(settings, 'POKEAPI', {})
+        self.base_url = (base_url or config.get('BASE_URL', DEFAULT_BASE_URL)).rstrip('/')
+        self.max_in_flight = max(1, max_in_flight or config.get('MAX_IN_FLIGHT', DEFAULT_MAX_IN_FLIGHT))
+        self.max_per_host = max(1, max_per_host or config.get('MAX_PER_HOST', DEFAULT_MAX_PER_HOST))
+
+        self.cache = cache or get_details_cache()
+
+        # Sessão (pool de conexões, retries) compartilhada pelo processo
+        self.session = get_http_session()
+        self.timeout = get_timeout()
+
+    def _host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._host_semaphores_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_per_host)
+                self._host_semaphores[host] = semaphore
+            return semaphore
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        breaker = get_circuit_breaker(urlsplit(url).netloc)
+        try:
+            breaker.before_request()
+        except CircuitOpenError:
+            upstream_requests.inc('sync', 'circuit_open')
+            raise
+        kwargs.setdefault('timeout', self.timeout)
+        start = time.perf_counter()
+        try:
+            with self._host_semaphore(url):
+                response = self.session.get(url, **kwargs)
+        except Exception:
+            observe_upstream('sync', 'error', time.perf_counter() - start)
+            breaker.record_failure()
+            raise
+
+        observe_upstream('sync', str(response.status_code), time.perf_counter() - start)
+        if is_upstream_failure(response.status_code):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        response.raise_for_status()
+        return response
+
+    def _fetch_pokemon_details(self, pokemon_name: str) -> PokemonRecord:
+        return PokemonRecord.from_payload(self._get(f"{self.base_url}/pokemon/{pokemon_name.lower()}").json())
+
+    def _fetch_pokemon_details_or_none(self, pokemon_name: str) -> Optional[PokemonRecord]:
         try:
-            response = self.session.get(f"{self.base_url}/pokemon/{pokemon_name.lower()}")
-            response.raise_for_status()
-            data = response.json()
+            return self._fetch_pokemon_details(pokemon_name)
+        except requests.HTTPError as e:
+            # Apenas 404 é definitivo e pode entrar no cache negativo
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
 
-            return data
+    def get_pokemon_details(self, pokemon_name: str) -> Optional[PokemonRecord]:
+        key = pokemon_name.lower()
+        try:
+            return self.cache.get_or_fetch(key, lambda: self._fetch_pokemon_details_or_none(key))
         except requests.RequestException:
             return None
-        
-    def format_pokemon_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        types = [type_info['type']['name'] for type_info in data.get('types', [])]
 
-        abilities = [ability_info['ability']['name'] for ability_info in data.get('abilities', [])]
+    def format_pokemon_data(self, data: Union[PokemonRecord, Dict[str, Any]]) -> Dict[str, Any]:
+        return format_pokemon_data(data)
 
-        stats = {stat_info['stat']['name']: stat_info['base_stat'] for stat_info in data.get('stats', [])}
+    def fetch_pokemon_details_conditional(self, pokemon_name: str, etag: str = '',
+                                          last_modified: str = '') -> ConditionalFetchResult:
+        """
+        Busca os detalhes com uma requisição condicional (If-None-Match /
+        If-Modified-Since), sem passar pelo cache.
+        """
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
 
-        sprite_url = (
-            data.get('sprites', {})
-            .get('other', {})
-            .get('official-artwork', {})
-            .get('front_default', data.get('sprites', {}).get('front_default'))
+        response = self._get(f"{self.base_url}/pokemon/{pokemon_name.lower()}", headers=headers)
+        if response.status_code == 304:
+            return ConditionalFetchResult(pokemon_name, None, etag, last_modified)
+
+        return ConditionalFetchResult(
+            pokemon_name,
+            PokemonRecord.from_payload(response.json()),
+            response.headers.get('ETag', ''),
+            response.headers.get('Last-Modified', ''),
         )
 
-        return {
-            "name": data.get("name"),
-            "pokemon_id": data.get("id"),
-            "types": types,
-            "abilities": abilities,
-            "base_stats": {
-                "hp": stats.get("hp"),
-                "attack": stats.get("attack"),
-                "defense": stats.get("defense"),
-                "special-attack": stats.get("special-attack"),
-                "special-defense": stats.get("special-defense"),
-                "speed": stats.get("speed"),
-            },
-            "height": data.get("height"),
-            "weight": data.get("weight"),
-            "sprite_url": sprite_url,
-        }
-        
-    def fetch_all_pokemons(self, limit: int = 25) -> List[Dict[str, Any]]:
+    def _fetch_many(
+        self,
+        fetch: Callable[..., Any],
+        calls: Sequence[Tuple[str, tuple]],
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> List[Optional[Any]]:
+        if not calls:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(self.max_in_flight, len(calls))) as executor:
+            futures = [executor.submit(fetch, *args) for _, args in calls]
+
+            results: List[Optional[Any]] = []
+            for (name, _), future in zip(calls, futures):
+                try:
+                    results.append(future.result())
+                except (requests.RequestException, ValueError) as e:
+                    if on_error:
+                        on_error(name, e)
+                    results.append(None)
+
+        return results
+
+    def fetch_pokemon_details_many(
+        self,
+        names: List[str],
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> List[Optional[PokemonRecord]]:
+        """
+        Busca os detalhes de vários pokémons com concorrência limitada.
+        O resultado preserva a ordem de `names`; falhas viram None e são
+        reportadas individualmente via `on_error(name, exception)`.
+        """
+        return self._fetch_many(self._fetch_pokemon_details, [(name, (name,)) for name in names], on_error)
+
+    def fetch_pokemon_details_many_conditional(
+        self,
+        validators: List[Tuple[str, str, str]],
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> List[Optional[ConditionalFetchResult]]:
+        """
+        Versão condicional de fetch_pokemon_details_many; recebe tuplas
+        (name, etag, last_modified) com os validadores guardados localmente.
+        """
+        calls = [(validator[0], validator) for validator in validators]
+        return self._fetch_many(self.fetch_pokemon_details_conditional, calls, on_error)
+
+    def _fetch_type_relations(self, type_name: str) -> Dict[str, float]:
+        data = self._get(f"{self.base_url}/type/{type_name}").json()
+        try:
+            relations = data['damage_relations']
+            return {
+                defender['name']: multiplier
+                for key, multiplier in DAMAGE_RELATIONS.items()
+                for defender in relations.get(key, [])
+                if defender['name'] in TYPE_NAMES
+            }
+        except (AttributeError, KeyError, TypeError) as e:
+            raise ValueError(f"Malformed PokeAPI type payload: {e!r}") from e
+
+    def fetch_type_chart(self) -> Dict[str, Dict[str, float]]:
+        """
+        Tabela de efetividade da PokeAPI: tipo atacante -> {tipo defensor:
+        multiplicador}, só com os pares diferentes de 1. Uma tabela parcial não
+        serve para nada, então a primeira falha é relançada.
+        """
+        errors: List[Exception] = []
+        relations = self._fetch_many(self._fetch_type_relations, [(name, (name,)) for name in TYPE_NAMES],
+                                     on_error=lambda name, error: errors.append(error))
+        if errors:
+            raise errors[0]
+        return dict(zip(TYPE_NAMES, relations))
+
+    def list_pokemon_names(self, limit: int = 25, offset: int = 0) -> List[str]:
+        response = self._get(f"{self.base_url}/pokemon", params={'limit': limit, 'offset': offset})
+        return [pokemon['name'] for pokemon in response.json()['results']]
+
+    def fetch_all_pokemons(
+        self,
+        limit: int = 25,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> List[PokemonRecord]:
         try:
-            response = requests.get(f"{self.base_url}/pokemon?limit={limit}")
-            response.raise_for_status()
-            all_pokemon = response.json()['results']
-    
-            detailed_pokemon = []
-            for pokemon in all_pokemon:
-                pokemon_data = self.get_pokemon_details(pokemon['name'])
-                if pokemon_data:
-                    detailed_pokemon.append(pokemon_data)
-    
-            return detailed_pokemon
+            names = self.list_pokemon_names(limit=limit)
         except requests.RequestException:
             return []
-    
\ No newline at end of file
+
+        return [data for data in self.fetch_pokemon_details_many(names, on_error=on_error) if data]
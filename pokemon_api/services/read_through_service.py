@@ -0,0 +1,148 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Dict, Optional, Set
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from pokemon_api.models import Pokemon
+from pokemon_api.services.async_pokemon_api_service import AsyncPokemonAPIService
+from pokemon_api.services.persistence_service import PokemonBulkWriter
+from pokemon_api.services.pokemon_api_service import PokemonAPIService
+from pokemon_api.services.snapshot_service import get_async_pokemon_api_service, get_pokemon_api_service
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOCAL_STALE_AFTER = 7 * 24 * 60 * 60
+
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='pokemon-refresh')
+_refreshing: Set[str] = set()
+_refreshing_lock = threading.Lock()
+
+
+def pokemon_to_formatted(pokemon: Pokemon) -> Dict[str, Any]:
+    """Converte um registro local no mesmo formato de PokemonAPIService.format_pokemon_data."""
+    return {
+        "name": pokemon.name,
+        "pokemon_id": pokemon.pokemon_id,
+        "types": pokemon.types,
+        "abilities": pokemon.abilities,
+        "base_stats": pokemon.base_stats,
+        "height": pokemon.height,
+        "weight": pokemon.weight,
+        "sprite_url": pokemon.sprite_url,
+    }
+
+
+class PokemonReadThroughService:
+    """
+    Lê pokémons primeiro da tabela local e só recorre à PokeAPI quando o
+    registro não existe ou está mais velho que `stale_after` segundos. O que
+    vem da PokeAPI é gravado de volta, para que a próxima leitura seja local.
+    Com `background_refresh`, registros vencidos são servidos imediatamente e
+    atualizados em segundo plano.
+    """
+
+    def __init__(self, api_service: Optional[PokemonAPIService] = None, stale_after: Optional[int] = None,
+                 background_refresh: Optional[bool] = None):
+        config = getattr(settings, 'POKEAPI', {})
+        self.api_service = api_service or get_pokemon_api_service()
+        self.stale_after = (stale_after if stale_after is not None
+                            else config.get('LOCAL_STALE_AFTER', DEFAULT_LOCAL_STALE_AFTER))
+        self.background_refresh = (background_refresh if background_refresh is not None
+                                   else config.get('BACKGROUND_REFRESH', True))
+
+    def _find_local(self, pokemon_name: str) -> Optional[Pokemon]:
+        if pokemon_name.isdigit():
+            return Pokemon.objects.filter(pokemon_id=int(pokemon_name)).first()
+        return Pokemon.objects.filter(name=pokemon_name).first()
+
+    def _is_stale(self, pokemon: Pokemon) -> bool:
+        return pokemon.updated_at < timezone.now() - timedelta(seconds=self.stale_after)
+
+    def fetch_and_store(self, pokemon_name: str) -> Optional[Dict[str, Any]]:
+        pokemon_details = self.api_service.get_pokemon_details(pokemon_name=pokemon_name)
+        if not pokemon_details:
+            return None
+
+        formatted_data = self.api_service.format_pokemon_data(pokemon_details)
+        try:
+            PokemonBulkWriter().upsert([formatted_data])
+        except Exception as e:
+            # A gravação é uma otimização; a resposta continua válida sem ela
+            logger.error(f"Error storing Pokemon {formatted_data.get('name')}: {e}")
+
+        return formatted_data
+
+    def _refresh(self, pokemon_name: str) -> None:
+        try:
+            self.fetch_and_store(pokemon_name)
+        except Exception as e:
+            logger.error(f"Error refreshing Pokemon {pokemon_name}: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(pokemon_name)
+            connection.close()
+
+    def schedule_refresh(self, pokemon_name: str) -> None:
+        with _refreshing_lock:
+            if pokemon_name in _refreshing:
+                return
+            _refreshing.add(pokemon_name)
+        _refresh_executor.submit(self._refresh, pokemon_name)
+
+    def get(self, pokemon_name: str) -> Optional[Dict[str, Any]]:
+        pokemon_name = pokemon_name.strip().lower()
+        pokemon = self._find_local(pokemon_name)
+
+        if pokemon is None:
+            return self.fetch_and_store(pokemon_name)
+
+        local_data = pokemon_to_formatted(pokemon)
+        if not self._is_stale(pokemon):
+            return local_data
+
+        if self.background_refresh:
+            self.schedule_refresh(pokemon.name)
+            return local_data
+
+        # Se a PokeAPI falhar, o registro local (mesmo vencido) ainda é servido
+        return self.fetch_and_store(pokemon.name) or local_data
+
+    async def afetch_and_store(self, pokemon_name: str,
+                               async_api_service: AsyncPokemonAPIService) -> Optional[Dict[str, Any]]:
+        pokemon_details = await async_api_service.get_pokemon_details(pokemon_name)
+        if not pokemon_details:
+            return None
+
+        formatted_data = async_api_service.format_pokemon_data(pokemon_details)
+        try:
+            await sync_to_async(PokemonBulkWriter().upsert)([formatted_data])
+        except Exception as e:
+            logger.error(f"Error storing Pokemon {formatted_data.get('name')}: {e}")
+
+        return formatted_data
+
+    async def aget(self, pokemon_name: str,
+                   async_api_service: Optional[AsyncPokemonAPIService] = None) -> Optional[Dict[str, Any]]:
+        """Versão assíncrona de get: a PokeAPI é consultada sem bloquear o event loop."""
+        async_api_service = async_api_service or get_async_pokemon_api_service()
+        pokemon_name = pokemon_name.strip().lower()
+        pokemon = await sync_to_async(self._find_local)(pokemon_name)
+
+        if pokemon is None:
+            return await self.afetch_and_store(pokemon_name, async_api_service)
+
+        local_data = pokemon_to_formatted(pokemon)
+        if not self._is_stale(pokemon):
+            return local_data
+
+        if self.background_refresh:
+            self.schedule_refresh(pokemon.name)
+            return local_data
+
+        return await self.afetch_and_store(pokemon.name, async_api_service) or local_data
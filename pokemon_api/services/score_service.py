@@ -1,4 +1,8 @@
-from typing import Dict, List, Any
+import hashlib
+import json
+from typing import Dict, List, Any, Iterable, Optional
+
+import numpy as np
 
 class ScoreService:
     def __init__(self):
@@ -9,6 +13,41 @@ class ScoreService:
             'physical': 0.1
         }
 
+    @property
+    def weights_version(self) -> str:
+        """Identifica o conjunto de pesos; scores gravados com outra versão estão vencidos."""
+        payload = json.dumps(self.weights, sort_keys=True)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+    @staticmethod
+    def score_data(pokemon: Any) -> Dict[str, Any]:
+        """Monta a entrada de calculate_score a partir de um Pokemon (ou objeto com os mesmos atributos)."""
+        return {
+            'types': pokemon.types,
+            'base_stats': list(pokemon.base_stats.values()),
+            'abilities': pokemon.abilities,
+            'height': pokemon.height,
+            'weight': pokemon.weight,
+        }
+
+    def score_pokemons(self, pokemons: Iterable[Any]) -> List[Optional[float]]:
+        """
+        Scores de vários Pokemon de uma vez, pelo caminho vetorizado. Pokémons com
+        status inválidos recebem None em vez de interromper o lote.
+        """
+        pokemon_data = [self.score_data(pokemon) for pokemon in pokemons]
+        valid = [
+            index for index, data in enumerate(pokemon_data)
+            if all(isinstance(stat, int) for stat in data['base_stats'])
+        ]
+
+        scores: List[Optional[float]] = [None] * len(pokemon_data)
+        if valid:
+            columns = self.build_score_columns([pokemon_data[index] for index in valid])
+            for index, score in zip(valid, self.calculate_scores(columns)):
+                scores[index] = score
+        return scores
+
     def calculate_score(self, pokemon_data: Dict[str, Any]) -> float:
         score = 0
 
@@ -26,6 +65,48 @@ class ScoreService:
 
         return round(score, 2)
 
+    def build_score_columns(self, pokemons: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """
+        Converte uma lista de pokémons (no mesmo formato de calculate_score) na
+        representação colunar usada por calculate_scores. A matriz de status é
+        completada com zeros quando os pokémons têm quantidades diferentes.
+        """
+        for pokemon in pokemons:
+            base_stats = pokemon['base_stats']
+            if not isinstance(base_stats, list) or not all(isinstance(stat, int) for stat in base_stats):
+                raise ValueError("base_stats must be a list of integers")
+
+        width = max((len(pokemon['base_stats']) for pokemon in pokemons), default=0)
+        stats = np.zeros((len(pokemons), width), dtype=np.int64)
+        for row, pokemon in enumerate(pokemons):
+            stats[row, :len(pokemon['base_stats'])] = pokemon['base_stats']
+
+        return {
+            'types_count': np.array([len(pokemon['types']) for pokemon in pokemons], dtype=np.int64),
+            'stats': stats,
+            'abilities_count': np.array([len(pokemon['abilities']) for pokemon in pokemons], dtype=np.int64),
+            'height': np.array([pokemon['height'] for pokemon in pokemons], dtype=np.float64),
+            'weight': np.array([pokemon['weight'] for pokemon in pokemons], dtype=np.float64),
+        }
+
+    def calculate_scores(self, columns: Dict[str, np.ndarray]) -> List[float]:
+        """
+        Versão vetorizada de calculate_score para vários pokémons. Os componentes
+        são somados na mesma ordem do caminho escalar e o arredondamento final usa
+        round() do Python, então os resultados são idênticos aos de calculate_score.
+        """
+        type_scores = np.minimum(columns['types_count'] * 50, 100)
+        stats_scores = columns['stats'].sum(axis=1)
+        abilities_scores = np.minimum(columns['abilities_count'] * 33.33, 100)
+        physical_scores = np.minimum(columns['height'] * 5, 50) + np.minimum(columns['weight'] / 20, 50)
+
+        scores = type_scores * self.weights['types']
+        scores = scores + stats_scores * self.weights['base_stats']
+        scores = scores + abilities_scores * self.weights['abilities']
+        scores = scores + physical_scores * self.weights['physical']
+
+        return [round(score, 2) for score in scores.tolist()]
+
     def _calculate_type_score(self, types: List[str]) -> float:
         base_score = len(types) * 50
 
@@ -0,0 +1,208 @@
+import heapq
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+
+from pokemon_api.models import Pokemon
+
+DEFAULT_SEARCH_REFRESH_SECONDS = 300
+# Quantos candidatos do índice de trigramas passam para o cálculo da distância de edição
+FUZZY_CANDIDATES = 50
+
+
+def normalize_query(text: str) -> str:
+    return (text or '').strip().lower()
+
+
+def _trigrams(name: str) -> Set[str]:
+    padded = f"  {name} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """Distância de Levenshtein; para cedo (retornando max_distance + 1) quando passa do limite."""
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+class _TrieNode:
+    __slots__ = ('children', 'terminal')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.terminal = False
+
+
+class PokemonNameIndex:
+    """
+    Índice em memória dos nomes da tabela Pokemon:
+    - uma trie para autocompletar (`complete`), que percorre só o ramo do
+      prefixo digitado;
+    - um índice invertido de trigramas mais distância de edição para sugerir
+      nomes parecidos (`suggest`, o "você quis dizer").
+
+    É atualizado a cada gravação pelos sinais de Pokemon e, como cada processo
+    tem o seu, reconstruído do banco a cada `refresh_seconds`.
+    """
+
+    def __init__(self, refresh_seconds: Optional[float] = None):
+        self.refresh_seconds = (refresh_seconds if refresh_seconds is not None else getattr(settings, 'POKEAPI', {})
+                                .get('SEARCH_REFRESH_SECONDS', DEFAULT_SEARCH_REFRESH_SECONDS))
+        self._root = _TrieNode()
+        self._trigrams: Dict[str, Set[str]] = {}
+        # nome -> (pk, pokemon_id) e pk -> nome
+        self._names: Dict[str, Tuple[str, int]] = {}
+        self._by_pk: Dict[str, str] = {}
+        self._lock = threading.RLock()
+        self._loaded_at: Optional[float] = None
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.refresh_seconds:
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        rows = list(Pokemon.objects.values_list('id', 'name', 'pokemon_id').iterator())
+        with self._lock:
+            self._root = _TrieNode()
+            self._trigrams = {}
+            self._names = {}
+            self._by_pk = {}
+            for pk, name, pokemon_id in rows:
+                self._add_locked(str(pk), name, pokemon_id)
+            self._loaded_at = time.monotonic()
+
+    def _add_locked(self, pk: str, name: str, pokemon_id: int) -> None:
+        name = normalize_query(name)
+        if not name:
+            return
+        self._by_pk[pk] = name
+        is_new = name not in self._names
+        self._names[name] = (pk, pokemon_id)
+        if not is_new:
+            return
+
+        node = self._root
+        for char in name:
+            node = node.children.setdefault(char, _TrieNode())
+        node.terminal = True
+        for trigram in _trigrams(name):
+            self._trigrams.setdefault(trigram, set()).add(name)
+
+    def _remove_locked(self, pk: str) -> None:
+        name = self._by_pk.pop(pk, None)
+        if name is None or self._names.get(name, (None,))[0] != pk:
+            return
+        del self._names[name]
+
+        path = [self._root]
+        for char in name:
+            path.append(path[-1].children[char])
+        path[-1].terminal = False
+        # Poda os nós que ficaram sem nomes abaixo deles
+        for depth in range(len(name), 0, -1):
+            node = path[depth]
+            if node.terminal or node.children:
+                break
+            del path[depth - 1].children[name[depth - 1]]
+
+        for trigram in _trigrams(name):
+            names = self._trigrams.get(trigram)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._trigrams[trigram]
+
+    def update_many(self, entries: Iterable[Tuple[Any, str, int]]) -> None:
+        """Atualiza (pk, name, pokemon_id); um pokémon renomeado sai do índice com o nome antigo."""
+        with self._lock:
+            if self._loaded_at is None:
+                # Ainda não carregado: o primeiro uso lerá tudo do banco
+                return
+            for pk, name, pokemon_id in entries:
+                pk = str(pk)
+                if self._by_pk.get(pk) != normalize_query(name):
+                    self._remove_locked(pk)
+                self._add_locked(pk, name, pokemon_id)
+
+    def remove(self, pk: Any) -> None:
+        with self._lock:
+            self._remove_locked(str(pk))
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Nomes que começam com `prefix`, em ordem alfabética: (name, pokemon_id)."""
+        prefix = normalize_query(prefix)
+        if not prefix or limit <= 0:
+            return []
+        with self._lock:
+            self._ensure_loaded()
+            node = self._root
+            for char in prefix:
+                node = node.children.get(char)
+                if node is None:
+                    return []
+
+            results: List[Tuple[str, int]] = []
+            stack = [(node, prefix)]
+            while stack and len(results) < limit:
+                node, name = stack.pop()
+                if node.terminal:
+                    results.append((name, self._names[name][1]))
+                for char in sorted(node.children, reverse=True):
+                    stack.append((node.children[char], name + char))
+            return results
+
+    def suggest(self, text: str, limit: int = 5, max_distance: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Nomes parecidos com `text`: os que mais compartilham trigramas são
+        ordenados pela distância de edição (até `max_distance`, por padrão
+        proporcional ao tamanho do texto).
+        """
+        text = normalize_query(text)
+        if not text or limit <= 0:
+            return []
+        if max_distance is None:
+            max_distance = max(1, len(text) // 3)
+
+        with self._lock:
+            self._ensure_loaded()
+            shared = Counter()
+            for trigram in _trigrams(text):
+                shared.update(self._trigrams.get(trigram, ()))
+            candidates = heapq.nlargest(FUZZY_CANDIDATES, shared.items(), key=lambda item: (item[1], item[0]))
+            pokemon_ids = {name: self._names[name][1] for name, _ in candidates}
+
+        scored = []
+        for name, common in candidates:
+            distance = edit_distance(text, name, max_distance)
+            if distance <= max_distance:
+                scored.append((distance, -common, name))
+        scored.sort()
+        return [(name, pokemon_ids[name]) for _, _, name in scored[:limit]]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_search_index() -> PokemonNameIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = PokemonNameIndex()
+    return _index
@@ -0,0 +1,158 @@
+import asyncio
+import threading
+import time
+import uuid
+import weakref
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from django.conf import settings
+
+DEFAULT_LOCK_TTL = 15
+
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """
+    Agrupa chamadas simultâneas com a mesma chave: a primeira executa a
+    função e as demais esperam pelo mesmo resultado (ou exceção), em vez de
+    repetir o trabalho. Funciona entre threads (`do`) e entre corrotinas do
+    mesmo event loop (`ado`).
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, Future] = {}
+        self._async_calls: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]' = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            calls = self._async_calls.setdefault(loop, {})
+            future = calls.get(key)
+            leader = future is None
+            if leader:
+                future = loop.create_future()
+                calls[key] = future
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            # shield: o cancelamento de quem espera não cancela a chamada do líder
+            return await asyncio.shield(future)
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Evita o aviso "exception was never retrieved" quando ninguém esperava
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del calls[key]
+
+
+class LocalLock:
+    """
+    Substituto de RedisLock para um único processo (sem Redis): mesma
+    interface, com as chaves e seus prazos guardados em memória.
+    """
+
+    def __init__(self):
+        self._held: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, ttl: float) -> Optional[str]:
+        now = time.monotonic()
+        with self._lock:
+            held = self._held.get(key)
+            if held is not None and held[1] > now:
+                return None
+            token = uuid.uuid4().hex
+            self._held[key] = (token, now + ttl)
+            return token
+
+    def release(self, key: str, token: str) -> None:
+        with self._lock:
+            held = self._held.get(key)
+            if held is not None and held[0] == token:
+                del self._held[key]
+
+
+class RedisLock:
+    """
+    Lock entre processos: SET NX com prazo (o lock expira sozinho se o dono
+    cair) e liberação atômica só pelo dono, via script Lua.
+    """
+
+    def __init__(self, url: str, prefix: str = 'pokeapi:lock'):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._release = self.client.register_script(RELEASE_SCRIPT)
+
+    def acquire(self, key: str, ttl: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+        if self.client.set(f"{self.prefix}:{key}", token, nx=True, px=int(ttl * 1000)):
+            return token
+        return None
+
+    def release(self, key: str, token: str) -> None:
+        self._release(keys=[f"{self.prefix}:{key}"], args=[token])
+
+
+_lock_backend = None
+_lock_backend_lock = threading.Lock()
+
+
+def get_lock_backend():
+    """RedisLock se POKEAPI['SINGLEFLIGHT_REDIS_URL'] estiver configurado, senão LocalLock."""
+    global _lock_backend
+    if _lock_backend is None:
+        with _lock_backend_lock:
+            if _lock_backend is None:
+                redis_url = getattr(settings, 'POKEAPI', {}).get('SINGLEFLIGHT_REDIS_URL')
+                _lock_backend = RedisLock(redis_url) if redis_url else LocalLock()
+    return _lock_backend
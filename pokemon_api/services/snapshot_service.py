@@ -0,0 +1,327 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+
+from pokemon_api.services.async_pokemon_api_service import AsyncPokemonAPIService
+from pokemon_api.services.pokemon_api_service import ConditionalFetchResult, PokemonAPIService, PokemonRecord
+
+BACKEND_HTTP = 'http'
+BACKEND_SNAPSHOT = 'snapshot'
+DEFAULT_SNAPSHOT_PATH = 'pokeapi_snapshot.sqlite3'
+# Limite de parâmetros por consulta IN, abaixo do máximo de variáveis do SQLite
+QUERY_CHUNK_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pokemon (
+    position INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    pokemon_id INTEGER,
+    etag TEXT NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pokemon_pokemon_id ON pokemon (pokemon_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class SnapshotMissError(requests.RequestException):
+    """O pokémon não está no snapshot (equivale a um 404 da PokeAPI)."""
+
+
+def _encode(record: PokemonRecord) -> str:
+    return json.dumps([
+        record.name, record.pokemon_id, record.types, record.abilities, record.stats,
+        record.height, record.weight, record.sprite_url,
+    ], separators=(',', ':'))
+
+
+def _decode(payload: str) -> PokemonRecord:
+    name, pokemon_id, types, abilities, stats, height, weight, sprite_url = json.loads(payload)
+    return PokemonRecord(
+        name=name,
+        pokemon_id=pokemon_id,
+        types=tuple(types),
+        abilities=tuple(abilities),
+        stats=tuple(tuple(stat) for stat in stats),
+        height=height,
+        weight=weight,
+        sprite_url=sprite_url,
+    )
+
+
+class PokemonSnapshotStore:
+    """
+    Cópia local da PokeAPI num arquivo SQLite: cada pokémon é guardado já
+    projetado (PokemonRecord), indexado por nome, por id e pela posição na
+    listagem da PokeAPI, para que `offset`/`limit` funcionem como na API.
+    Cada thread usa a sua conexão; leitores abrem o arquivo em modo somente
+    leitura.
+    """
+
+    def __init__(self, path, readonly: bool = True):
+        self.path = str(path)
+        self.readonly = readonly
+        self._local = threading.local()
+        if readonly:
+            # Falha cedo, na configuração, em vez de na primeira consulta
+            try:
+                self._connection()
+            except sqlite3.OperationalError as e:
+                raise ImproperlyConfigured(f"PokeAPI snapshot not available at {self.path}: {e}") from e
+        else:
+            self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            if self.readonly:
+                connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            else:
+                # Sem WAL: o arquivo fica autocontido e pode ser lido de um disco somente leitura
+                connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._local.connection = connection
+        return connection
+
+    def put_many(self, entries: Iterable[Tuple[int, PokemonRecord]]) -> int:
+        """Grava (posição na listagem, record); substitui o que já existir na posição ou com o nome."""
+        rows = []
+        for position, record in entries:
+            payload = _encode(record)
+            etag = '"%s"' % hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+            rows.append((position, record.name, record.pokemon_id, etag, payload))
+
+        connection = self._connection()
+        with connection:
+            connection.executemany('INSERT OR REPLACE INTO pokemon VALUES (?, ?, ?, ?, ?)', rows)
+        return len(rows)
+
+    def set_meta(self, **values) -> None:
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                'INSERT OR REPLACE INTO meta VALUES (?, ?)', [(key, str(value)) for key, value in values.items()]
+            )
+
+    def meta(self) -> Dict[str, str]:
+        return dict(self._connection().execute('SELECT key, value FROM meta'))
+
+    def set_type_chart(self, chart: Dict[str, Dict[str, float]]) -> None:
+        self.set_meta(type_chart=json.dumps(chart, separators=(',', ':'), sort_keys=True))
+
+    def type_chart(self) -> Optional[Dict[str, Dict[str, float]]]:
+        row = self._connection().execute("SELECT value FROM meta WHERE key = 'type_chart'").fetchone()
+        return json.loads(row[0]) if row else None
+
+    def count(self) -> int:
+        return self._connection().execute('SELECT COUNT(*) FROM pokemon').fetchone()[0]
+
+    def get_with_etag(self, pokemon_name: str) -> Optional[Tuple[PokemonRecord, str]]:
+        pokemon_name = pokemon_name.strip().lower()
+        if pokemon_name.isdigit():
+            query, argument = 'SELECT record, etag FROM pokemon WHERE pokemon_id = ?', int(pokemon_name)
+        else:
+            query, argument = 'SELECT record, etag FROM pokemon WHERE name = ?', pokemon_name
+        row = self._connection().execute(query, (argument,)).fetchone()
+        return (_decode(row[0]), row[1]) if row else None
+
+    def get(self, pokemon_name: str) -> Optional[PokemonRecord]:
+        found = self.get_with_etag(pokemon_name)
+        return found[0] if found else None
+
+    def get_many(self, names: List[str]) -> Dict[str, Tuple[PokemonRecord, str]]:
+        """Busca vários nomes de uma vez; retorna nome -> (record, etag) dos encontrados."""
+        names = [name.strip().lower() for name in names]
+        found: Dict[str, Tuple[PokemonRecord, str]] = {}
+        connection = self._connection()
+        for start in range(0, len(names), QUERY_CHUNK_SIZE):
+            chunk = names[start:start + QUERY_CHUNK_SIZE]
+            rows = connection.execute(
+                f"SELECT name, record, etag FROM pokemon WHERE name IN ({','.join('?' * len(chunk))})", chunk
+            )
+            found.update((name, (_decode(record), etag)) for name, record, etag in rows)
+        return found
+
+    def list_names(self, limit: int, offset: int = 0) -> List[str]:
+        rows = self._connection().execute(
+            'SELECT name FROM pokemon WHERE position >= ? AND position < ? ORDER BY position',
+            (offset, offset + limit),
+        )
+        return [name for name, in rows]
+
+
+_stores: Dict[str, PokemonSnapshotStore] = {}
+_stores_lock = threading.Lock()
+
+
+def snapshot_path() -> str:
+    return str(getattr(settings, 'POKEAPI', {}).get('SNAPSHOT_PATH', DEFAULT_SNAPSHOT_PATH))
+
+
+def get_snapshot_store(path=None) -> PokemonSnapshotStore:
+    """Store somente leitura compartilhado pelo processo."""
+    path = str(path or snapshot_path())
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = PokemonSnapshotStore(path)
+            _stores[path] = store
+        return store
+
+
+class SnapshotPokemonAPIService(PokemonAPIService):
+    """
+    PokemonAPIService servido inteiramente pelo snapshot local, sem acesso à
+    rede (POKEAPI['BACKEND'] = 'snapshot'). Pokémons ausentes do snapshot se
+    comportam como um 404 da PokeAPI.
+    """
+
+    def __init__(self, store: Optional[PokemonSnapshotStore] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store or get_snapshot_store()
+
+    def _fetch_pokemon_details(self, pokemon_name: str) -> PokemonRecord:
+        record = self.store.get(pokemon_name)
+        if record is None:
+            raise SnapshotMissError(f"Pokemon {pokemon_name} not in snapshot")
+        return record
+
+    def _fetch_pokemon_details_or_none(self, pokemon_name: str) -> Optional[PokemonRecord]:
+        return self.store.get(pokemon_name)
+
+    def get_pokemon_details(self, pokemon_name: str) -> Optional[PokemonRecord]:
+        # Uma leitura indexada no disco local; o cache de detalhes só ocuparia memória
+        return self.store.get(pokemon_name)
+
+    def fetch_pokemon_details_conditional(self, pokemon_name: str, etag: str = '',
+                                          last_modified: str = '') -> ConditionalFetchResult:
+        found = self.store.get_with_etag(pokemon_name)
+        if found is None:
+            raise SnapshotMissError(f"Pokemon {pokemon_name} not in snapshot")
+        record, stored_etag = found
+        if etag and etag == stored_etag:
+            return ConditionalFetchResult(pokemon_name, None, etag, last_modified)
+        return ConditionalFetchResult(pokemon_name, record, stored_etag, '')
+
+    def _report_missing(self, names: List[str], found: Dict[str, tuple],
+                        on_error: Optional[Callable[[str, Exception], None]]) -> None:
+        if on_error:
+            for name in names:
+                if name.strip().lower() not in found:
+                    on_error(name, SnapshotMissError(f"Pokemon {name} not in snapshot"))
+
+    def fetch_pokemon_details_many(
+        self,
+        names: List[str],
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> List[Optional[PokemonRecord]]:
+        found = self.store.get_many(names)
+        self._report_missing(names, found, on_error)
+        return [found[name.strip().lower()][0] if name.strip().lower() in found else None for name in names]
+
+    def fetch_pokemon_details_many_conditional(
+        self,
+        validators: List[Tuple[str, str, str]],
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> List[Optional[ConditionalFetchResult]]:
+        names = [name for name, _, _ in validators]
+        found = self.store.get_many(names)
+        self._report_missing(names, found, on_error)
+
+        results: List[Optional[ConditionalFetchResult]] = []
+        for name, etag, last_modified in validators:
+            if name.strip().lower() not in found:
+                results.append(None)
+                continue
+            record, stored_etag = found[name.strip().lower()]
+            if etag and etag == stored_etag:
+                results.append(ConditionalFetchResult(name, None, etag, last_modified))
+            else:
+                results.append(ConditionalFetchResult(name, record, stored_etag, ''))
+        return results
+
+    def list_pokemon_names(self, limit: int = 25, offset: int = 0) -> List[str]:
+        return self.store.list_names(limit=limit, offset=offset)
+
+    def fetch_type_chart(self) -> Dict[str, Dict[str, float]]:
+        chart = self.store.type_chart()
+        if chart is None:
+            raise SnapshotMissError("Type chart not in snapshot")
+        return chart
+
+
+class AsyncSnapshotPokemonAPIService(AsyncPokemonAPIService):
+    """Versão assíncrona de SnapshotPokemonAPIService; as leituras do SQLite rodam numa thread."""
+
+    def __init__(self, store: Optional[PokemonSnapshotStore] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store or get_snapshot_store()
+
+    async def get_pokemon_details(self, pokemon_name: str) -> Optional[PokemonRecord]:
+        return await sync_to_async(self.store.get, thread_sensitive=False)(pokemon_name)
+
+    async def fetch_pokemon_details_many(
+        self,
+        names: List[str],
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> List[Optional[PokemonRecord]]:
+        service = SnapshotPokemonAPIService(store=self.store)
+        return await sync_to_async(service.fetch_pokemon_details_many, thread_sensitive=False)(names, on_error)
+
+
+def snapshot_backend_enabled() -> bool:
+    return getattr(settings, 'POKEAPI', {}).get('BACKEND', BACKEND_HTTP) == BACKEND_SNAPSHOT
+
+
+def get_pokemon_api_service(**kwargs) -> PokemonAPIService:
+    """PokemonAPIService do backend configurado em POKEAPI['BACKEND'] ('http' ou 'snapshot')."""
+    if snapshot_backend_enabled():
+        return SnapshotPokemonAPIService(**kwargs)
+    return PokemonAPIService(**kwargs)
+
+
+def get_async_pokemon_api_service(**kwargs) -> AsyncPokemonAPIService:
+    if snapshot_backend_enabled():
+        return AsyncSnapshotPokemonAPIService(**kwargs)
+    return AsyncPokemonAPIService(**kwargs)
+
+
+def dump_snapshot(api_service: PokemonAPIService, path, limit: int, offset: int = 0, chunk_size: int = 100,
+                  on_error: Optional[Callable[[str, Exception], None]] = None,
+                  on_progress: Optional[Callable[[int, int], None]] = None) -> int:
+    """
+    Busca `limit` pokémons da listagem (a partir de `offset`) com `api_service`
+    e os grava no snapshot em `path`, bloco a bloco, junto com a tabela de
+    efetividade dos tipos. Retorna quantos pokémons foram gravados.
+    """
+    store = PokemonSnapshotStore(path, readonly=False)
+    names = api_service.list_pokemon_names(limit=limit, offset=offset)
+
+    written = 0
+    for start in range(0, len(names), chunk_size):
+        chunk = names[start:start + chunk_size]
+        records = api_service.fetch_pokemon_details_many(chunk, on_error=on_error)
+        written += store.put_many(
+            (offset + start + index, record) for index, record in enumerate(records) if record is not None
+        )
+        if on_progress:
+            on_progress(start + len(chunk), len(names))
+
+    try:
+        store.set_type_chart(api_service.fetch_type_chart())
+    except (requests.RequestException, ValueError) as e:
+        if on_error:
+            on_error('type-chart', e)
+
+    store.set_meta(created_at=timezone.now().isoformat(), base_url=api_service.base_url, count=store.count())
+    return written
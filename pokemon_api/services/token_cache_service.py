@@ -0,0 +1,149 @@
+import copy
+import hashlib
+import logging
+import threading
+from datetime import datetime, timezone as dt_timezone
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.utils import timezone
+
+from pokemon_api.services.cache_service import DEFAULT_CACHE_ALIAS, MISSING, LRUCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUTH_CACHE_TTL = 5 * 60
+DEFAULT_AUTH_USER_CACHE_TTL = 60
+DEFAULT_AUTH_USER_CACHE_SIZE = 4096
+
+
+def token_checksum(token: str) -> str:
+    """Mesmo SHA-256 que o django-oauth-toolkit grava em AccessToken.token_checksum."""
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+class AccessTokenCache:
+    """
+    Cache do caminho de autenticação OAuth2:
+    - token (pelo checksum) -> id do token, id do usuário, aplicação, escopos e
+      validade, no cache do Django compartilhado entre processos (Redis, quando
+      configurado), por até `ttl` segundos e nunca além da expiração do token;
+    - id do usuário -> User, num LRUCache do processo com TTL curto.
+
+    Assim, requisições autenticadas repetidas não consultam o banco. Entradas
+    são removidas quando o token é apagado (logout, revogação) ou alterado.
+
+    O LRU de usuários é do processo: salvar ou apagar um usuário o invalida só
+    no processo que fez a alteração. Nos outros workers um usuário desativado
+    continua autenticado por até AUTH_USER_CACHE_TTL segundos (60 por padrão);
+    use 0 para desligar essa camada se isso não for aceitável.
+    """
+
+    def __init__(self, shared_alias: Optional[str] = None, ttl: Optional[int] = None,
+                 users: Optional[LRUCache] = None):
+        config = getattr(settings, 'POKEAPI', {})
+        self.shared_alias = shared_alias or config.get('CACHE_ALIAS', DEFAULT_CACHE_ALIAS)
+        self.ttl = ttl if ttl is not None else config.get('AUTH_CACHE_TTL', DEFAULT_AUTH_CACHE_TTL)
+        self.users = users or LRUCache(
+            maxsize=config.get('AUTH_USER_CACHE_SIZE', DEFAULT_AUTH_USER_CACHE_SIZE),
+            ttl=config.get('AUTH_USER_CACHE_TTL', DEFAULT_AUTH_USER_CACHE_TTL),
+        )
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def _cache_key(self, checksum: str) -> str:
+        return f"pokeapi:auth:token:{checksum}"
+
+    def _count(self, counter: str) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, checksum: str) -> Optional[Dict[str, Any]]:
+        """Entrada do token, ou None se não estiver no cache ou já tiver expirado."""
+        try:
+            entry = self.shared.get(self._cache_key(checksum))
+        except Exception as e:
+            logger.warning(f"Shared cache unavailable on auth get: {e}")
+            entry = None
+        if entry is None or entry['expires'] <= timezone.now().timestamp():
+            self._count('misses')
+            return None
+        self._count('hits')
+        return entry
+
+    def set(self, access_token) -> None:
+        expires_in = access_token.expires.timestamp() - timezone.now().timestamp()
+        ttl = int(min(self.ttl, expires_in))
+        if ttl <= 0:
+            return
+        entry = {
+            'id': access_token.pk,
+            'user_id': access_token.user_id,
+            'application_id': access_token.application_id,
+            'scope': access_token.scope,
+            'expires': access_token.expires.timestamp(),
+        }
+        try:
+            self.shared.set(self._cache_key(token_checksum(access_token.token)), entry, ttl)
+        except Exception as e:
+            logger.warning(f"Shared cache unavailable on auth set: {e}")
+
+    def invalidate(self, checksum: str) -> None:
+        try:
+            self.shared.delete(self._cache_key(checksum))
+        except Exception as e:
+            logger.error(f"Error invalidating cached access token: {e}")
+
+    def build_token(self, token: str, entry: Dict[str, Any]):
+        """AccessToken montado a partir da entrada do cache, sem ir ao banco."""
+        from oauth2_provider.models import get_access_token_model
+
+        return get_access_token_model()(
+            pk=entry['id'],
+            user_id=entry['user_id'],
+            application_id=entry['application_id'],
+            token=token,
+            token_checksum=token_checksum(token),
+            scope=entry['scope'],
+            expires=datetime.fromtimestamp(entry['expires'], tz=dt_timezone.utc),
+        )
+
+    def get_user(self, user_id: Any):
+        user = self.users.get(str(user_id), MISSING)
+        if user is MISSING:
+            user = get_user_model().objects.filter(pk=user_id).first()
+            if user is None:
+                return None
+            self.users.set(str(user_id), user)
+        # Cópia: a mesma instância não é compartilhada entre requisições
+        return copy.copy(user)
+
+    def set_user(self, user) -> None:
+        self.users.set(str(user.pk), user)
+
+    def invalidate_user(self, user_id: Any) -> None:
+        self.users.delete(str(user_id))
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+_token_cache: Optional[AccessTokenCache] = None
+_token_cache_lock = threading.Lock()
+
+
+def get_token_cache() -> AccessTokenCache:
+    """Retorna o cache de tokens compartilhado pelo processo."""
+    global _token_cache
+    if _token_cache is None:
+        with _token_cache_lock:
+            if _token_cache is None:
+                _token_cache = AccessTokenCache()
+    return _token_cache
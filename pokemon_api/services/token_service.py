@@ -0,0 +1,131 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from oauth2_provider.models import get_access_token_model, get_application_model
+from oauthlib.common import generate_token
+
+logger = logging.getLogger(__name__)
+
+LOGIN_APPLICATION_NAME = 'Pokemon API'
+LOGIN_TOKEN_EXPIRES_IN = 36000
+DEFAULT_TOKEN_REAP_INTERVAL = 60 * 60
+DEFAULT_TOKEN_REAP_BATCH_SIZE = 500
+
+_application_id: Optional[int] = None
+_application_lock = threading.Lock()
+
+_reap_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='token-reaper')
+_reap_lock = threading.Lock()
+_reap_running = False
+_last_reap_at: Optional[float] = None
+
+
+def _config() -> dict:
+    return getattr(settings, 'POKEAPI', {})
+
+
+def get_login_application_id() -> int:
+    """
+    Id da aplicação OAuth2 usada pelo LoginView, resolvido uma vez por
+    processo (o get_or_create só acontece no primeiro login).
+    """
+    global _application_id
+    if _application_id is None:
+        with _application_lock:
+            if _application_id is None:
+                Application = get_application_model()
+                app, _ = Application.objects.get_or_create(
+                    name=LOGIN_APPLICATION_NAME,
+                    defaults={
+                        'client_type': Application.CLIENT_PUBLIC,
+                        'authorization_grant_type': Application.GRANT_PASSWORD,
+                    }
+                )
+                _application_id = app.pk
+    return _application_id
+
+
+def forget_login_application() -> None:
+    global _application_id
+    with _application_lock:
+        _application_id = None
+
+
+def get_or_create_login_token(user):
+    """
+    Token válido mais recente do usuário ou um novo. A busca parte do índice
+    da chave estrangeira user_id, então só percorre os tokens do usuário e não
+    depende do tamanho da tabela.
+    """
+    AccessToken = get_access_token_model()
+    now = timezone.now()
+    token = AccessToken.objects.filter(user=user, expires__gt=now).order_by('-expires').first()
+    if token is None:
+        token = AccessToken.objects.create(
+            user=user,
+            token=generate_token(),
+            application_id=get_login_application_id(),
+            expires=now + timedelta(seconds=LOGIN_TOKEN_EXPIRES_IN),
+            scope='read write'
+        )
+    return token
+
+
+def reap_expired_tokens(batch_size: Optional[int] = None) -> int:
+    """
+    Apaga os access tokens expirados em lotes de `batch_size`, cada um numa
+    transação curta, para não segurar o lock de escrita do banco por muito
+    tempo. Retorna quantos tokens foram apagados.
+    """
+    AccessToken = get_access_token_model()
+    batch_size = batch_size or _config().get('TOKEN_REAP_BATCH_SIZE', DEFAULT_TOKEN_REAP_BATCH_SIZE)
+    now = timezone.now()
+    deleted = 0
+    while True:
+        ids = list(AccessToken.objects.filter(expires__lt=now).values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        AccessToken.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
+    return deleted
+
+
+def _run_reaper() -> None:
+    global _reap_running
+    try:
+        deleted = reap_expired_tokens()
+        if deleted:
+            logger.info(f"Reaped {deleted} expired access tokens")
+    except Exception as e:
+        logger.error(f"Error reaping expired access tokens: {e}")
+    finally:
+        with _reap_lock:
+            _reap_running = False
+        connection.close()
+
+
+def maybe_reap_expired_tokens() -> bool:
+    """
+    Agenda a limpeza de tokens expirados em segundo plano se a última foi há
+    mais de POKEAPI['TOKEN_REAP_INTERVAL'] segundos (0 desliga). Não bloqueia
+    quem chama; retorna se a limpeza foi agendada.
+    """
+    global _reap_running, _last_reap_at
+    interval = _config().get('TOKEN_REAP_INTERVAL', DEFAULT_TOKEN_REAP_INTERVAL)
+    if not interval:
+        return False
+    now = time.monotonic()
+    with _reap_lock:
+        if _reap_running or (_last_reap_at is not None and now - _last_reap_at < interval):
+            return False
+        _reap_running = True
+        _last_reap_at = now
+    _reap_executor.submit(_run_reaper)
+    return True
@@ -0,0 +1,135 @@
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from oauth2_provider.models import get_access_token_model, get_application_model
+
+from pokemon_api.models import Pokemon
+from pokemon_api.services.leaderboard_service import get_leaderboard
+from pokemon_api.services.metrics_service import record_query
+from pokemon_api.services.normalization_service import sync_normalized_relations
+from pokemon_api.services.search_service import get_search_index
+from pokemon_api.services.token_cache_service import get_token_cache
+from pokemon_api.services.token_service import forget_login_application
+
+logger = logging.getLogger(__name__)
+
+# Enviado após gravações em lote que não passam por Pokemon.save()
+# (bulk_create/bulk_update), com o argumento `pokemons`: lista de Pokemon gravados,
+# e opcionalmente `update_fields`, quando só alguns campos foram regravados.
+pokemons_bulk_saved = Signal()
+
+
+def _update_leaderboard(pokemons):
+    entries = [(pokemon.id, pokemon.score, list(pokemon.types or [])) for pokemon in pokemons]
+
+    def apply():
+        try:
+            get_leaderboard().update_many(entries)
+        except Exception as e:
+            logger.error(f"Error updating leaderboard: {e}")
+
+    transaction.on_commit(apply)
+
+
+def _update_search_index(pokemons):
+    entries = [(pokemon.id, pokemon.name, pokemon.pokemon_id) for pokemon in pokemons]
+
+    def apply():
+        try:
+            get_search_index().update_many(entries)
+        except Exception as e:
+            logger.error(f"Error updating search index: {e}")
+
+    transaction.on_commit(apply)
+
+
+@receiver(post_save, sender=Pokemon)
+def update_leaderboard_on_save(sender, instance, **kwargs):
+    _update_leaderboard([instance])
+
+
+@receiver(post_save, sender=Pokemon)
+def update_search_index_on_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not {'name', 'pokemon_id'} & set(update_fields):
+        return
+    _update_search_index([instance])
+
+
+@receiver(post_save, sender=Pokemon)
+def sync_normalized_relations_on_save(sender, instance, update_fields=None, raw=False, **kwargs):
+    # Gravações em lote sincronizam as relações em PokemonBulkWriter
+    if raw or (update_fields is not None and not {'types', 'abilities'} & set(update_fields)):
+        return
+    sync_normalized_relations([instance])
+
+
+@receiver(pokemons_bulk_saved)
+def update_leaderboard_on_bulk_save(sender, pokemons, **kwargs):
+    _update_leaderboard(pokemons)
+
+
+@receiver(pokemons_bulk_saved)
+def update_search_index_on_bulk_save(sender, pokemons, update_fields=None, **kwargs):
+    if update_fields is not None and not {'name', 'pokemon_id'} & set(update_fields):
+        return
+    _update_search_index(pokemons)
+
+
+@receiver(post_delete, sender=Pokemon)
+def remove_from_leaderboard(sender, instance, **kwargs):
+    pokemon_id = instance.id
+
+    def apply():
+        try:
+            get_leaderboard().remove(pokemon_id)
+        except Exception as e:
+            logger.error(f"Error updating leaderboard: {e}")
+        try:
+            get_search_index().remove(pokemon_id)
+        except Exception as e:
+            logger.error(f"Error updating search index: {e}")
+
+    transaction.on_commit(apply)
+
+
+@receiver(post_save, sender=get_access_token_model())
+@receiver(post_delete, sender=get_access_token_model())
+def invalidate_cached_access_token(sender, instance, **kwargs):
+    # Logout, revogação ou mudança de escopo/validade: o cache de autenticação esquece o token
+    if instance.token_checksum:
+        get_token_cache().invalidate(instance.token_checksum)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_user(sender, instance, **kwargs):
+    get_token_cache().invalidate_user(instance.pk)
+
+
+@receiver(post_delete, sender=get_application_model())
+def forget_deleted_login_application(sender, instance, **kwargs):
+    forget_login_application()
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    try:
+        with connection.cursor() as cursor:
+            for pragma, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+                cursor.execute(f"PRAGMA {pragma} = {value}")
+    except Exception as e:
+        logger.error(f"Error applying SQLite pragmas: {e}")
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    # Conta as consultas de cada requisição para MetricsMiddleware; a conexão
+    # pode ser reaberta pelo mesmo DatabaseWrapper, daí a verificação
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
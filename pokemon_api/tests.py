@@ -1,3 +1,1423 @@
-from django.test import TestCase
+import asyncio
+import csv
+import dataclasses
+import gzip
+import importlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import httpx
+import requests
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connections
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import override_settings
+from django.utils import timezone
+from oauth2_provider.models import AccessToken
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from pokemon_api.auth_views import LoginView, LogoutView
+from pokemon_api.authentication import CachedOAuth2Authentication
+from pokemon_api.benchmarks.stub_server import StubPokeAPIServer, stub_pokemon_name, stub_pokemon_payload
+from pokemon_api.db_router import ReadReplicaRouter
+from pokemon_api.models import ImportJob, Pokemon, TypeEffectiveness
+from pokemon_api.services.async_pokemon_api_service import AsyncPokemonAPIService
+from pokemon_api.services.cache_service import LRUCache, PokemonDetailsCache, get_details_cache
+from pokemon_api.services.import_job_service import ImportJobService
+from pokemon_api.services.leaderboard_service import InMemoryLeaderboard, get_leaderboard, percentile
+from pokemon_api.services.matchup_service import get_matchup_engine, import_type_chart
+from pokemon_api.services.persistence_service import PokemonBulkWriter
+from pokemon_api.services.http_client import (
+    DEFAULT_RETRY_AFTER_MAX, CircuitBreaker, CircuitOpenError, JitteredRetry, build_retry, get_circuit_breaker,
+)
+from pokemon_api.services.pokemon_api_service import (
+    TYPE_NAMES, PokemonAPIService, PokemonRecord, format_pokemon_data,
+)
+from pokemon_api.services.read_through_service import PokemonReadThroughService
+from pokemon_api.services.score_service import ScoreService
+from pokemon_api.services.search_service import get_search_index
+from pokemon_api.services.singleflight import SingleFlight
+from pokemon_api.services.snapshot_service import (
+    PokemonSnapshotStore, SnapshotPokemonAPIService, get_pokemon_api_service,
+)
+from pokemon_api.services.token_cache_service import get_token_cache
+from pokemon_api.services import token_service
+from pokemon_api.services.token_service import (
+    forget_login_application, get_login_application_id, get_or_create_login_token, reap_expired_tokens,
+)
+from pokemon_api.views import PokemonScoreView
+
+
+def stub_record(pokemon_id: int) -> PokemonRecord:
+    return PokemonRecord.from_payload(stub_pokemon_payload(pokemon_id))
+
+
+def authenticated_client(username: str = 'trainer') -> APIClient:
+    client = APIClient()
+    client.force_authenticate(User.objects.create_user(username, password='pikachu-123'))
+    return client
+
+
+def login_token(username: str = 'trainer') -> str:
+    """Access token OAuth2 de um usuário novo, emitido como no LoginView."""
+    # O id da aplicação fica guardado no processo, mas o rollback do teste anterior a apagou
+    forget_login_application()
+    return get_or_create_login_token(User.objects.create_user(username, password='pikachu-123')).token
+
+
+def stub_pokemon(pokemon_id: int, **changes) -> dict:
+    """Pokémon formatado (entrada de PokemonBulkWriter.upsert) igual ao servido pela PokeAPI falsa."""
+    return {**format_pokemon_data(stub_record(pokemon_id)), **changes}
+
+
+class StubPokeAPITestCase(TestCase):
+    """TestCase com a PokeAPI falsa (StubPokeAPIServer) no lugar da real, em POKEAPI['BASE_URL']."""
+
+    stub_size = 50
+
+    @classmethod
+    def setUpClass(cls):
+        cls.stub = StubPokeAPIServer(size=cls.stub_size).start()
+        cls.addClassCleanup(cls.stub.stop)
+        pokeapi_settings = override_settings(POKEAPI={
+            **getattr(settings, 'POKEAPI', {}),
+            'BASE_URL': cls.stub.base_url,
+            'BACKEND': 'http',
+        })
+        pokeapi_settings.enable()
+        cls.addClassCleanup(pokeapi_settings.disable)
+        super().setUpClass()
+
+
+class PokemonAPIServiceTests(StubPokeAPITestCase):
+
+    def test_fetch_many_preserves_order_and_reports_failures(self):
+        failures = []
+        names = [stub_pokemon_name(3), stub_pokemon_name(1), 'missingno', stub_pokemon_name(2)]
+
+        records = PokemonAPIService().fetch_pokemon_details_many(
+            names, on_error=lambda name, error: failures.append((name, error)))
+
+        self.assertEqual([record and record.name for record in records], [names[0], names[1], None, names[3]])
+        self.assertEqual([name for name, _ in failures], ['missingno'])
+        self.assertIsInstance(failures[0][1], requests.HTTPError)
+        self.assertEqual(format_pokemon_data(records[0]), format_pokemon_data(stub_record(3)))
+
+    def test_fetch_many_runs_requests_concurrently(self):
+        self.stub.latency = 0.2
+        try:
+            start = time.perf_counter()
+            records = PokemonAPIService(max_in_flight=8).fetch_pokemon_details_many(
+                [stub_pokemon_name(pokemon_id) for pokemon_id in range(1, 9)])
+            elapsed = time.perf_counter() - start
+        finally:
+            self.stub.latency = 0
+
+        self.assertTrue(all(records))
+        # Em sequência seriam 8 x 0.2 s
+        self.assertLess(elapsed, 0.8)
+
+    def test_fetch_all_pokemons_follows_the_listing(self):
+        records = PokemonAPIService().fetch_all_pokemons(limit=5)
+
+        self.assertEqual([record.name for record in records], [stub_pokemon_name(index) for index in range(1, 6)])
+
+
+class JitteredRetryTests(TestCase):
+
+    def test_retry_after_cap_is_kept_per_instance(self):
+        short = JitteredRetry(total=2, retry_after_max=1)
+        long = JitteredRetry(total=2, retry_after_max=30)
+
+        self.assertEqual(short.new(total=1).retry_after_max, 1)
+        self.assertEqual(long.new(total=1).retry_after_max, 30)
+
+    def test_build_retry_does_not_change_existing_retries(self):
+        existing = build_retry()
+        with override_settings(POKEAPI={**getattr(settings, 'POKEAPI', {}), 'RETRY_AFTER_MAX': 2}):
+            self.assertEqual(build_retry().retry_after_max, 2)
+
+        configured = getattr(settings, 'POKEAPI', {}).get('RETRY_AFTER_MAX', DEFAULT_RETRY_AFTER_MAX)
+        self.assertEqual(existing.retry_after_max, configured)
+
+
+class CircuitBreakerTests(TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        clock = mock.patch('pokemon_api.services.http_client.time.monotonic', side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+        self.breaker = CircuitBreaker('pokeapi.test', failure_threshold=3, reset_timeout=30)
+
+    def open_breaker(self):
+        for _ in range(3):
+            self.breaker.before_request()
+            self.breaker.record_failure()
+
+    def test_opens_at_the_failure_threshold(self):
+        for _ in range(2):
+            self.breaker.before_request()
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.STATE_CLOSED)
+
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.STATE_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request()
+
+    def test_success_resets_the_failure_count(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.STATE_CLOSED)
+
+    def test_half_open_lets_a_single_probe_through_after_the_timeout(self):
+        self.open_breaker()
+        self.now += 29
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request()
+
+        self.now += 1
+        self.breaker.before_request()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.STATE_HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request()
+
+    def test_probe_success_closes_the_breaker(self):
+        self.open_breaker()
+        self.now += 30
+        self.breaker.before_request()
+
+        self.breaker.record_success()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.STATE_CLOSED)
+        self.breaker.before_request()
+
+    def test_probe_failure_opens_the_breaker_again(self):
+        self.open_breaker()
+        self.now += 30
+        self.breaker.before_request()
+
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.STATE_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request()
+        self.now += 30
+        self.breaker.before_request()
+
+    def test_probe_that_never_reports_is_replaced_after_the_timeout(self):
+        self.open_breaker()
+        self.now += 30
+        self.breaker.before_request()
+
+        self.now += 29
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request()
+        self.now += 1
+        self.breaker.before_request()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.STATE_HALF_OPEN)
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.STATE_CLOSED)
+
+
+class PokemonDetailsCacheTests(StubPokeAPITestCase):
+
+    def setUp(self):
+        caches['pokeapi'].clear()
+        self.cache = PokemonDetailsCache(local=LRUCache(), shared_alias='pokeapi')
+        self.fetches = []
+
+    def fetch(self, value):
+        def fetch():
+            self.fetches.append(value)
+            return value
+        return fetch
+
+    def test_second_lookup_is_served_from_the_local_tier(self):
+        self.assertEqual(self.cache.get_or_fetch('pikachu', self.fetch({'name': 'pikachu'})), {'name': 'pikachu'})
+        self.assertEqual(self.cache.get_or_fetch('pikachu', self.fetch({'name': 'other'})), {'name': 'pikachu'})
+
+        self.assertEqual(len(self.fetches), 1)
+        self.assertEqual(self.cache.stats()['local_hits'], 1)
+
+    def test_shared_tier_is_used_by_other_instances(self):
+        self.cache.get_or_fetch('pikachu', self.fetch({'name': 'pikachu'}))
+        other = PokemonDetailsCache(local=LRUCache(), shared_alias='pokeapi')
+
+        self.assertEqual(other.get_or_fetch('pikachu', self.fetch({'name': 'other'})), {'name': 'pikachu'})
+        self.assertEqual(len(self.fetches), 1)
+        self.assertEqual(other.stats()['shared_hits'], 1)
+
+    def test_not_found_is_cached(self):
+        self.assertIsNone(self.cache.get_or_fetch('missingno', self.fetch(None)))
+        self.assertIsNone(self.cache.get_or_fetch('missingno', self.fetch(None)))
+
+        self.assertEqual(len(self.fetches), 1)
+        self.assertEqual(self.cache.stats()['negative_hits'], 1)
+
+    def test_errors_are_not_cached(self):
+        def failing_fetch():
+            self.fetches.append('error')
+            raise requests.ConnectionError('PokeAPI down')
+
+        with self.assertRaises(requests.ConnectionError):
+            self.cache.get_or_fetch('pikachu', failing_fetch)
+
+        self.assertEqual(self.cache.get_or_fetch('pikachu', self.fetch({'name': 'pikachu'})), {'name': 'pikachu'})
+        self.assertEqual(self.fetches, ['error', {'name': 'pikachu'}])
+
+    def test_pokeapi_404_is_requested_once(self):
+        service = PokemonAPIService(cache=self.cache)
+        requests_before = self.stub.requests
+
+        self.assertIsNone(service.get_pokemon_details('missingno'))
+        self.assertIsNone(service.get_pokemon_details('MissingNo'))
+        self.assertEqual(self.stub.requests - requests_before, 1)
+
+        self.assertEqual(service.get_pokemon_details(stub_pokemon_name(7)).pokemon_id, 7)
+        self.assertEqual(service.get_pokemon_details(stub_pokemon_name(7)).pokemon_id, 7)
+        self.assertEqual(self.stub.requests - requests_before, 2)
+
+
+def run_concurrently(fn, count: int = 8) -> list:
+    """Chama `fn()` em `count` threads liberadas ao mesmo tempo; retorna os resultados."""
+    barrier = threading.Barrier(count)
+
+    def call(_):
+        barrier.wait()
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        return list(executor.map(call, range(count)))
+
+
+class SingleFlightTests(StubPokeAPITestCase):
+
+    def setUp(self):
+        caches['pokeapi'].clear()
+
+    def test_concurrent_calls_share_one_execution(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.2)
+            return object()
+
+        results = run_concurrently(lambda: single_flight.do('key', slow))
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(single_flight.coalesced, len(results) - 1)
+
+    def test_waiting_calls_receive_the_exception(self):
+        single_flight = SingleFlight()
+
+        def failing():
+            time.sleep(0.2)
+            raise ValueError('boom')
+
+        def call():
+            try:
+                single_flight.do('key', failing)
+            except ValueError as e:
+                return e
+
+        errors = run_concurrently(call)
+
+        self.assertTrue(all(isinstance(error, ValueError) for error in errors))
+        # Depois de terminar, a chave não fica presa ao resultado anterior
+        self.assertEqual(single_flight.do('key', lambda: 'ok'), 'ok')
+
+    def test_concurrent_lookups_make_one_pokeapi_request(self):
+        service = PokemonAPIService(cache=PokemonDetailsCache(local=LRUCache(), shared_alias='pokeapi'))
+        requests_before = self.stub.requests
+        self.stub.latency = 0.2
+        try:
+            records = run_concurrently(lambda: service.get_pokemon_details(stub_pokemon_name(11)))
+        finally:
+            self.stub.latency = 0
+
+        self.assertEqual({record.pokemon_id for record in records}, {11})
+        self.assertEqual(self.stub.requests - requests_before, 1)
+        self.assertGreaterEqual(service.cache.stats()['coalesced_fetches'], 1)
+
+
+class PokemonBulkWriterTests(TestCase):
+
+    def setUp(self):
+        self.writer = PokemonBulkWriter(batch_size=2)
+
+    def test_counts_created_and_updated_rows(self):
+        result = self.writer.upsert(stub_pokemon(pokemon_id) for pokemon_id in range(1, 4))
+
+        self.assertEqual((result.created, result.updated, result.unchanged), (3, 0, 0))
+        self.assertEqual(Pokemon.objects.count(), 3)
+        self.assertFalse(Pokemon.objects.filter(score__isnull=True).exists())
+
+        result = self.writer.upsert([stub_pokemon(2, weight=999), stub_pokemon(3), stub_pokemon(4)])
+
+        self.assertEqual((result.created, result.updated, result.unchanged), (1, 2, 0))
+        self.assertEqual(Pokemon.objects.count(), 4)
+        self.assertEqual(Pokemon.objects.get(pokemon_id=2).weight, 999)
+
+    def test_skip_unchanged_only_rewrites_changed_rows(self):
+        self.writer.upsert(stub_pokemon(pokemon_id) for pokemon_id in range(1, 4))
+        before = dict(Pokemon.objects.values_list('pokemon_id', 'updated_at'))
+
+        result = self.writer.upsert(
+            [stub_pokemon(1), stub_pokemon(2, height=77), stub_pokemon(3)], skip_unchanged=True)
+
+        self.assertEqual((result.created, result.updated, result.unchanged), (0, 1, 2))
+        after = dict(Pokemon.objects.values_list('pokemon_id', 'updated_at'))
+        self.assertEqual(after[1], before[1])
+        self.assertEqual(after[3], before[3])
+        self.assertGreater(after[2], before[2])
+        self.assertEqual(Pokemon.objects.get(pokemon_id=2).height, 77)
+
+    def test_invalid_rows_are_reported_without_failing_the_batch(self):
+        result = self.writer.upsert([stub_pokemon(1), stub_pokemon(2, weight=None)])
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual([error['name'] for error in result.errors], [stub_pokemon_name(2)])
+        self.assertFalse(Pokemon.objects.filter(pokemon_id=2).exists())
+
+
+class InterruptedImportJobService(ImportJobService):
+    """Simula a queda do processo ao chegar ao bloco que começa em `stop_at`."""
+
+    def __init__(self, stop_at: int, **kwargs):
+        super().__init__(**kwargs)
+        self.stop_at = stop_at
+
+    def _process_chunk(self, job, names, start):
+        if start >= self.stop_at:
+            raise RuntimeError('worker died')
+        super()._process_chunk(job, names, start)
+
+
+class ListingWithMissingPokemon(PokemonAPIService):
+    """Listagem com um nome a mais que a PokeAPI responde com 404."""
+
+    def list_pokemon_names(self, limit: int = 25, offset: int = 0):
+        return super().list_pokemon_names(limit=limit, offset=offset) + ['missingno']
+
+
+class ImportJobServiceTests(StubPokeAPITestCase):
+
+    def setUp(self):
+        self.job = ImportJob.objects.create(limit=12, offset=3)
+
+    def test_run_imports_the_listing_slice_in_chunks(self):
+        job = ImportJobService(chunk_size=5).run(self.job.id)
+
+        self.assertEqual(job.status, ImportJob.STATUS_COMPLETED)
+        self.assertEqual((job.total, job.next_index, job.persisted, job.created_count, job.failed), (12, 12, 12, 12, 0))
+        self.assertEqual(sorted(Pokemon.objects.values_list('pokemon_id', flat=True)), list(range(4, 16)))
+
+    def test_interrupted_job_resumes_from_the_last_checkpoint(self):
+        with self.assertRaises(RuntimeError):
+            InterruptedImportJobService(stop_at=10, chunk_size=5).run(self.job.id)
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, ImportJob.STATUS_RUNNING)
+        self.assertEqual((self.job.next_index, self.job.persisted), (10, 10))
+        self.assertIn(self.job, ImportJobService().pending_jobs(stale_after=0))
+
+        requests_before = self.stub.requests
+        job = ImportJobService(chunk_size=5).run(self.job.id)
+
+        self.assertEqual(job.status, ImportJob.STATUS_COMPLETED)
+        self.assertEqual((job.next_index, job.persisted), (12, 12))
+        self.assertEqual(Pokemon.objects.count(), 12)
+        # A listagem e só os dois pokémons que faltavam
+        self.assertEqual(self.stub.requests - requests_before, 3)
+
+    def test_failed_pokemons_are_recorded_on_the_job(self):
+        job = ImportJobService(api_service=ListingWithMissingPokemon(), chunk_size=5).run(self.job.id)
+
+        self.assertEqual(job.status, ImportJob.STATUS_COMPLETED)
+        self.assertEqual((job.total, job.persisted, job.failed), (13, 12, 1))
+        self.assertEqual([error['name'] for error in job.errors], ['missingno'])
+
+    def test_job_status_endpoint_reports_progress(self):
+        client = authenticated_client()
+        with self.assertRaises(RuntimeError):
+            InterruptedImportJobService(stop_at=5, chunk_size=5).run(self.job.id)
+
+        response = client.get(f'/api/pokemon/jobs/{self.job.id}/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], ImportJob.STATUS_RUNNING)
+        self.assertEqual((response.json()['next_index'], response.json()['total']), (5, 12))
+
+    def test_import_endpoint_enqueues_a_job(self):
+        response = authenticated_client().post('/api/pokemon/?limit=5&offset=2&mode=incremental')
+
+        self.assertEqual(response.status_code, 202)
+        job = ImportJob.objects.get(id=response.json()['job_id'])
+        self.assertEqual((job.limit, job.offset, job.mode), (5, 2, ImportJob.MODE_INCREMENTAL))
+
+    def test_import_endpoint_rejects_out_of_range_parameters(self):
+        client = authenticated_client()
+        jobs_before = ImportJob.objects.count()
+
+        for query in ('limit=0', 'limit=-5', 'offset=-1', 'limit=abc', 'mode=partial'):
+            with self.subTest(query=query):
+                self.assertEqual(client.post(f'/api/pokemon/?{query}').status_code, 400)
+        self.assertEqual(ImportJob.objects.count(), jobs_before)
+
+
+class IncrementalSyncTests(StubPokeAPITestCase):
+
+    def setUp(self):
+        caches['pokeapi'].clear()
+        get_details_cache().local.clear()
+        self.sync()
+
+    def sync(self):
+        job = ImportJob.objects.create(limit=8, offset=0, mode=ImportJob.MODE_INCREMENTAL)
+        return ImportJobService(chunk_size=5).run(job.id)
+
+    def test_first_sync_stores_the_etags(self):
+        self.assertEqual(Pokemon.objects.count(), 8)
+        self.assertFalse(Pokemon.objects.filter(etag='').exists())
+
+    def test_not_modified_pokemons_are_not_rewritten(self):
+        before = dict(Pokemon.objects.values_list('name', 'updated_at'))
+        requests_before = self.stub.requests
+
+        job = self.sync()
+
+        self.assertEqual((job.fetched, job.unchanged, job.created_count, job.updated_count), (8, 8, 0, 0))
+        self.assertEqual(dict(Pokemon.objects.values_list('name', 'updated_at')), before)
+        # A listagem e uma requisição condicional (304) por pokémon
+        self.assertEqual(self.stub.requests - requests_before, 9)
+
+    def test_changed_payload_is_updated(self):
+        changed = Pokemon.objects.get(pokemon_id=3)
+        Pokemon.objects.filter(id=changed.id).update(etag='"old"', content_hash='old', height=1)
+
+        job = self.sync()
+
+        self.assertEqual((job.unchanged, job.updated_count), (7, 1))
+        pokemon = Pokemon.objects.get(id=changed.id)
+        self.assertEqual(pokemon.height, stub_pokemon(3)['height'])
+        self.assertNotEqual(pokemon.etag, '"old"')
+        self.assertGreater(pokemon.updated_at, changed.updated_at)
+
+    def test_new_etag_with_the_same_content_only_refreshes_the_validators(self):
+        pokemon = Pokemon.objects.get(pokemon_id=3)
+        Pokemon.objects.filter(id=pokemon.id).update(etag='"old"')
+
+        job = self.sync()
+
+        self.assertEqual((job.unchanged, job.updated_count), (8, 0))
+        self.assertEqual(Pokemon.objects.get(id=pokemon.id).etag, pokemon.etag)
+
+    def test_sync_command_resumes_after_the_last_incremental_sync(self):
+        stdout = io.StringIO()
+
+        call_command('sync_pokemons', '--limit', '4', '--resume', stdout=stdout)
+
+        self.assertIn('4 created', stdout.getvalue())
+        self.assertEqual(sorted(Pokemon.objects.values_list('pokemon_id', flat=True)), list(range(1, 13)))
+
+
+class PokemonListingTests(TestCase):
+
+    def setUp(self):
+        PokemonBulkWriter().upsert(stub_pokemon(pokemon_id) for pokemon_id in range(1, 13))
+        self.client = authenticated_client()
+
+    def collect_pages(self, url):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.json()['results'])
+            url = response.json()['next']
+        return pages
+
+    def test_cursor_pages_cover_the_table_in_pokemon_id_order(self):
+        pages = self.collect_pages('/pokemon/?page_size=5')
+
+        self.assertEqual([len(page) for page in pages], [5, 5, 2])
+        self.assertEqual([pokemon['pokemon_id'] for page in pages for pokemon in page], list(range(1, 13)))
+
+    def test_ordering_is_kept_across_pages(self):
+        pages = self.collect_pages('/pokemon/?page_size=5&ordering=-stats_total&fields=name')
+        expected = list(Pokemon.objects.order_by('-stats_total', 'id').values_list('name', flat=True))
+
+        self.assertEqual([pokemon['name'] for page in pages for pokemon in page], expected)
+
+    def test_fields_projects_the_results(self):
+        response = self.client.get('/pokemon/?fields=name,pokemon_id')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({tuple(sorted(pokemon)) for pokemon in response.json()['results']}, {('name', 'pokemon_id')})
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get('/pokemon/?fields=name,secret')
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_filters_use_the_normalized_columns(self):
+        pokemons = list(Pokemon.objects.all())
+        pokemon_type = pokemons[0].types[-1]
+        by_type = sorted(pokemon.pokemon_id for pokemon in pokemons if pokemon_type in pokemon.types)
+        by_attack = sorted(pokemon.pokemon_id for pokemon in pokemons if 40 <= pokemon.attack <= 60)
+
+        response = self.client.get(f'/pokemon/?type={pokemon_type}&fields=pokemon_id')
+        self.assertEqual([pokemon['pokemon_id'] for pokemon in response.json()['results']], by_type)
+
+        response = self.client.get('/pokemon/?min_attack=40&max_attack=60&fields=pokemon_id')
+        self.assertTrue(by_attack)
+        self.assertEqual([pokemon['pokemon_id'] for pokemon in response.json()['results']], by_attack)
+
+    def test_listing_requires_authentication(self):
+        self.assertEqual(APIClient().get('/pokemon/').status_code, 401)
+
+
+class ScoreServiceTests(TestCase):
+
+    def setUp(self):
+        self.score_service = ScoreService()
+
+    def test_vectorized_scores_match_the_scalar_path(self):
+        pokemons = [ScoreService.score_data(Pokemon(**stub_pokemon(pokemon_id))) for pokemon_id in range(1, 41)]
+        # Quantidades diferentes de status (a matriz é completada com zeros) e listas vazias
+        pokemons.append({'types': [], 'base_stats': [1, 2, 3], 'abilities': [], 'height': 0, 'weight': 0})
+        pokemons.append({'types': ['a', 'b', 'c'], 'base_stats': [255] * 8, 'abilities': ['x'] * 4,
+                         'height': 33, 'weight': 9999})
+
+        scalar = [self.score_service.calculate_score(pokemon) for pokemon in pokemons]
+        vectorized = self.score_service.calculate_scores(self.score_service.build_score_columns(pokemons))
+
+        self.assertEqual(vectorized, scalar)
+
+    def test_invalid_base_stats_are_rejected(self):
+        pokemon = {'types': [], 'base_stats': [1, 'two'], 'abilities': [], 'height': 1, 'weight': 1}
+
+        with self.assertRaises(ValueError):
+            self.score_service.build_score_columns([pokemon])
+        self.assertEqual(self.score_service.score_pokemons([Pokemon(**stub_pokemon(1, base_stats={'hp': 'x'}))]),
+                         [None])
+
+    def test_batch_endpoint_recalculates_stale_scores(self):
+        PokemonBulkWriter().upsert(stub_pokemon(pokemon_id) for pokemon_id in range(1, 11))
+        Pokemon.objects.filter(pokemon_id__lte=5).update(score=None)
+        missing = '00000000-0000-0000-0000-000000000000'
+        ids = [str(pk) for pk in Pokemon.objects.order_by('pokemon_id').values_list('id', flat=True)]
+
+        response = authenticated_client().post('/pokemon/score/batch/', {'ids': ids + [missing]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        expected = [self.score_service.calculate_score(ScoreService.score_data(pokemon))
+                    for pokemon in Pokemon.objects.order_by('pokemon_id')]
+        self.assertEqual([result['score'] for result in response.json()['results']], expected)
+        self.assertEqual([str(pokemon_id) for pokemon_id in response.json()['not_found']], [missing])
+
+
+class PokemonLeaderboardTests(TestCase):
+
+    def setUp(self):
+        PokemonBulkWriter().upsert(stub_pokemon(pokemon_id) for pokemon_id in range(1, 21))
+        get_leaderboard().rebuild()
+        self.client = authenticated_client()
+        # Empates em ordem decrescente de id, como o ZREVRANGE do Redis
+        self.ranking = list(Pokemon.objects.order_by('-score', '-id'))
+
+    def test_top_is_ordered_by_score(self):
+        response = self.client.get('/pokemon/leaderboard/?limit=5')
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([result['rank'] for result in results], [1, 2, 3, 4, 5])
+        self.assertEqual([result['name'] for result in results], [pokemon.name for pokemon in self.ranking[:5]])
+
+    def test_rank_and_percentile_of_a_pokemon(self):
+        pokemon = self.ranking[4]
+
+        response = self.client.get(f'/pokemon/leaderboard/{pokemon.id}/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['rank'], 5)
+        self.assertEqual(response.json()['total'], 20)
+        self.assertEqual(response.json()['percentile'], percentile(5, 20))
+        self.assertEqual(percentile(5, 20), 75.0)
+
+    def test_type_board_only_ranks_pokemons_of_the_type(self):
+        pokemon_type = self.ranking[0].types[0]
+        expected = [pokemon.name for pokemon in self.ranking if pokemon_type in pokemon.types]
+
+        response = self.client.get(f'/pokemon/leaderboard/?type={pokemon_type}&limit=100')
+
+        self.assertEqual([result['name'] for result in response.json()['results']], expected)
+
+    def test_writes_update_the_ranking(self):
+        last = self.ranking[-1]
+        PokemonBulkWriter().upsert([stub_pokemon(last.pokemon_id, base_stats={'hp': 999})])
+        get_leaderboard().update_many([(last.id, Pokemon.objects.get(id=last.id).score, last.types)])
+
+        self.assertEqual(self.client.get(f'/pokemon/leaderboard/{last.id}/').json()['rank'], 1)
+
+    def test_ties_are_ordered_like_redis(self):
+        leaderboard = InMemoryLeaderboard(refresh_seconds=3600)
+        leaderboard.rebuild()
+        ids = [str(uuid.UUID(int=index)) for index in (3, 1, 4, 2)]
+        leaderboard.update_many([(pokemon_id, 50.0, ['tie']) for pokemon_id in ids] + [(ids[0], 60.0, ['tie'])])
+
+        # Sorted set do Redis: score e depois o membro, lidos de trás para frente
+        expected = [ids[0]] + sorted(ids[1:], reverse=True)
+        self.assertEqual([pokemon_id for pokemon_id, _ in leaderboard.top(10, pokemon_type='tie')], expected)
+        self.assertEqual([leaderboard.rank(pokemon_id, pokemon_type='tie')[0] for pokemon_id in expected],
+                         [1, 2, 3, 4])
+
+    def test_stale_index_is_served_while_another_thread_rebuilds(self):
+        leaderboard = InMemoryLeaderboard(refresh_seconds=0)
+        leaderboard.rebuild()
+        rebuilding = threading.Event()
+        release = threading.Event()
+
+        def slow_rebuild():
+            # Fica "lendo o banco" até ser liberada, sem tocar no índice atual
+            rebuilding.set()
+            release.wait(5)
+
+        with mock.patch.object(leaderboard, 'rebuild', side_effect=slow_rebuild):
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                refresh = executor.submit(leaderboard.top, 5)
+                self.assertTrue(rebuilding.wait(5))
+                started = time.monotonic()
+                self.assertEqual(len(leaderboard.top(5)), 5)
+                self.assertLess(time.monotonic() - started, 1)
+                release.set()
+                self.assertEqual(len(refresh.result()), 5)
+
+    def test_invalid_limits_are_rejected(self):
+        for limit in ('0', '-2', 'many'):
+            with self.subTest(limit=limit):
+                self.assertEqual(self.client.get(f'/pokemon/leaderboard/?limit={limit}').status_code, 400)
+        self.assertEqual(get_leaderboard().top(0), [])
+        self.assertEqual(get_leaderboard().top(-2), [])
+
+
+class ConditionalRequestTests(TestCase):
+
+    def setUp(self):
+        PokemonBulkWriter().upsert(stub_pokemon(pokemon_id) for pokemon_id in range(1, 6))
+        self.client = authenticated_client()
+        self.pokemon = Pokemon.objects.get(pokemon_id=1)
+
+    def test_detail_answers_304_to_matching_validators(self):
+        url = f'/pokemon/{self.pokemon.id}/'
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+
+    def test_detail_etag_changes_when_the_pokemon_changes(self):
+        url = f'/pokemon/{self.pokemon.id}/'
+        etag = self.client.get(url)['ETag']
+
+        self.client.patch(url, {'height': self.pokemon.height + 1}, format='json')
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_uses_only_the_etag(self):
+        response = self.client.get('/pokemon/')
+
+        self.assertNotIn('Last-Modified', response)
+        self.assertEqual(self.client.get('/pokemon/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_list_etag_changes_after_a_delete(self):
+        etag = self.client.get('/pokemon/')['ETag']
+
+        Pokemon.objects.get(pokemon_id=5).delete()
+
+        response = self.client.get('/pokemon/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 4)
+
+    def test_score_etag_changes_with_the_weights(self):
+        url = f'/pokemon/score/{self.pokemon.id}/'
+        response = self.client.get(url)
+
+        self.assertNotIn('Last-Modified', response)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        with mock.patch.dict(PokemonScoreView.score_service.weights, {'types': 0.5}):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.json()['score'], self.pokemon.score)
+
+
+class MatchupTests(StubPokeAPITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.chart = PokemonAPIService().fetch_type_chart()
+
+    def setUp(self):
+        PokemonBulkWriter().upsert(stub_pokemon(pokemon_id) for pokemon_id in range(1, 31))
+        self.imported = import_type_chart(self.chart)
+        self.client = authenticated_client()
+
+    def multiplier(self, attacking_type, defending_types):
+        """Multiplicador calculado direto da tabela gravada, sem a matriz do MatchupEngine."""
+        result = 1.0
+        for defending_type in defending_types[:2]:
+            result *= TypeEffectiveness.objects.get(
+                attacking_type__name=attacking_type, defending_type__name=defending_type).multiplier
+        return result
+
+    def test_import_stores_every_type_pair(self):
+        self.assertEqual(self.imported, len(TYPE_NAMES) ** 2)
+        self.assertEqual(TypeEffectiveness.objects.count(), len(TYPE_NAMES) ** 2)
+        self.assertTrue(TypeEffectiveness.objects.exclude(multiplier=1.0).exists())
+
+    def test_matchup_multipliers_are_the_products_of_the_chart(self):
+        for attacker_id, defender_id in ((1, 2), (3, 8), (7, 7), (12, 25)):
+            attacker = Pokemon.objects.get(pokemon_id=attacker_id)
+            defender = Pokemon.objects.get(pokemon_id=defender_id)
+            with self.subTest(attacker=attacker.name, defender=defender.name):
+                response = self.client.get(f'/pokemon/matchup/?attacker={attacker.name}&defender={defender.id}')
+
+                self.assertEqual(response.status_code, 200)
+                attack = {name: self.multiplier(name, defender.types) for name in attacker.types}
+                defense = {name: self.multiplier(name, attacker.types) for name in defender.types}
+                self.assertEqual(response.json()['attack'], {'multipliers': attack, 'best': max(attack.values())})
+                self.assertEqual(response.json()['defense'], {'multipliers': defense, 'best': max(defense.values())})
+
+    def test_counters_match_a_brute_force_ranking(self):
+        target = Pokemon.objects.get(pokemon_id=9)
+        candidates = []
+        for pokemon in Pokemon.objects.exclude(id=target.id).order_by('pokemon_id'):
+            offense = max(self.multiplier(name, target.types) for name in pokemon.types)
+            threat = max(self.multiplier(name, pokemon.types) for name in target.types)
+            candidates.append((offense / max(threat, 0.125), offense, pokemon.stats_total, pokemon.pokemon_id))
+        candidates.sort(key=lambda candidate: (-candidate[0], -candidate[1], -candidate[2]))
+
+        response = self.client.get(f'/pokemon/counters/{target.id}/?limit=10')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([counter['pokemon_id'] for counter in response.json()['results']],
+                         [candidate[3] for candidate in candidates[:10]])
+        self.assertEqual([counter['offense'] for counter in response.json()['results']],
+                         [candidate[1] for candidate in candidates[:10]])
+
+    def test_missing_chart_answers_503(self):
+        TypeEffectiveness.objects.all().delete()
+        get_matchup_engine().invalidate()
+        pokemon = Pokemon.objects.get(pokemon_id=1)
+
+        self.assertEqual(self.client.get(f'/pokemon/counters/{pokemon.id}/').status_code, 503)
+        response = self.client.get(f'/pokemon/matchup/?attacker={pokemon.name}&defender={pokemon.name}')
+        self.assertEqual(response.status_code, 503)
+
+    def test_incomplete_chart_is_rejected(self):
+        chart = dict(self.chart)
+        chart.pop(TYPE_NAMES[0])
+
+        with self.assertRaises(ValueError):
+            import_type_chart(chart)
+        self.assertEqual(TypeEffectiveness.objects.count(), len(TYPE_NAMES) ** 2)
+
+
+class PokemonExportTests(TestCase):
+
+    def setUp(self):
+        PokemonBulkWriter().upsert(stub_pokemon(pokemon_id) for pokemon_id in range(1, 13))
+        self.client = authenticated_client()
+
+    def content(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+
+    def test_ndjson_streams_one_line_per_pokemon(self):
+        lines = self.content(self.client.get('/pokemon/export/')).decode('utf-8').splitlines()
+
+        self.assertEqual([json.loads(line)['pokemon_id'] for line in lines], list(range(1, 13)))
+        self.assertEqual(json.loads(lines[0])['base_stats'], Pokemon.objects.get(pokemon_id=1).base_stats)
+
+    def test_csv_and_gzip_outputs(self):
+        rows = list(csv.reader(io.StringIO(self.content(self.client.get('/pokemon/export/?output=csv')).decode())))
+        self.assertEqual(len(rows), 13)
+        self.assertIn('name', rows[0])
+
+        response = self.client.get('/pokemon/export/?gzip=true')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(len(gzip.decompress(self.content(response)).splitlines()), 12)
+
+    def test_export_uses_the_listing_filters(self):
+        expected = sorted(pokemon.pokemon_id for pokemon in Pokemon.objects.all() if 40 <= pokemon.attack <= 60)
+
+        lines = self.content(self.client.get('/pokemon/export/?min_attack=40&max_attack=60')).splitlines()
+
+        self.assertEqual([json.loads(line)['pokemon_id'] for line in lines], expected)
+
+    def test_unknown_output_is_rejected(self):
+        self.assertEqual(self.client.get('/pokemon/export/?output=xml').status_code, 400)
+
+
+class AsyncPokemonAPIServiceTests(StubPokeAPITestCase):
+
+    def setUp(self):
+        self.cache = PokemonDetailsCache(local=LRUCache(), shared_alias='pokeapi')
+        caches['pokeapi'].clear()
+
+    def mock_service(self, host, handler, **pokeapi):
+        """Serviço com um transporte httpx falso, para respostas que a PokeAPI falsa não produz."""
+        self.enterContext(override_settings(POKEAPI={**settings.POKEAPI, 'RETRY_BACKOFF': 0, **pokeapi}))
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return AsyncPokemonAPIService(base_url=f'http://{host}/api/v2', client=client, cache=self.cache)
+
+    async def test_details_match_the_sync_client(self):
+        service = AsyncPokemonAPIService(cache=self.cache)
+
+        self.assertEqual(await service.get_pokemon_details(stub_pokemon_name(3)), stub_record(3))
+        self.assertIsNone(await service.get_pokemon_details('missingno'))
+
+    async def test_fetch_many_keeps_the_order_and_reports_failures(self):
+        service = AsyncPokemonAPIService(cache=self.cache)
+        errors = []
+
+        details = await service.fetch_pokemon_details_many(
+            [stub_pokemon_name(5), 'missingno', stub_pokemon_name(2)], on_error=lambda name, e: errors.append(name))
+
+        self.assertEqual([record and record.pokemon_id for record in details], [5, None, 2])
+        self.assertEqual(errors, ['missingno'])
+
+    async def test_retries_5xx_until_success(self):
+        statuses = [503, 502]
+
+        def handler(request):
+            if statuses:
+                return httpx.Response(statuses.pop(0))
+            return httpx.Response(200, json=stub_pokemon_payload(4))
+
+        service = self.mock_service('retry.test', handler, RETRIES=2)
+
+        self.assertEqual((await service.get_pokemon_details(stub_pokemon_name(4))).pokemon_id, 4)
+        self.assertEqual(statuses, [])
+        self.assertEqual(get_circuit_breaker('retry.test').failures, 0)
+
+    async def test_exhausted_retries_count_as_a_breaker_failure(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        service = self.mock_service('down.test', handler, RETRIES=1)
+
+        self.assertIsNone(await service.get_pokemon_details(stub_pokemon_name(4)))
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(get_circuit_breaker('down.test').failures, 1)
+
+    async def test_cancelled_probe_reopens_the_breaker(self):
+        started = asyncio.Event()
+
+        async def handler(request):
+            started.set()
+            await asyncio.Event().wait()
+
+        service = self.mock_service('cancel.test', handler)
+        breaker = get_circuit_breaker('cancel.test')
+        breaker.state, breaker.failures = CircuitBreaker.STATE_OPEN, breaker.failure_threshold
+        breaker._opened_at = time.monotonic() - breaker.reset_timeout
+
+        task = asyncio.ensure_future(service._get(f'{service.base_url}/pokemon/{stub_pokemon_name(1)}'))
+        await started.wait()
+        self.assertEqual(breaker.state, CircuitBreaker.STATE_HALF_OPEN)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        self.assertEqual(breaker.state, CircuitBreaker.STATE_OPEN)
+
+
+class PokemonAsyncAPIViewTests(StubPokeAPITestCase):
+
+    def setUp(self):
+        caches['pokeapi'].clear()
+        get_details_cache().local.clear()
+        self.authorization = f'Bearer {login_token()}'
+
+    def test_lookup_reads_through_to_the_local_table(self):
+        response = self.client.get('/api/pokemon/async/', {'name': stub_pokemon_name(6)},
+                                   HTTP_AUTHORIZATION=self.authorization)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['pokemon_id'], 6)
+        self.assertTrue(Pokemon.objects.filter(pokemon_id=6).exists())
+
+    def test_unknown_pokemon_answers_404(self):
+        response = self.client.get('/api/pokemon/async/', {'name': 'missingno'}, HTTP_AUTHORIZATION=self.authorization)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertIn('did_you_mean', response.json())
+
+    def test_name_is_required(self):
+        response = self.client.get('/api/pokemon/async/', HTTP_AUTHORIZATION=self.authorization)
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_requires_a_valid_token(self):
+        self.assertEqual(self.client.get('/api/pokemon/async/', {'name': 'x'}).status_code, 401)
+        response = self.client.get('/api/pokemon/async/', {'name': 'x'}, HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, 401)
+
+
+class MetricsAccessTests(TestCase):
+
+    def metrics(self, remote_addr='127.0.0.1', authorization=None, **pokeapi):
+        headers = {'HTTP_AUTHORIZATION': authorization} if authorization else {}
+        with override_settings(POKEAPI={**settings.POKEAPI, 'METRICS_ALLOWED_IPS': [], 'METRICS_TOKEN': None,
+                                        **pokeapi}):
+            return self.client.get('/metrics', REMOTE_ADDR=remote_addr, **headers)
+
+    def test_nobody_has_access_by_default(self):
+        self.assertEqual(self.metrics().status_code, 403)
+        self.assertEqual(self.metrics(authorization='Bearer anything').status_code, 403)
+
+    def test_allowed_ip(self):
+        response = self.metrics(remote_addr='10.0.0.5', METRICS_ALLOWED_IPS=['10.0.0.5'])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('pokemon_http_request_duration_seconds', response.content.decode())
+
+    def test_other_ip_is_rejected(self):
+        self.assertEqual(self.metrics(remote_addr='10.0.0.6', METRICS_ALLOWED_IPS=['10.0.0.5']).status_code, 403)
+
+    def test_bearer_token(self):
+        self.assertEqual(self.metrics(authorization='Bearer s3cret', METRICS_TOKEN='s3cret').status_code, 200)
+        self.assertEqual(self.metrics(authorization='Bearer wrong', METRICS_TOKEN='s3cret').status_code, 403)
+        self.assertEqual(self.metrics(authorization='Basic s3cret', METRICS_TOKEN='s3cret').status_code, 403)
+        self.assertEqual(self.metrics(METRICS_TOKEN='s3cret').status_code, 403)
+
+    def test_disabled_metrics_answer_404(self):
+        self.assertEqual(self.metrics(METRICS_ENABLED=False, METRICS_TOKEN='s3cret',
+                                      authorization='Bearer s3cret').status_code, 404)
+
+
+class CachedOAuth2AuthenticationTests(TestCase):
+
+    def setUp(self):
+        caches[get_token_cache().shared_alias].clear()
+        get_token_cache().users.clear()
+        self.token = login_token()
+        self.access_token = AccessToken.objects.get(token=self.token)
+
+    def authenticate(self, token=None):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token or self.token}')
+        return CachedOAuth2Authentication().authenticate(Request(request))
+
+    def test_cached_token_skips_the_database(self):
+        user, _ = self.authenticate()
+
+        with self.assertNumQueries(0):
+            cached_user, cached_token = self.authenticate()
+
+        self.assertEqual(cached_user.pk, user.pk)
+        self.assertEqual(cached_token.pk, self.access_token.pk)
+        self.assertEqual(cached_token.scope, self.access_token.scope)
+
+    def test_expired_token_is_rejected_even_when_cached(self):
+        self.authenticate()
+
+        with mock.patch('django.utils.timezone.now', return_value=self.access_token.expires + timedelta(seconds=1)):
+            self.assertIsNone(self.authenticate())
+
+    def test_deleted_or_revoked_token_leaves_the_cache(self):
+        self.authenticate()
+        self.access_token.revoke()
+        self.assertIsNone(self.authenticate())
+
+        other = login_token('other')
+        self.authenticate(other)
+        AccessToken.objects.get(token=other).delete()
+        self.assertIsNone(self.authenticate(other))
+
+    def test_logout_invalidates_the_cached_token(self):
+        self.authenticate()
+        request = APIRequestFactory().post('/auth/logout/', HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+        response = LogoutView.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(AccessToken.objects.filter(token=self.token).exists())
+        self.assertIsNone(self.authenticate())
+
+    def test_saving_the_user_refreshes_the_cached_copy(self):
+        user, _ = self.authenticate()
+        user.first_name = 'Ash'
+        user.save()
+
+        self.assertEqual(self.authenticate()[0].first_name, 'Ash')
+
+
+@override_settings(POKEAPI={**settings.POKEAPI, 'TOKEN_REAP_INTERVAL': 0})
+class LoginTokenTests(TestCase):
+
+    def setUp(self):
+        forget_login_application()
+        self.user = User.objects.create_user('trainer', password='pikachu-123')
+
+    def login(self, password='pikachu-123'):
+        request = APIRequestFactory().post('/auth/login/', {'username': 'trainer', 'password': password},
+                                           format='json')
+        return LoginView.as_view()(request)
+
+    def expired_tokens(self, count):
+        AccessToken.objects.bulk_create([
+            AccessToken(user=self.user, token=f'expired-{index}', application_id=get_login_application_id(),
+                        expires=timezone.now() - timedelta(hours=1), scope='read write')
+            for index in range(count)
+        ])
+
+    def test_login_reuses_the_valid_token(self):
+        first = self.login()
+        second = self.login()
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.data['access_token'], second.data['access_token'])
+        self.assertEqual(AccessToken.objects.filter(user=self.user).count(), 1)
+
+    def test_login_issues_a_new_token_when_the_old_one_expired(self):
+        self.expired_tokens(3)
+
+        response = self.login()
+
+        token = AccessToken.objects.get(token=response.data['access_token'])
+        self.assertGreater(token.expires, timezone.now())
+        # Os expirados ficam para o reaper, fora do caminho do login
+        self.assertEqual(AccessToken.objects.filter(user=self.user).count(), 4)
+
+    def test_invalid_credentials(self):
+        self.assertEqual(self.login(password='wrong-password').status_code, 401)
+        self.assertFalse(AccessToken.objects.exists())
+
+    def test_reaper_deletes_only_expired_tokens_in_batches(self):
+        self.expired_tokens(5)
+        valid = login_token('other')
+
+        self.assertEqual(reap_expired_tokens(batch_size=2), 5)
+        self.assertEqual(list(AccessToken.objects.values_list('token', flat=True)), [valid])
+
+    def test_reap_expired_tokens_command(self):
+        self.expired_tokens(3)
+        stdout = io.StringIO()
+
+        call_command('reap_expired_tokens', '--batch-size', '2', stdout=stdout)
+
+        self.assertIn('Deleted 3 expired access tokens', stdout.getvalue())
+        self.assertFalse(AccessToken.objects.exists())
+
+    def test_background_reap_is_throttled(self):
+        with mock.patch.object(token_service, '_reap_executor') as executor, \
+                mock.patch.object(token_service, '_last_reap_at', None), \
+                override_settings(POKEAPI={**settings.POKEAPI, 'TOKEN_REAP_INTERVAL': 60}):
+            self.assertTrue(token_service.maybe_reap_expired_tokens())
+            token_service._reap_running = False
+            self.assertFalse(token_service.maybe_reap_expired_tokens())
+
+        executor.submit.assert_called_once_with(token_service._run_reaper)
+        self.assertFalse(token_service.maybe_reap_expired_tokens())
+
+
+class ScoreBackfillTests(TestCase):
+
+    def setUp(self):
+        PokemonBulkWriter().upsert(stub_pokemon(pokemon_id) for pokemon_id in range(1, 9))
+        self.score_service = ScoreService()
+
+    def expected_scores(self):
+        return {pokemon.pokemon_id: self.score_service.calculate_score(ScoreService.score_data(pokemon))
+                for pokemon in Pokemon.objects.all()}
+
+    def test_recompute_scores_only_touches_stale_rows(self):
+        Pokemon.objects.filter(pokemon_id__lte=2).update(score=None)
+        Pokemon.objects.filter(pokemon_id=3).update(score=1.0, score_version='old')
+        Pokemon.objects.filter(pokemon_id=4).update(score=1.0)
+        stdout = io.StringIO()
+
+        call_command('recompute_scores', '--batch-size', '2', stdout=stdout)
+
+        self.assertIn('Recomputed 3 scores', stdout.getvalue())
+        scores = dict(Pokemon.objects.values_list('pokemon_id', 'score'))
+        self.assertEqual({**scores, 4: self.expected_scores()[4]}, self.expected_scores())
+        self.assertEqual(scores[4], 1.0)
+        self.assertEqual(set(Pokemon.objects.values_list('score_version', flat=True)),
+                         {self.score_service.weights_version})
+
+    def test_recompute_all_scores(self):
+        Pokemon.objects.update(score=1.0)
+
+        call_command('recompute_scores', '--all', stdout=io.StringIO())
+
+        self.assertEqual(dict(Pokemon.objects.values_list('pokemon_id', 'score')), self.expected_scores())
+
+    def test_migration_backfill_uses_its_own_copy_of_the_formula(self):
+        migration = importlib.import_module('pokemon_api.migrations.0005_pokemon_score')
+        Pokemon.objects.update(score=None, score_version='')
+        Pokemon.objects.filter(pokemon_id=1).update(types=['a', 'b'], base_stats={'hp': 10, 'attack': 20},
+                                                    abilities=['x'], height=7, weight=100)
+        Pokemon.objects.filter(pokemon_id=2).update(base_stats={'hp': 'x'})
+
+        migration.backfill_scores(django_apps, None)
+
+        scores = dict(Pokemon.objects.values_list('pokemon_id', 'score'))
+        # 100 * 0.4 + 30 * 0.3 + 33.33 * 0.2 + (35 + 5) * 0.1
+        self.assertEqual(scores[1], 59.67)
+        self.assertIsNone(scores[2])
+        pokemon = Pokemon.objects.get(pokemon_id=3)
+        self.assertEqual(scores[3], self.score_service.calculate_score(ScoreService.score_data(pokemon)))
+        self.assertEqual(set(Pokemon.objects.exclude(pokemon_id=2).values_list('score_version', flat=True)),
+                         {migration.WEIGHTS_VERSION})
+
+
+class PokemonReadThroughTests(StubPokeAPITestCase):
+
+    def setUp(self):
+        self.api_service = PokemonAPIService(cache=PokemonDetailsCache(local=LRUCache(), shared_alias='pokeapi'))
+        caches['pokeapi'].clear()
+        self.service = PokemonReadThroughService(api_service=self.api_service, background_refresh=False)
+
+    def test_miss_fetches_and_stores_the_pokemon(self):
+        requests_before = self.stub.requests
+
+        data = self.service.get(stub_pokemon_name(5))
+
+        self.assertEqual(data, stub_pokemon(5))
+        self.assertEqual(self.stub.requests - requests_before, 1)
+        self.assertEqual(Pokemon.objects.get(pokemon_id=5).name, stub_pokemon_name(5))
+
+    def test_second_lookup_is_served_from_the_local_table(self):
+        self.service.get(stub_pokemon_name(5))
+        requests_before = self.stub.requests
+
+        with self.assertNumQueries(1):
+            by_name = self.service.get(stub_pokemon_name(5).upper())
+        by_number = self.service.get('5')
+
+        self.assertEqual(by_name, stub_pokemon(5))
+        self.assertEqual(by_number, stub_pokemon(5))
+        self.assertEqual(self.stub.requests, requests_before)
+
+    def test_pokeapi_404_returns_none_and_stores_nothing(self):
+        self.assertIsNone(self.service.get('missingno'))
+        self.assertFalse(Pokemon.objects.exists())
+
+        client = authenticated_client()
+        response = client.get('/api/pokemon/', {'name': 'missingno'})
+        self.assertEqual(response.status_code, 404)
+        self.assertIn('did_you_mean', response.json())
+
+    def test_stale_record_is_refreshed_from_the_pokeapi(self):
+        self.service.get(stub_pokemon_name(5))
+        stale_at = timezone.now() - timedelta(days=30)
+        Pokemon.objects.filter(pokemon_id=5).update(updated_at=stale_at, height=1)
+        # Sem o cache de detalhes, que ainda teria a resposta da primeira busca
+        self.api_service.cache.local.clear()
+        caches['pokeapi'].clear()
+        requests_before = self.stub.requests
+
+        self.assertEqual(self.service.get(stub_pokemon_name(5)), stub_pokemon(5))
+
+        self.assertEqual(self.stub.requests - requests_before, 1)
+        self.assertGreater(Pokemon.objects.get(pokemon_id=5).updated_at, stale_at)
+
+    def test_stale_record_is_served_when_the_pokeapi_fails(self):
+        PokemonBulkWriter().upsert([stub_pokemon(5)])
+        Pokemon.objects.filter(pokemon_id=5).update(updated_at=timezone.now() - timedelta(days=30))
+        down = PokemonReadThroughService(
+            api_service=PokemonAPIService(base_url='http://127.0.0.1:9/api/v2', cache=self.api_service.cache),
+            background_refresh=False,
+        )
+
+        with override_settings(POKEAPI={**settings.POKEAPI, 'RETRIES': 0}):
+            self.assertEqual(down.get(stub_pokemon_name(5)), stub_pokemon(5))
+
+
+class PokemonSearchTests(TestCase):
+    names = ['pikachu', 'pichu', 'pidgey', 'pidgeotto', 'raichu', 'charmander']
+
+    def setUp(self):
+        PokemonBulkWriter().upsert(stub_pokemon(pokemon_id, name=name)
+                                   for pokemon_id, name in enumerate(self.names, start=1))
+        get_search_index().rebuild()
+        self.index = get_search_index()
+
+    def test_prefix_hits_are_alphabetical_and_limited(self):
+        self.assertEqual([name for name, _ in self.index.complete('PI')], ['pichu', 'pidgeotto', 'pidgey', 'pikachu'])
+        self.assertEqual(self.index.complete('pi', limit=2), [('pichu', 2), ('pidgeotto', 4)])
+        self.assertEqual(self.index.complete('pikachu'), [('pikachu', 1)])
+        self.assertEqual(self.index.complete('zu'), [])
+
+    def test_typos_are_suggested_by_edit_distance(self):
+        self.assertEqual(self.index.suggest('pikachuu')[0], ('pikachu', 1))
+        self.assertEqual(self.index.suggest('charmandr'), [('charmander', 6)])
+        self.assertEqual([name for name, _ in self.index.suggest('pidgy')], ['pidgey'])
+        self.assertEqual(self.index.suggest('zzzzzz'), [])
+
+    def test_saved_pokemons_enter_the_index(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            PokemonBulkWriter().upsert([stub_pokemon(7, name='pikipek')])
+        self.assertIn(('pikipek', 7), self.index.complete('pik'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Pokemon.objects.get(name='pikipek').delete()
+        self.assertNotIn(('pikipek', 7), self.index.complete('pik'))
+
+    def test_renamed_pokemon_leaves_the_index_with_the_old_name(self):
+        pokemon = Pokemon.objects.get(name='raichu')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            pokemon.name = 'alolan-raichu'
+            pokemon.save()
+
+        self.assertEqual(self.index.complete('rai'), [])
+        self.assertEqual(self.index.complete('alo'), [('alolan-raichu', 5)])
+
+    def test_search_endpoint(self):
+        client = authenticated_client()
+
+        response = client.get('/pokemon/search/', {'q': 'pi', 'limit': 2})
+        self.assertEqual([result['name'] for result in response.json()['results']], ['pichu', 'pidgeotto'])
+
+        response = client.get('/pokemon/search/', {'q': 'raichuu'})
+        self.assertEqual(response.json()['results'], [])
+        self.assertEqual(response.json()['did_you_mean'], [{'name': 'raichu', 'pokemon_id': 5}])
+
+        self.assertEqual(client.get('/pokemon/search/').status_code, 400)
+        self.assertEqual(client.get('/pokemon/search/', {'q': 'pi', 'limit': 0}).status_code, 400)
+
+
+class PokemonSnapshotTests(StubPokeAPITestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'snapshot.sqlite3')
+
+    def dump(self, limit=10):
+        stdout = io.StringIO()
+        call_command('dump_pokemon_snapshot', '--limit', str(limit), '--path', self.path, '--chunk-size', '4',
+                     stdout=stdout)
+        return stdout.getvalue()
+
+    def test_dump_round_trip(self):
+        self.assertIn('10 written, 0 failed', self.dump())
+
+        store = PokemonSnapshotStore(self.path)
+        self.assertEqual(store.count(), 10)
+        self.assertEqual(store.list_names(limit=3, offset=2), [stub_pokemon_name(i) for i in (3, 4, 5)])
+        self.assertEqual(store.get(stub_pokemon_name(7)), stub_record(7))
+        self.assertEqual(store.get('7'), stub_record(7))
+        self.assertIsNone(store.get('missingno'))
+        self.assertEqual(store.type_chart(), PokemonAPIService().fetch_type_chart())
+        self.assertEqual(store.meta()['count'], '10')
+
+    def test_rewritten_records_are_seen_by_readers_with_a_new_etag(self):
+        self.dump()
+        reader = SnapshotPokemonAPIService(store=PokemonSnapshotStore(self.path))
+        _, etag = reader.store.get_with_etag(stub_pokemon_name(3))
+        self.assertTrue(reader.fetch_pokemon_details_conditional(stub_pokemon_name(3), etag).not_modified)
+
+        changed = dataclasses.replace(stub_record(3), height=99)
+        PokemonSnapshotStore(self.path, readonly=False).put_many([(2, changed)])
+
+        result = reader.fetch_pokemon_details_conditional(stub_pokemon_name(3), etag)
+        self.assertFalse(result.not_modified)
+        self.assertEqual(result.data, changed)
+        self.assertNotEqual(result.etag, etag)
+        self.assertEqual(reader.get_pokemon_details(stub_pokemon_name(3)).height, 99)
+
+    def test_snapshot_backend_imports_without_the_network(self):
+        self.dump()
+        job = ImportJob.objects.create(limit=10, offset=0)
+        requests_before = self.stub.requests
+
+        with override_settings(POKEAPI={**settings.POKEAPI, 'BACKEND': 'snapshot', 'SNAPSHOT_PATH': self.path}):
+            service = get_pokemon_api_service()
+            job = ImportJobService(api_service=service, chunk_size=4).run(job.id)
+
+        self.assertIsInstance(service, SnapshotPokemonAPIService)
+        self.assertEqual((job.status, job.persisted), (ImportJob.STATUS_COMPLETED, 10))
+        self.assertEqual(self.stub.requests, requests_before)
+
+    def test_missing_snapshot_is_a_configuration_error(self):
+        with self.assertRaises(ImproperlyConfigured):
+            PokemonSnapshotStore(self.path)
+
+
+@override_settings(REPLICA_DATABASES=['replica_0', 'replica_1'])
+class ReadReplicaRouterTests(SimpleTestCase):
+
+    def setUp(self):
+        self.router = ReadReplicaRouter()
+
+    def test_pokemon_reads_go_to_the_replicas(self):
+        for model in (Pokemon, TypeEffectiveness):
+            with self.subTest(model=model.__name__):
+                self.assertIn(self.router.db_for_read(model), {'replica_0', 'replica_1'})
+        self.assertEqual({self.router.db_for_read(Pokemon) for _ in range(100)}, {'replica_0', 'replica_1'})
+
+    def test_other_models_are_read_from_default(self):
+        self.assertEqual(self.router.db_for_read(User), 'default')
+        self.assertEqual(self.router.db_for_read(ImportJob), 'default')
+
+    def test_reads_inside_a_transaction_stay_on_default(self):
+        with mock.patch.object(connections['default'], 'in_atomic_block', True):
+            self.assertEqual(self.router.db_for_read(Pokemon), 'default')
+
+    def test_without_replicas_everything_uses_default(self):
+        with override_settings(REPLICA_DATABASES=[]):
+            self.assertEqual(self.router.db_for_read(Pokemon), 'default')
+
+    def test_writes_go_to_default(self):
+        self.assertEqual(self.router.db_for_write(Pokemon), 'default')
+        self.assertEqual(self.router.db_for_write(User), 'default')
+
+    def test_migrations_only_run_on_default(self):
+        self.assertTrue(self.router.allow_migrate('default', 'pokemon_api'))
+        self.assertFalse(self.router.allow_migrate('replica_0', 'pokemon_api'))
+        self.assertFalse(self.router.allow_migrate('replica_1', 'auth'))
+
+    def test_relations_across_default_and_replicas_are_allowed(self):
+        pokemon, user = Pokemon(), User()
+        pokemon._state.db, user._state.db = 'replica_0', 'default'
+        self.assertTrue(self.router.allow_relation(pokemon, user))
+
+        user._state.db = 'other'
+        self.assertIsNone(self.router.allow_relation(pokemon, user))
@@ -16,14 +16,28 @@ schema_view = get_schema_view(
     permission_classes=(permissions.AllowAny,),
 )
 
-from pokemon_api.views import PokemonAPIView, PokemonManagementView, PokemonScoreView
+from pokemon_api.views import (
+    ImportJobView, MetricsView, PokemonAPIView, PokemonAsyncAPIView, PokemonCountersView, PokemonExportView,
+    PokemonLeaderboardView, PokemonManagementView, PokemonMatchupView, PokemonScoreBatchView, PokemonScoreView,
+    PokemonSearchView,
+)
 
 urlpatterns = [
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
     path('swagger.json', schema_view.without_ui(cache_timeout=0), name='schema-json'),
     path('api/pokemon/', PokemonAPIView.as_view(), name='pokemon_api'),    
+    path('api/pokemon/async/', PokemonAsyncAPIView.as_view(), name='pokemon_api_async'),
+    path('api/pokemon/jobs/<uuid:id>/', ImportJobView.as_view(), name='pokemon_import_job'),
     path('pokemon/', PokemonManagementView.as_view(), name='pokemon_management'),
+    path('pokemon/export/', PokemonExportView.as_view(), name='pokemon_export'),
     path('pokemon/<uuid:id>/', PokemonManagementView.as_view(), name='pokemon_management_detail'),
+    path('pokemon/search/', PokemonSearchView.as_view(), name='pokemon_search'),
+    path('pokemon/leaderboard/', PokemonLeaderboardView.as_view(), name='pokemon_leaderboard'),
+    path('pokemon/leaderboard/<uuid:id>/', PokemonLeaderboardView.as_view(), name='pokemon_leaderboard_rank'),
+    path('pokemon/score/batch/', PokemonScoreBatchView.as_view(), name='pokemon_score_batch'),
     path('pokemon/score/<uuid:id>/', PokemonScoreView.as_view(), name='pokemon_score'),
+    path('pokemon/matchup/', PokemonMatchupView.as_view(), name='pokemon_matchup'),
+    path('pokemon/counters/<uuid:id>/', PokemonCountersView.as_view(), name='pokemon_counters'),
+    path('metrics', MetricsView.as_view(), name='metrics'),
 ]
\ No newline at end of file
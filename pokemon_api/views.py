@@ -1,15 +1,39 @@
+import csv
+import io
 import logging 
+import uuid
+import zlib
+from datetime import datetime
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views import View
 from rest_framework import status, permissions
+from rest_framework.exceptions import APIException, NotAuthenticated, ValidationError
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
 from rest_framework.views import APIView
 from rest_framework.generics import RetrieveAPIView, GenericAPIView
 
-from pokemon_api.serializers import PokemonSerializer
-from pokemon_api.models import Pokemon
-from pokemon_api.services.pokemon_api_service import PokemonAPIService
+from pokemon_api.conditional import conditional_response, make_etag, pokemon_table_version, set_validators
+from pokemon_api.filters import PokemonFilterBackend, PokemonOrderingFilter
+from pokemon_api.pagination import PokemonCursorPagination
+from pokemon_api.serializers import ImportJobSerializer, PokemonSerializer
+from pokemon_api.models import ImportJob, Pokemon
+from pokemon_api.services.import_job_service import ImportJobService
+from pokemon_api.services.read_through_service import PokemonReadThroughService
+from pokemon_api.services.leaderboard_service import get_leaderboard, percentile
+from pokemon_api.services.matchup_service import TypeChartNotLoaded, get_matchup_engine
+from pokemon_api.services.metrics_service import metrics_access_allowed, metrics_enabled, registry
 from pokemon_api.services.score_service import ScoreService
+from pokemon_api.services.search_service import get_search_index
+from pokemon_api.services.snapshot_service import get_async_pokemon_api_service, get_pokemon_api_service
+from pokemon_api.signals import pokemons_bulk_saved
 
 logger = logging.getLogger(__name__)
 
@@ -17,16 +41,31 @@ class PokemonAPIView(RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
      
     def retrieve(self, request, *args, **kwargs):
+        """
+        Busca um pokémon pelo nome. No modo read-through (POKEAPI['READ_THROUGH']),
+        consulta primeiro a tabela local e só chama a PokeAPI em caso de ausência
+        ou registro vencido, gravando o resultado localmente.
+        """
         pokemon_name = request.query_params.get('name')
-        service = PokemonAPIService()
+
+        if not pokemon_name:
+            return Response({"error": "The 'name' parameter is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        service = get_pokemon_api_service()
 
         try:
-            pokemon_details = service.get_pokemon_details(pokemon_name=pokemon_name)
+            if getattr(settings, 'POKEAPI', {}).get('READ_THROUGH', True):
+                formatted_data = PokemonReadThroughService(api_service=service).get(pokemon_name)
+            else:
+                pokemon_details = service.get_pokemon_details(pokemon_name=pokemon_name)
+                formatted_data = service.format_pokemon_data(pokemon_details) if pokemon_details else None
 
-            if not pokemon_details:
-                return Response({"error": "Pokemon not found"}, status=status.HTTP_404_NOT_FOUND)
+            if not formatted_data:
+                # Sugere nomes parecidos já salvos localmente, para corrigir erros de digitação
+                suggestions = [name for name, _ in get_search_index().suggest(pokemon_name)]
+                return Response({"error": "Pokemon not found", "did_you_mean": suggestions},
+                                status=status.HTTP_404_NOT_FOUND)
 
-            formatted_data = service.format_pokemon_data(pokemon_details)
             return Response(formatted_data, status=status.HTTP_200_OK)
 
         except Exception as e:
@@ -36,107 +75,203 @@ class PokemonAPIView(RetrieveAPIView):
 
     def post(self, request, *args, **kwargs):
         """
-        Salva uma lista de pokémons obtidos do método fetch_all_pokemons.
-        Aceita um parâmetro opcional 'limit' para especificar quantos pokémons buscar.
+        Enfileira a importação dos pokémons obtidos do método fetch_all_pokemons.
+        Aceita os parâmetros opcionais 'limit' (quantos pokémons buscar), 'offset'
+        e 'mode' ('full' ou 'incremental'; o incremental só regrava o que mudou).
+        Retorna o id do job imediatamente; o progresso é consultado em
+        /api/pokemon/jobs/<id>/.
         """
         limit = request.query_params.get('limit', 25)
-        
+        offset = request.query_params.get('offset', 0)
+        mode = request.query_params.get('mode', ImportJob.MODE_FULL)
+
+        if mode not in (ImportJob.MODE_FULL, ImportJob.MODE_INCREMENTAL):
+            return Response(
+                {"error": "The 'mode' parameter must be 'full' or 'incremental'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         try:
             limit = int(limit)
+            offset = int(offset)
         except ValueError:
             return Response(
-                {"error": "The 'limit' parameter must be an integer"},
+                {"error": "The 'limit' and 'offset' parameters must be integers"},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        service = PokemonAPIService()
+        if limit < 1 or offset < 0:
+            return Response(
+                {"error": "The 'limit' parameter must be a positive integer and 'offset' must not be negative"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
         try:
-            # Busca todos os pokémons da API
-            all_pokemons = service.fetch_all_pokemons(limit=limit)
+            job = ImportJobService().enqueue(limit=limit, offset=offset, mode=mode)
+        except Exception as e:
+            logger.error(f"Error enqueuing Pokemon import: {e}")
+            return Response(
+                {"error": "An error occurred while enqueuing the Pokemon import"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
 
-            if not all_pokemons:
-                return Response(
-                    {"error": "Failed to fetch pokemons from API"},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
+        return Response(
+            {
+                "message": "Pokémon import enqueued",
+                "job_id": job.id,
+                "status": job.status,
+                "status_url": reverse('pokemon_import_job', kwargs={'id': job.id}),
+            },
+            status=status.HTTP_202_ACCEPTED
+        )
 
-            # Salva os pokémons no banco de dados
-            created_count = 0
-            skipped_count = 0
-            errors = []
 
-            for pokemon_data in all_pokemons:
-                try:
-                    # Formata os dados antes de salvar
-                    formatted_data = service.format_pokemon_data(pokemon_data)
-                    
-                    # Cria ou atualiza o pokémon no banco
-                    pokemon, created = Pokemon.objects.update_or_create(
-                        name=formatted_data['name'],
-                        defaults={
-                            'pokemon_id': formatted_data['pokemon_id'],
-                            'types': formatted_data['types'],
-                            'abilities': formatted_data['abilities'],
-                            'base_stats': formatted_data['base_stats'],
-                            'height': formatted_data['height'],
-                            'weight': formatted_data['weight'],
-                            'sprite_url': formatted_data['sprite_url'],
-                        }
-                    )
-                    
-                    if created:
-                        created_count += 1
-                    else:
-                        skipped_count += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error saving Pokemon {pokemon_data.get('name')}: {e}")
-                    errors.append({
-                        "name": pokemon_data.get('name'),
-                        "error": str(e)
-                    })
+class PokemonAsyncAPIView(View):
+    """
+    Versão assíncrona do GET de PokemonAPIView, para rodar sob ASGI
+    (backend_pokemon/asgi.py): a consulta à PokeAPI usa AsyncPokemonAPIService
+    e não ocupa uma thread enquanto espera. O DRF não tem views async, então
+    a autenticação configurada em REST_FRAMEWORK é executada numa thread.
+    """
 
-            response_data = {
-                "message": "Pokémons saved successfully",
-                "created": created_count,
-                "updated": skipped_count,
-                "total_processed": created_count + skipped_count,
-            }
+    @staticmethod
+    def _authenticate(request):
+        """
+        Executa as classes de autenticação do DRF. Retorna None se o usuário
+        está autenticado, ou (corpo, cabeçalho WWW-Authenticate) da resposta 401.
+        """
+        authenticators = [auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+        drf_request = Request(request, authenticators=authenticators)
+        try:
+            if drf_request.user and drf_request.user.is_authenticated:
+                request.user = drf_request.user
+                return None
+            detail = NotAuthenticated.default_detail
+        except APIException as e:
+            detail = e.detail
+        header = authenticators[0].authenticate_header(drf_request) if authenticators else None
+        return {"detail": detail}, header
 
-            if errors:
-                response_data["errors"] = errors
+    async def get(self, request, *args, **kwargs):
+        failure = await sync_to_async(self._authenticate)(request)
+        if failure:
+            body, header = failure
+            response = JsonResponse(body, status=status.HTTP_401_UNAUTHORIZED)
+            if header:
+                response['WWW-Authenticate'] = header
+            return response
+
+        pokemon_name = request.GET.get('name')
+        if not pokemon_name:
+            return JsonResponse({"error": "The 'name' parameter is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        service = get_async_pokemon_api_service()
+
+        try:
+            if getattr(settings, 'POKEAPI', {}).get('READ_THROUGH', True):
+                formatted_data = await PokemonReadThroughService().aget(pokemon_name, service)
+            else:
+                pokemon_details = await service.get_pokemon_details(pokemon_name)
+                formatted_data = service.format_pokemon_data(pokemon_details) if pokemon_details else None
+
+            if not formatted_data:
+                suggestions = await sync_to_async(get_search_index().suggest)(pokemon_name)
+                return JsonResponse({"error": "Pokemon not found", "did_you_mean": [name for name, _ in suggestions]},
+                                    status=status.HTTP_404_NOT_FOUND)
 
-            return Response(response_data, status=status.HTTP_201_CREATED)
+            return JsonResponse(formatted_data, status=status.HTTP_200_OK)
 
         except Exception as e:
-            logger.error(f"Error fetching and saving Pokemon list: {e}")
-            return Response(
-                {"error": "An error occurred while fetching and saving Pokemon data"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-            
+            logger.error(f"Error fetching Pokemon data: {e}")
+            return JsonResponse({"error": "An error occurred while fetching Pokemon data"},
+                                status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class ImportJobView(APIView):
+    """
+    Retorna o progresso de um job de importação: pokémons buscados,
+    gravados, com falha e o tempo restante estimado (eta_seconds).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, id=None):
+        job = get_object_or_404(ImportJob, id=id)
+        return Response(ImportJobSerializer(job).data, status=status.HTTP_200_OK)
+
+
 class PokemonManagementView(GenericAPIView):
+    """
+    CRUD dos pokémons locais. A listagem é paginada por cursor (ordenada por
+    pokemon_id, ou pelo campo de `ordering=`), aceita os filtros de
+    PokemonFilterBackend e o parâmetro `fields=` (lista separada por
+    vírgulas) para devolver só alguns campos.
+    """
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = PokemonSerializer
     queryset = Pokemon.objects.all()
     lookup_field = "id"
+    pagination_class = PokemonCursorPagination
+    filter_backends = [PokemonFilterBackend, PokemonOrderingFilter]
+
+    def _requested_fields(self, request):
+        fields = request.query_params.get('fields')
+        if not fields:
+            return None
+
+        fields = [field.strip() for field in fields.split(',') if field.strip()]
+        unknown = set(fields) - set(PokemonSerializer.Meta.fields)
+        if unknown:
+            raise ValidationError({"fields": f"Unknown fields: {', '.join(sorted(unknown))}"})
+        return fields
+
+    def _validators(self, request, id=None, name=None):
+        """
+        (ETag, Last-Modified) da resposta, calculados sem carregar as colunas
+        JSON: o updated_at do pokémon pedido ou, na listagem, a versão da
+        tabela. A listagem não tem Last-Modified: remover um pokémon não muda o
+        maior updated_at, e um If-Modified-Since sozinho receberia um 304
+        vencido. None se o pokémon não existe (a resposta será 404).
+        """
+        variant = (request.get_full_path(), request.accepted_renderer.format)
+        if id or name:
+            lookup = {'id': id} if id else {'name': name}
+            row = Pokemon.objects.filter(**lookup).values_list('id', 'updated_at').first()
+            if row is None:
+                return None
+            return make_etag('pokemon', row[0], row[1].isoformat(), *variant), row[1]
+
+        last_modified, count = pokemon_table_version()
+        return make_etag('pokemon-list', last_modified.isoformat() if last_modified else '', count, *variant), None
 
     def get(self, request, id=None):
         name = request.query_params.get('name')
+        fields = self._requested_fields(request)
+
+        validators = self._validators(request, id=id, name=name)
+        if validators:
+            not_modified = conditional_response(request, *validators)
+            if not_modified is not None:
+                return not_modified
+
+        queryset = self.get_queryset()
+        if fields:
+            # Carrega só as colunas pedidas (e as usadas na ordenação do cursor)
+            ordering = PokemonOrderingFilter().get_ordering(request, queryset, self)
+            queryset = queryset.only(*set(fields) | {'id', 'pokemon_id'} | {field.lstrip('-') for field in ordering})
 
         if id:
-            pokemon = get_object_or_404(self.get_queryset(), id=id)
-            serializer = self.get_serializer(pokemon)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            pokemon = get_object_or_404(queryset, id=id)
+            serializer = self.get_serializer(pokemon, fields=fields)
+            response = Response(serializer.data, status=status.HTTP_200_OK)
         elif name:
-            pokemon = get_object_or_404(self.get_queryset(), name=name)
-            serializer = self.get_serializer(pokemon)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            pokemon = get_object_or_404(queryset, name=name)
+            serializer = self.get_serializer(pokemon, fields=fields)
+            response = Response(serializer.data, status=status.HTTP_200_OK)
         else:
-            pokemons = self.get_queryset()
-            serializer = self.get_serializer(pokemons, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            page = self.paginate_queryset(self.filter_queryset(queryset))
+            serializer = self.get_serializer(page, many=True, fields=fields)
+            response = self.get_paginated_response(serializer.data)
+        return set_validators(response, *validators) if validators else response
 
     def post(self, request):
         serializer = self.get_serializer(data=request.data)
@@ -159,31 +294,380 @@ class PokemonManagementView(GenericAPIView):
         return Response({"message": f"Pokemon with id '{id}' deleted successfully."}, status=status.HTTP_200_OK)
 
 
+class PokemonExportView(APIView):
+    """
+    Exporta a tabela de pokémons em streaming, linha a linha, sem montar a
+    lista inteira em memória. Parâmetros:
+    - `output`: 'ndjson' (padrão) ou 'csv';
+    - `gzip`: 'true' para comprimir a resposta (Content-Encoding: gzip);
+    - os mesmos filtros da listagem (type, ability, min_<stat>/max_<stat>).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    export_fields = PokemonSerializer.Meta.fields
+    content_types = {
+        'ndjson': 'application/x-ndjson',
+        'csv': 'text/csv',
+    }
+
+    def _rows(self, request):
+        queryset = PokemonFilterBackend().filter_queryset(request, Pokemon.objects.all(), self)
+        chunk_size = getattr(settings, 'POKEAPI', {}).get('EXPORT_CHUNK_SIZE', 500)
+        return queryset.order_by('pokemon_id', 'id').values_list(*self.export_fields).iterator(chunk_size=chunk_size)
+
+    def _ndjson_lines(self, rows):
+        encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        for row in rows:
+            yield encoder.encode(dict(zip(self.export_fields, row))) + '\n'
+
+    def _csv_lines(self, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        json_fields = {'types', 'abilities', 'base_stats'}
+
+        def line(values):
+            writer.writerow(values)
+            value = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            return value
+
+        def cell(field, value):
+            if field in json_fields:
+                return encoder.encode(value)
+            if isinstance(value, datetime):
+                # Mesmo formato ISO 8601 usado nas respostas JSON
+                return encoder.default(value)
+            return value
+
+        yield line(self.export_fields)
+        for row in rows:
+            yield line([cell(field, value) for field, value in zip(self.export_fields, row)])
+
+    def _gzip(self, lines, flush_every=500):
+        compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+        for count, line in enumerate(lines, start=1):
+            data = compressor.compress(line.encode('utf-8'))
+            # Descarrega periodicamente para o cliente receber dados desde o início
+            if count % flush_every == 0:
+                data += compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    def get(self, request):
+        output = request.query_params.get('output', 'ndjson')
+        if output not in self.content_types:
+            return Response({"error": "The 'output' parameter must be 'ndjson' or 'csv'"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        rows = self._rows(request)
+        lines = self._ndjson_lines(rows) if output == 'ndjson' else self._csv_lines(rows)
+        use_gzip = request.query_params.get('gzip', '').lower() in ('1', 'true', 'yes')
+
+        response = StreamingHttpResponse(
+            self._gzip(lines) if use_gzip else (line.encode('utf-8') for line in lines),
+            content_type=f"{self.content_types[output]}; charset=utf-8",
+        )
+        response['Content-Disposition'] = f'attachment; filename="pokemons.{output}"'
+        if use_gzip:
+            response['Content-Encoding'] = 'gzip'
+        return response
+
+
 class PokemonScoreView(APIView):
+    """
+    Retorna o score pré-calculado do pokémon. Se ele foi calculado com outra
+    versão dos pesos de ScoreService, é recalculado e gravado de volta.
+    """
     permission_classes = [permissions.IsAuthenticated]
     score_service = ScoreService()
 
     def get(self, request, id=None):
         try:
-            pokemon = get_object_or_404(Pokemon, id=id)
-
-            base_stats_list = list(pokemon.base_stats.values())
-            pokemon_data = {
-                'types': pokemon.types,
-                'base_stats': base_stats_list,
-                'abilities': pokemon.abilities,
-                'height': pokemon.height,
-                'weight': pokemon.weight,
-            }
+            pokemon = get_object_or_404(
+                Pokemon.objects.only('id', 'name', 'score', 'score_version', 'updated_at'), id=id
+            )
 
-            score = self.score_service.calculate_score(pokemon_data)
+            if pokemon.score is None or pokemon.score_version != self.score_service.weights_version:
+                pokemon = Pokemon.objects.get(id=id)
+                pokemon.refresh_score(self.score_service)
+                if pokemon.score is None:
+                    raise ValueError(f"Could not calculate the score of Pokemon {id}")
+                Pokemon.objects.filter(id=id).update(score=pokemon.score, score_version=pokemon.score_version)
+                pokemons_bulk_saved.send(
+                    sender=Pokemon, pokemons=[pokemon], update_fields=['score', 'score_version']
+                )
 
-            return Response({
+            # O score depende dos dados do pokémon (updated_at) e da versão dos pesos.
+            # Sem Last-Modified: uma troca de pesos muda o score sem mudar updated_at
+            etag = make_etag('score', pokemon.id, pokemon.updated_at.isoformat(), pokemon.score_version,
+                             request.accepted_renderer.format)
+            not_modified = conditional_response(request, etag)
+            if not_modified is not None:
+                return not_modified
+
+            return set_validators(Response({
                 'name': pokemon.name,
-                'score': score
-            }, status=status.HTTP_200_OK)
+                'score': pokemon.score
+            }, status=status.HTTP_200_OK), etag)
 
         except Exception as e:
             logger.error(f"Error calculating score: {e}")
             return Response({"error": "An error occurred while calculating the score."},
-                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class PokemonScoreBatchView(APIView):
+    """
+    Calcula o score de vários pokémons em uma única requisição.
+    Aceita POST com {"ids": [<uuid>, ...]}. Usa os scores pré-calculados e
+    recalcula apenas os vencidos, com o cálculo vetorizado de
+    ScoreService.calculate_scores.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    score_service = ScoreService()
+    score_fields = ('id', 'name', 'types', 'abilities', 'base_stats', 'height', 'weight', 'score', 'score_version')
+
+    def post(self, request):
+        ids = request.data.get('ids')
+        max_ids = getattr(settings, 'POKEAPI', {}).get('SCORE_BATCH_MAX_IDS', 1000)
+
+        if not isinstance(ids, list) or not ids:
+            return Response({"error": "'ids' must be a non-empty list of Pokemon ids"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > max_ids:
+            return Response({"error": f"At most {max_ids} ids can be scored per request"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            ids = [uuid.UUID(str(pokemon_id)) for pokemon_id in ids]
+        except ValueError:
+            return Response({"error": "'ids' must contain valid UUIDs"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            rows = {row['id']: row for row in Pokemon.objects.filter(id__in=ids).values(*self.score_fields)}
+
+            weights_version = self.score_service.weights_version
+            scores = {}
+            scorable = []
+            errors = []
+            for pokemon_id in dict.fromkeys(ids):
+                row = rows.get(pokemon_id)
+                if row is None:
+                    continue
+                if row['score'] is not None and row['score_version'] == weights_version:
+                    scores[pokemon_id] = row['score']
+                    continue
+                base_stats_list = list(row['base_stats'].values())
+                if not all(isinstance(stat, int) for stat in base_stats_list):
+                    errors.append({"id": pokemon_id, "error": "base_stats must be a list of integers"})
+                    continue
+                scorable.append((pokemon_id, {
+                    'types': row['types'],
+                    'base_stats': base_stats_list,
+                    'abilities': row['abilities'],
+                    'height': row['height'],
+                    'weight': row['weight'],
+                }))
+
+            if scorable:
+                columns = self.score_service.build_score_columns([pokemon_data for _, pokemon_data in scorable])
+                scores.update(zip((pokemon_id for pokemon_id, _ in scorable), self.score_service.calculate_scores(columns)))
+
+            response_data = {
+                "results": [
+                    {"id": pokemon_id, "name": rows[pokemon_id]['name'], "score": scores[pokemon_id]}
+                    for pokemon_id in dict.fromkeys(ids) if pokemon_id in scores
+                ],
+                "not_found": [pokemon_id for pokemon_id in dict.fromkeys(ids) if pokemon_id not in rows],
+            }
+            if errors:
+                response_data["errors"] = errors
+            return Response(response_data, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            logger.error(f"Error calculating batch scores: {e}")
+            return Response({"error": "An error occurred while calculating the scores."},
+                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def _limit_param(request, default: int, max_limit: int) -> int:
+    """Parâmetro `limit` da query string, limitado a max_limit; ValueError se não for um inteiro positivo."""
+    limit = int(request.query_params.get('limit', default))
+    if limit < 1:
+        raise ValueError(f"Invalid limit: {limit}")
+    return min(limit, max_limit)
+
+
+class PokemonLeaderboardView(APIView):
+    """
+    Ranking de pokémons por score, servido por um índice ordenado (Redis ou
+    memória) mantido em sincronia com as gravações.
+    - GET /pokemon/leaderboard/?limit=20&type=fire: os N maiores scores;
+    - GET /pokemon/leaderboard/<id>/?type=fire: posição e percentil do pokémon.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    max_limit = 100
+
+    def get(self, request, id=None):
+        pokemon_type = request.query_params.get('type')
+        leaderboard = get_leaderboard()
+
+        if id:
+            position = leaderboard.rank(id, pokemon_type=pokemon_type)
+            if position is None:
+                return Response({"error": "Pokemon not found in the leaderboard"},
+                                status=status.HTTP_404_NOT_FOUND)
+            rank, score, total = position
+            pokemon = get_object_or_404(Pokemon.objects.only('id', 'name'), id=id)
+            return Response({
+                "id": pokemon.id,
+                "name": pokemon.name,
+                "type": pokemon_type,
+                "score": score,
+                "rank": rank,
+                "total": total,
+                "percentile": percentile(rank, total),
+            }, status=status.HTTP_200_OK)
+
+        try:
+            limit = _limit_param(request, 20, self.max_limit)
+        except ValueError:
+            return Response({"error": "The 'limit' parameter must be a positive integer"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        entries = leaderboard.top(limit, pokemon_type=pokemon_type)
+        rows = Pokemon.objects.in_bulk([pokemon_id for pokemon_id, _ in entries])
+        results = []
+        for rank, (pokemon_id, score) in enumerate(entries, start=1):
+            pokemon = rows.get(uuid.UUID(str(pokemon_id)))
+            if pokemon is None:
+                continue
+            results.append({
+                "rank": rank,
+                "id": pokemon.id,
+                "name": pokemon.name,
+                "types": pokemon.types,
+                "score": score,
+            })
+
+        return Response({"type": pokemon_type, "results": results}, status=status.HTTP_200_OK)
+
+
+class PokemonSearchView(APIView):
+    """
+    Busca por nome no índice em memória (PokemonNameIndex):
+    GET /pokemon/search/?q=pik&limit=10 retorna os nomes que começam com `q`
+    (autocompletar) e, se nenhum começar, os mais parecidos em `did_you_mean`.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    max_limit = 50
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"error": "The 'q' parameter is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = _limit_param(request, 10, self.max_limit)
+        except ValueError:
+            return Response({"error": "The 'limit' parameter must be a positive integer"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        index = get_search_index()
+        results = index.complete(query, limit=limit)
+        suggestions = [] if results else index.suggest(query, limit=limit)
+        return Response({
+            "query": query,
+            "results": [{"name": name, "pokemon_id": pokemon_id} for name, pokemon_id in results],
+            "did_you_mean": [{"name": name, "pokemon_id": pokemon_id} for name, pokemon_id in suggestions],
+        }, status=status.HTTP_200_OK)
+
+
+def _pokemon_summary(pokemon):
+    return {"id": pokemon.id, "name": pokemon.name, "pokemon_id": pokemon.pokemon_id, "types": pokemon.types}
+
+
+class PokemonMatchupView(APIView):
+    """
+    Confronto de tipos entre dois pokémons gravados:
+    GET /pokemon/matchup/?attacker=<id ou nome>&defender=<id ou nome> retorna
+    o multiplicador de cada tipo do atacante contra o defensor (`attack`) e o
+    inverso (`defense`), pela tabela de efetividade importada.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    @staticmethod
+    def _lookup(value):
+        pokemons = Pokemon.objects.only('id', 'name', 'pokemon_id', 'types')
+        try:
+            return pokemons.filter(id=uuid.UUID(value)).first()
+        except ValueError:
+            return pokemons.filter(name=value).first()
+
+    def get(self, request):
+        attacker_param = request.query_params.get('attacker', '').strip()
+        defender_param = request.query_params.get('defender', '').strip()
+        if not attacker_param or not defender_param:
+            return Response({"error": "The 'attacker' and 'defender' parameters are required"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        attacker = self._lookup(attacker_param)
+        defender = self._lookup(defender_param)
+        if attacker is None or defender is None:
+            return Response({"error": "Pokemon not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            matchup = get_matchup_engine().matchup(attacker, defender)
+        except TypeChartNotLoaded as e:
+            return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        return Response({
+            "attacker": _pokemon_summary(attacker),
+            "defender": _pokemon_summary(defender),
+            **matchup,
+        }, status=status.HTTP_200_OK)
+
+
+class PokemonCountersView(APIView):
+    """
+    Melhores respostas de tipo a um pokémon, entre todos os gravados:
+    GET /pokemon/counters/<id>/?limit=10. Calculado de uma vez sobre a tabela
+    inteira por MatchupEngine.counters.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    max_limit = 100
+
+    def get(self, request, id=None):
+        try:
+            limit = _limit_param(request, 10, self.max_limit)
+        except ValueError:
+            return Response({"error": "The 'limit' parameter must be a positive integer"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        pokemon = get_object_or_404(Pokemon.objects.only('id', 'name', 'pokemon_id', 'types'), id=id)
+        try:
+            counters = get_matchup_engine().counters(pokemon.id, limit=limit)
+        except TypeChartNotLoaded as e:
+            return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        except Pokemon.DoesNotExist:
+            # Removido entre a consulta e a montagem do índice
+            raise Http404
+
+        return Response({"pokemon": _pokemon_summary(pokemon), "results": counters}, status=status.HTTP_200_OK)
+
+
+class MetricsView(View):
+    """
+    Métricas do processo no formato texto do Prometheus: latência por rota,
+    consultas ao banco por requisição, chamadas à PokeAPI e caches. Só para
+    os IPs liberados ou com o token de métricas (metrics_access_allowed).
+    """
+
+    def get(self, request, *args, **kwargs):
+        if not metrics_enabled():
+            raise Http404
+        if not metrics_access_allowed(request):
+            return HttpResponse(status=403)
+        return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')